@@ -0,0 +1 @@
+"""Standalone performance benchmarks. Run with ``python -m benchmarks.<name>``."""
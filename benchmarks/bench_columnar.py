@@ -0,0 +1,69 @@
+"""
+Benchmark: payload size and encode time of ?format=columnar vs plain JSON.
+
+Renders one child's question history pages (shaped like QuestionSerializer
+output, see bench_json_renderer) with the default renderer and with the
+columnar one, for full rows and for a dashboard-style ?fields= subset,
+and reports raw and gzipped sizes and render time per page.
+
+    python -m benchmarks.bench_columnar --page-size 100
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+
+from benchmarks.bench_json_renderer import question_page, timed
+from core.renderers import ColumnarJSONRenderer, ORJSONRenderer
+
+DASHBOARD_FIELDS = ["id", "text", "topic_name", "status", "created_at"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--answer-words", type=int, default=150)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    full = [
+        question_page(args.page_size, args.answer_words, rng) for _ in range(args.pages)
+    ]
+    dashboard = [
+        {
+            **page,
+            "results": [
+                {name: row[name] for name in DASHBOARD_FIELDS}
+                for row in page["results"]
+            ],
+        }
+        for page in full
+    ]
+
+    print(
+        f"\n{args.pages} pages of {args.page_size} questions, per page, "
+        f"median of {args.repeats}"
+    )
+    print(f"{'':<22} {'raw':>8} {'gzip':>8} {'render':>9}")
+    for label, pages in (("full rows", full), ("?fields=", dashboard)):
+        for renderer in (ORJSONRenderer(), ColumnarJSONRenderer()):
+            bodies = [renderer.render(page) for page in pages]
+            raw = statistics.mean(map(len, bodies))
+            zipped = statistics.mean(len(gzip.compress(body)) for body in bodies)
+            seconds = timed(
+                lambda: [renderer.render(page) for page in pages], args.repeats
+            )
+            name = f"{label} {renderer.format}"
+            print(
+                f"{name:<22} {raw / 1024:>6.1f}KB {zipped / 1024:>6.1f}KB "
+                f"{seconds / args.pages * 1e6:>7.0f}us"
+            )
+    print(f"(?fields={','.join(DASHBOARD_FIELDS)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: DRF's JSONRenderer vs the orjson renderer on question pages.
+
+Builds paginated question pages shaped like QuestionSerializer output
+(answers of --answer-words words, timestamps already strings, as the
+serializer leaves them) and times rendering each page, then parsing the
+rendered page back.
+
+    python -m benchmarks.bench_json_renderer --page-size 100
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa
+from rest_framework.renderers import JSONRenderer  # noqa
+
+from core.parsers import ORJSONParser  # noqa
+from core.renderers import ORJSONRenderer, orjson  # noqa
+
+WORDS = ["lion", "moon", "volcano", "purr", "rocket", "ocean", "thunder", "seed"]
+TOPICS = ["Animals", "Space", "Nature", "Science"]
+
+
+def question_page(page_size, answer_words, rng):
+    results = [
+        {
+            "id": 100_000 - n,
+            "child_name": "Emma",
+            "text": f"Why do {' '.join(rng.choices(WORDS, k=3))}?",
+            "topic_name": rng.choice(TOPICS),
+            "detected_topic": rng.randint(1, 4),
+            "was_within_boundaries": True,
+            "answer": " ".join(rng.choices(WORDS, k=answer_words)) + " 🦁",
+            "child_marked_helpful": rng.choice([True, False, None]),
+            "status": "answered",
+            "created_at": f"2024-05-01T12:{n % 60:02d}:15.123456Z",
+            "reviewed_at": None,
+        }
+        for n in range(page_size)
+    ]
+    return {
+        "count": 100_000,
+        "next": "http://localhost/api/v1/questions/?page=2",
+        "previous": None,
+        "results": results,
+    }
+
+
+def timed(function, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--answer-words", type=int, default=150)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if orjson is None:
+        parser.error("orjson is not installed")
+
+    rng = random.Random(args.seed)
+    pages = [
+        question_page(args.page_size, args.answer_words, rng) for _ in range(args.pages)
+    ]
+    rendered = [JSONRenderer().render(page) for page in pages]
+    assert rendered == [ORJSONRenderer().render(page) for page in pages]
+    megabytes = sum(map(len, rendered)) / 1e6
+
+    def render_all(renderer):
+        return lambda: [renderer.render(page) for page in pages]
+
+    def parse_all(parser):
+        return lambda: [parser.parse(io.BytesIO(body)) for body in rendered]
+
+    cases = {
+        "render": (render_all(JSONRenderer()), render_all(ORJSONRenderer())),
+        "parse": (parse_all(JSONParser()), parse_all(ORJSONParser())),
+    }
+    print(
+        f"\n{args.pages} pages of {args.page_size} questions "
+        f"({megabytes / args.pages * 1000:.0f}KB each), median of {args.repeats}"
+    )
+    print(f"{'':<8} {'stdlib':>22} {'orjson':>22} {'speedup':>8}")
+    for label, (before, after) in cases.items():
+        slow = timed(before, args.repeats)
+        fast = timed(after, args.repeats)
+        print(
+            f"{label:<8} {args.pages / slow:>7,.0f} pages/s {megabytes / slow:>5,.0f}MB/s "
+            f"{args.pages / fast:>7,.0f} pages/s {megabytes / fast:>5,.0f}MB/s "
+            f"{slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark: ILIKE vs full-text search latency over a large questions table.
+
+Fills a throwaway test database with --rows synthetic questions (text plus
+a 40-word answer, words drawn with a skewed frequency so some are common
+and some rare), then times the old admin search (text or answer ILIKE
+'%term%') against the GIN-indexed tsvector search behind ?q=, each as a
+first page of 20 plus the total count.
+
+    python -m benchmarks.bench_question_search --rows 1000000
+"""
+
+import argparse
+import io
+import logging
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.db import connection  # noqa
+from django.db.models import Q  # noqa
+
+from core.models import Child, Family, Question  # noqa
+from core.services.question_search import search_questions  # noqa
+from core.services.topic_matcher import TOPIC_KEYWORDS  # noqa
+
+SYLLABLES = ["ba", "ko", "ri", "tu", "mel", "zan", "pe", "dro", "li", "qua", "sn", "or"]
+ANSWER_WORDS = 40
+BATCH = 100_000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+COPY_SQL = """
+COPY core_question (
+    child_id, text, answer, was_within_boundaries, llm_model, stop_reason,
+    status, attempts, last_error, created_at
+) FROM STDIN
+"""
+
+
+def build_vocabulary(size, rng):
+    words = {keyword for keywords in TOPIC_KEYWORDS.values() for keyword in keywords}
+    words = sorted(word for word in words if " " not in word)
+    synthetic = set()
+    while len(synthetic) < size:
+        synthetic.add("".join(rng.choices(SYLLABLES, k=rng.randint(3, 4))))
+    words += sorted(synthetic)
+    rng.shuffle(words)
+    return words
+
+
+def word_sampler(vocabulary, rng):
+    """k words at a time; P(rank <= r) = sqrt(r / n), so early words are common"""
+    size = len(vocabulary)
+    cum_weights = [((i + 1) / size) ** 0.5 for i in range(size)]
+    return lambda k: rng.choices(vocabulary, cum_weights=cum_weights, k=k)
+
+
+def fill(rows, vocabulary, rng):
+    child = Child.objects.create(
+        family=Family.objects.create(name="Benchmark Family"), name="Kid", age=8
+    )
+    sample = word_sampler(vocabulary, rng)
+    with connection.cursor() as cursor:
+        # Bulk load without the index, then build it once
+        cursor.execute("DROP INDEX question_search_idx")
+        for start in range(0, rows, BATCH):
+            started = time.perf_counter()
+            buffer = io.StringIO()
+            for n in range(start, min(start + BATCH, rows)):
+                words = sample(2 + ANSWER_WORDS)
+                created_at = (START + timedelta(seconds=n)).isoformat()
+                buffer.write(
+                    f"{child.id}\twhy do {words[0]} {words[1]}?\t"
+                    f"{' '.join(words[2:])}\tt\t\t\tanswered\t0\t\t"
+                    f"{created_at}\n"
+                )
+            buffer.seek(0)
+            cursor.copy_expert(COPY_SQL, buffer)
+            print(
+                f"  inserted {min(start + BATCH, rows):>9,} rows "
+                f"({time.perf_counter() - started:.1f}s)",
+                flush=True,
+            )
+        started = time.perf_counter()
+        cursor.execute(
+            "CREATE INDEX question_search_idx ON core_question "
+            "USING gin (search_vector)"
+        )
+        cursor.execute("ANALYZE core_question")
+        print(f"  built GIN index ({time.perf_counter() - started:.1f}s)")
+
+
+def ilike_search(term):
+    queryset = Question.objects.filter(
+        Q(text__icontains=term) | Q(answer__icontains=term)
+    )
+    list(queryset.order_by("-created_at")[:20])
+    return queryset.count()
+
+
+def fts_search(term):
+    queryset = search_questions(Question.objects.all(), term)
+    list(queryset[:20])
+    return queryset.count()
+
+
+def timed(search, term, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        matches = search(term)
+        latencies.append(time.perf_counter() - started)
+    return matches, statistics.median(latencies)
+
+
+def explain(term):
+    queryset = search_questions(Question.objects.all(), term)[:20]
+    print(f"\nEXPLAIN ANALYZE first FTS page for {term!r}:")
+    print(queryset.explain(analyze=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--explain", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    # Common, middling and rare words, and a two-word query
+    terms = [
+        vocabulary[0],
+        vocabulary[len(vocabulary) // 10],
+        vocabulary[-1],
+        f"{vocabulary[1]} {vocabulary[len(vocabulary) // 2]}",
+    ]
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f"Loading {args.rows:,} questions...")
+        fill(args.rows, vocabulary, rng)
+
+        print(
+            f"\n{'term':<22} {'ILIKE rows':>10} {'ILIKE':>10} "
+            f"{'FTS rows':>9} {'FTS':>9} {'speedup':>8}"
+        )
+        for term in terms:
+            ilike_rows, ilike = timed(ilike_search, term, args.repeats)
+            fts_rows, fts = timed(fts_search, term, args.repeats)
+            print(
+                f"{term:<22} {ilike_rows:>10,} {ilike * 1000:>8.0f}ms "
+                f"{fts_rows:>9,} {fts * 1000:>7.0f}ms {ilike / fts:>7.1f}x"
+            )
+        if args.explain:
+            explain(terms[2])
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
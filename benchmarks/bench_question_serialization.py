@@ -0,0 +1,115 @@
+"""
+Benchmark: rows/sec serializing question lists via ModelSerializer vs
+.values_list() rows (ValuesRows).
+
+Fills a throwaway test database with --rows questions, then times reading
+and serializing all of them both ways, plus the serialization step alone
+on rows already fetched.
+
+    python -m benchmarks.bench_question_serialization --rows 10000
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.db import connection  # noqa
+
+from core.models import Child, Family, Question, TopicCategory  # noqa
+from core.serializers import QuestionSerializer  # noqa
+from core.serializers.rows import ValuesRows  # noqa
+
+WORDS = ["lion", "moon", "volcano", "purr", "rocket", "ocean", "thunder", "seed"]
+
+
+def fill(rows, rng):
+    family = Family.objects.create(name="Benchmark Family")
+    children = [
+        Child.objects.create(family=family, name=f"Kid {n}", age=8) for n in range(5)
+    ]
+    topics = [
+        TopicCategory.objects.create(
+            name=f"Topic {n}", slug=f"topic-{n}", description="", icon=""
+        )
+        for n in range(4)
+    ]
+    Question.objects.bulk_create(
+        (
+            Question(
+                child=rng.choice(children),
+                text=f"Why do {' '.join(rng.choices(WORDS, k=3))}?",
+                answer=" ".join(rng.choices(WORDS, k=60)),
+                detected_topic=rng.choice(topics + [None]),
+            )
+            for _ in range(rows)
+        ),
+        batch_size=2000,
+    )
+
+
+def serializer_path():
+    queryset = Question.objects.select_related("child", "detected_topic")
+    return QuestionSerializer(queryset, many=True).data
+
+
+def values_path():
+    rows = ValuesRows.for_serializer(QuestionSerializer(), Question.objects.all())
+    return rows.to_representation(rows.queryset)
+
+
+def timed(function, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        fill(args.rows, random.Random(args.seed))
+        assert serializer_path() == values_path()
+
+        instances = list(Question.objects.select_related("child", "detected_topic"))
+        rows = ValuesRows.for_serializer(QuestionSerializer(), Question.objects.all())
+        tuples = list(rows.queryset)
+        cases = {
+            "fetch + serialize": (serializer_path, values_path),
+            "serialize only": (
+                lambda: QuestionSerializer(instances, many=True).data,
+                lambda: rows.to_representation(tuples),
+            ),
+        }
+
+        print(f"\n{args.rows:,} questions, median of {args.repeats} runs")
+        print(f"{'':<20} {'serializer':>14} {'values rows':>14} {'speedup':>8}")
+        for label, (before, after) in cases.items():
+            slow = timed(before, args.repeats)
+            fast = timed(after, args.repeats)
+            print(
+                f"{label:<20} {args.rows / slow:>9,.0f} rows/s "
+                f"{args.rows / fast:>9,.0f} rows/s {slow / fast:>7.1f}x"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: near-duplicate lookup latency with a large question index.
+
+Builds a SimilarQuestionIndex of synthetic questions spread across every
+topic and reading level, then times lookups for paraphrases of stored
+questions (hits) and for unseen questions (misses).
+
+    python -m benchmarks.bench_similar_questions --size 1000000
+"""
+
+import argparse
+import os
+import random
+import resource
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from core.services.similar_questions import SimilarQuestionIndex  # noqa
+from core.services.topic_matcher import TOPIC_KEYWORDS  # noqa
+
+READING_LEVELS = ["early", "intermediate", "advanced"]
+OPENERS = ["why do", "how do", "what makes", "how come", "why does", "can you tell me"]
+SYLLABLES = ["ba", "ko", "ri", "tu", "mel", "zan", "pe", "dro", "li", "qua", "sn", "or"]
+
+
+def build_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_question(rng, vocabulary, topic):
+    content = [rng.choice(TOPIC_KEYWORDS[topic])]
+    content += rng.sample(vocabulary, rng.randint(2, 4))
+    return content, f"{rng.choice(OPENERS)} {' '.join(content)}?"
+
+
+def paraphrase(rng, content):
+    words = content[:]
+    rng.shuffle(words)
+    return f"{rng.choice(OPENERS)} my {' '.join(w + 's' for w in words)}"
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]  # noqa
+    return (
+        f"mean={statistics.fmean(samples):7.1f}us  p50={pick(0.50):7.1f}us  "
+        f"p95={pick(0.95):7.1f}us  p99={pick(0.99):7.1f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary, rng)
+    topics = list(TOPIC_KEYWORDS)
+    index = SimilarQuestionIndex()
+    probes = []
+
+    start = time.perf_counter()
+    for question_id in range(1, args.size + 1):
+        topic, level = rng.choice(topics), rng.choice(READING_LEVELS)
+        content, text = make_question(rng, vocabulary, topic)
+        index.add(question_id, text, topic, level)
+        if len(probes) < args.queries and rng.random() < args.queries / args.size:
+            probes.append((question_id, content, topic, level))
+    build_seconds = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(
+        f"indexed {len(index):,} questions in {build_seconds:.1f}s "
+        f"({len(index) / build_seconds:,.0f}/s), peak RSS {rss_mb:,.0f} MB"
+    )
+
+    hit_times, found = [], 0
+    for question_id, content, topic, level in probes:
+        text = paraphrase(rng, content)
+        start = time.perf_counter()
+        match = index.query(text, topic, level, args.threshold)
+        hit_times.append((time.perf_counter() - start) * 1e6)
+        found += bool(match and match[0] == question_id)
+
+    miss_times = []
+    for _ in range(len(probes)):
+        topic, level = rng.choice(topics), rng.choice(READING_LEVELS)
+        _, text = make_question(rng, vocabulary, topic)
+        start = time.perf_counter()
+        index.query(text, topic, level, args.threshold)
+        miss_times.append((time.perf_counter() - start) * 1e6)
+
+    print(f"paraphrase lookups ({found}/{len(probes)} found): {percentiles(hit_times)}")
+    print(f"unseen lookups:                       {percentiles(miss_times)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: payload size and query time of question lists with ?fields=.
+
+Fills a throwaway test database with --rows questions whose answers are
+--answer-words long, then requests cursor pages of 100 from the questions
+list with and without ?fields= and reports the JSON payload size, the time
+spent in SQL and the total time per page.
+
+    python -m benchmarks.bench_sparse_fields --rows 200000
+"""
+
+import argparse
+import io
+import logging
+import os
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.contrib.auth.models import User  # noqa
+from django.db import connection  # noqa
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa
+
+from core.models import Child, Family  # noqa
+from core.views import QuestionViewSet  # noqa
+
+SYLLABLES = ["ba", "ko", "ri", "tu", "mel", "zan", "pe", "dro", "li", "qua", "sn", "or"]
+BATCH = 50_000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+VARIANTS = {
+    "all fields": None,
+    "id,text,created_at": "id,text,created_at",
+    "id,text,child_name": "id,text,child_name",
+    "id,status": "id,status",
+}
+
+COPY_SQL = """
+COPY core_question (
+    child_id, text, answer, was_within_boundaries, llm_model, stop_reason,
+    status, attempts, last_error, created_at
+) FROM STDIN
+"""
+
+
+def fill(rows, answer_words, rng):
+    child = Child.objects.create(
+        family=Family.objects.create(name="Benchmark Family"), name="Kid", age=8
+    )
+    words = ["".join(rng.choices(SYLLABLES, k=3)) for _ in range(5000)]
+    with connection.cursor() as cursor:
+        for start in range(0, rows, BATCH):
+            buffer = io.StringIO()
+            for n in range(start, min(start + BATCH, rows)):
+                created_at = (START + timedelta(seconds=n)).isoformat()
+                buffer.write(
+                    f"{child.id}\twhy do {' '.join(rng.choices(words, k=3))}?\t"
+                    f"{' '.join(rng.choices(words, k=answer_words))}\t"
+                    f"t\t\t\tanswered\t0\t\t{created_at}\n"
+                )
+            buffer.seek(0)
+            cursor.copy_expert(COPY_SQL, buffer)
+        cursor.execute("ANALYZE core_question")
+
+
+@contextmanager
+def sql_timer(totals):
+    """Adds the time spent executing SQL to totals[0]"""
+
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            totals[0] += time.perf_counter() - started
+
+    with connection.execute_wrapper(wrapper):
+        yield
+
+
+def fetch_pages(view, user, fields, pages):
+    """Walk `pages` cursor pages; returns bytes, SQL seconds, total seconds"""
+    factory = APIRequestFactory(HTTP_HOST="localhost")
+    params = {"cursor": "", "page_size": 100}
+    if fields:
+        params["fields"] = fields
+    size, sql = 0, [0.0]
+    started = time.perf_counter()
+    with sql_timer(sql):
+        for _ in range(pages):
+            request = factory.get("/api/v1/questions/", params)
+            force_authenticate(request, user)
+            response = view(request)
+            response.render()
+            size += len(response.content)
+            if not response.data["next"]:
+                break
+            params["cursor"] = parse_qs(urlsplit(response.data["next"]).query)[
+                "cursor"
+            ][0]
+    return size, sql[0], time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--answer-words", type=int, default=250)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f"Loading {args.rows:,} questions...")
+        fill(args.rows, args.answer_words, random.Random(args.seed))
+        user = User.objects.create_user("bench")
+        view = QuestionViewSet.as_view({"get": "list"}, throttle_classes=[])
+
+        print(
+            f"\n{args.pages} pages of 100, median of {args.repeats} runs\n"
+            f"{'?fields=':<22} {'payload':>10} {'SQL':>9} {'total':>9}"
+        )
+        baseline = None
+        for label, fields in VARIANTS.items():
+            runs = [
+                fetch_pages(view, user, fields, args.pages) for _ in range(args.repeats)
+            ]
+            size = runs[0][0]
+            sql = statistics.median(run[1] for run in runs)
+            total = statistics.median(run[2] for run in runs)
+            baseline = baseline or (size, sql, total)
+            print(
+                f"{label:<22} {size / 1024:>8.0f}KB {sql * 1000:>7.0f}ms "
+                f"{total * 1000:>7.0f}ms  "
+                f"({size / baseline[0]:.0%} / {sql / baseline[1]:.0%} / "
+                f"{total / baseline[2]:.0%})"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Microbenchmark: topic detection throughput on synthetic questions.
+
+Compares the original per-keyword substring scan with the compiled
+TopicMatcher used by QuestionService.detect_topic.
+
+    python -m benchmarks.bench_topic_matcher --questions 100000
+"""
+
+import argparse
+import os
+import random
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from core.services.topic_matcher import TOPIC_KEYWORDS, get_topic_matcher  # noqa
+
+FILLER_WORDS = [
+    "why",
+    "how",
+    "what",
+    "is",
+    "the",
+    "a",
+    "do",
+    "can",
+    "big",
+    "small",
+    "really",
+    "my",
+    "friend",
+    "said",
+    "today",
+    "and",
+    "where",
+    "education",
+    "favorite",
+    "color",
+]
+
+
+def build_questions(count, seed=42):
+    """Generate questions mixing topic keywords with filler words."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in TOPIC_KEYWORDS.values() for kw in kws]
+    questions = []
+    for _ in range(count):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(5, 14))
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        questions.append(" ".join(words).capitalize() + "?")
+    return questions
+
+
+def legacy_detect(question_text):
+    """The original detect_topic loop, minus the database lookups."""
+    question_lower = question_text.lower()
+    # The original rebuilt its keyword table on every call
+    topic_keywords = {slug: list(keywords) for slug, keywords in TOPIC_KEYWORDS.items()}
+    for slug, keywords in topic_keywords.items():
+        if any(keyword in question_lower for keyword in keywords):
+            return slug
+    return None
+
+
+def legacy_all_topics(question_text):
+    """The original substring scan extended to report every matching topic."""
+    question_lower = question_text.lower()
+    matched = [
+        slug
+        for slug, keywords in TOPIC_KEYWORDS.items()
+        if any(keyword in question_lower for keyword in keywords)
+    ]
+    return matched[0] if matched else None
+
+
+def compiled_detect(question_text, matcher=get_topic_matcher()):
+    matches = matcher.match(question_text)
+    return matches[0].slug if matches else None
+
+
+def run(label, func, questions):
+    start = time.perf_counter()
+    matched = sum(1 for question in questions if func(question) is not None)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<12} {len(questions) / elapsed:>12,.0f} questions/s  "
+        f"{elapsed * 1e6 / len(questions):>7.2f} us/question  matched={matched}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    questions = build_questions(args.questions, args.seed)
+    print(f"{len(questions):,} synthetic questions")
+    run("legacy", legacy_detect, questions)
+    run("legacy-all", legacy_all_topics, questions)
+    run("compiled", compiled_detect, questions)
+
+
+if __name__ == "__main__":
+    main()
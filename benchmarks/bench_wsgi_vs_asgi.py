@@ -0,0 +1,228 @@
+"""
+Benchmark: concurrent ask throughput under the WSGI and ASGI handlers.
+
+Drives config.wsgi.application from a pool of --threads threads (like
+gunicorn's gthread worker) and config.asgi.application from a single event
+loop with --concurrency requests in flight, against an in-process fake LLM
+that sleeps --latency seconds per answer. Runs in a throwaway test database.
+
+    python -m benchmarks.bench_wsgi_vs_asgi --requests 400 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.db import connection  # noqa
+from django.test.utils import override_settings  # noqa
+
+from core.models import Child, ChildTopicAccess, Family, TopicCategory  # noqa
+from core.services.fake_llm import FakeAnthropic, FakeAsyncAnthropic  # noqa
+
+ASK_PATH = "/api/v1/questions/ask/"
+
+
+def ask_body(child_id, number):
+    question = f"Why do lions roar at night number {number}?"
+    return json.dumps({"child_id": child_id, "question": question}).encode()
+
+
+def wsgi_ask(application, body):
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": ASK_PATH,
+        "QUERY_STRING": "",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.url_scheme": "http",
+        "wsgi.errors": io.StringIO(),
+    }
+    statuses = []
+    started = time.perf_counter()
+    result = application(environ, lambda status, headers: statuses.append(status))
+    b"".join(result)
+    result.close()
+    return int(statuses[0].split()[0]), time.perf_counter() - started
+
+
+async def asgi_ask(application, body):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": ASK_PATH,
+        "raw_path": ASK_PATH.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    statuses = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return statuses[0], time.perf_counter() - started
+
+
+class ThreadCounter:
+    """Samples the process thread count in the background"""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_wsgi(child_ids, threads):
+    from config.wsgi import application
+
+    with ThreadCounter() as counter, ThreadPoolExecutor(threads) as pool:
+        started = time.perf_counter()
+        results = list(
+            pool.map(
+                lambda item: wsgi_ask(application, ask_body(*item)),
+                [(child_id, n) for n, child_id in enumerate(child_ids)],
+            )
+        )
+        elapsed = time.perf_counter() - started
+    return results, elapsed, counter.peak
+
+
+def run_asgi(child_ids, concurrency):
+    from config.asgi import application
+
+    async def run():
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one(child_id, number):
+            async with slots:
+                return await asgi_ask(application, ask_body(child_id, number))
+
+        return await asyncio.gather(
+            *(one(child_id, n) for n, child_id in enumerate(child_ids))
+        )
+
+    with ThreadCounter() as counter:
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+    return results, elapsed, counter.peak
+
+
+def report(name, results, elapsed, peak_threads):
+    latencies = sorted(latency for _, latency in results)
+    ok = sum(1 for status, _ in results if status == 201)
+    pick = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]  # noqa
+    print(
+        f"{name:<5} {ok}/{len(results)} ok  {len(results) / elapsed:7.1f} req/s  "
+        f"p50={pick(0.50) * 1000:6.0f}ms  p95={pick(0.95) * 1000:6.0f}ms  "
+        f"mean={statistics.fmean(latencies) * 1000:6.0f}ms  "
+        f"peak threads={peak_threads}"
+    )
+
+
+def create_children(count):
+    family = Family.objects.create(name="Benchmark Family")
+    topic, _ = TopicCategory.objects.get_or_create(
+        slug="animals",
+        defaults={"name": "Animals", "icon": "🦁", "description": "Animals"},
+    )
+    # One child per request keeps every ask under the per-child rate limit
+    children = Child.objects.bulk_create(
+        Child(family=family, name=f"Kid {i}", age=8) for i in range(count)
+    )
+    ChildTopicAccess.objects.bulk_create(
+        ChildTopicAccess(child=child, topic=topic) for child in children
+    )
+    return [child.id for child in children]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--threads", type=int, default=16, help="WSGI worker threads")
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="ASGI requests in flight"
+    )
+    parser.add_argument("--mode", choices=["both", "wsgi", "asgi"], default="both")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(
+            DEBUG=False,
+            ALLOWED_HOSTS=["*"],
+            SIMILAR_QUESTIONS_THRESHOLD=1.1,  # every question goes to the LLM
+        ), patch(
+            "core.services.question_service.get_anthropic_client",
+            return_value=FakeAnthropic(latency=args.latency),
+        ), patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=FakeAsyncAnthropic(latency=args.latency),
+        ):
+            print(
+                f"{args.requests} asks, fake LLM latency {args.latency}s, "
+                f"WSGI threads={args.threads}, ASGI in flight={args.concurrency}"
+            )
+            if args.mode in ("both", "wsgi"):
+                child_ids = create_children(args.requests)
+                connection.close()
+                report("wsgi", *run_wsgi(child_ids, args.threads))
+            if args.mode in ("both", "asgi"):
+                child_ids = create_children(args.requests)
+                connection.close()
+                report("asgi", *run_asgi(child_ids, args.concurrency))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+HTTP stand-in for the Anthropic Messages API, for load tests.
+
+Serves POST /v1/messages like the real API (JSON or SSE streaming) with
+log-normal latency, word-by-word token streaming, injected 429/500/529
+errors and hung requests, and canned answers. Point the app at it with
+ANTHROPIC_BASE_URL=http://127.0.0.1:<port>.
+
+    python -m benchmarks.fake_anthropic_server --latency-median 0.8 --latency-p95 2
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from core.services.fake_llm import DEFAULT_ANSWER, FakeAnthropic, text_deltas  # noqa
+
+ERROR_TYPES = {
+    429: "rate_limit_error",
+    500: "api_error",
+    529: "overloaded_error",
+}
+
+
+class CannedAnswers:
+    """
+    Picks an answer by keyword: the first (keyword, answer) pair whose
+    keyword appears in the question wins, else the default.
+    """
+
+    def __init__(self, answers=None, default=DEFAULT_ANSWER):
+        self.answers = [(keyword.lower(), answer) for keyword, answer in answers or []]
+        self.default = default
+
+    @classmethod
+    def from_file(cls, path):
+        """Load {"keyword": "answer", ..., "default": "..."} from JSON"""
+        with open(path) as f:
+            data = json.load(f)
+        default = data.pop("default", DEFAULT_ANSWER)
+        return cls(data.items(), default)
+
+    def __call__(self, question):
+        text = question.lower()
+        for keyword, answer in self.answers:
+            if keyword in text:
+                return answer
+        return self.default
+
+
+class FakeServerConfig:
+    """
+    Behaviour of the fake server; may be changed while it runs.
+
+    Latency is log-normal with the given median and 95th percentile.
+    error_rates maps status codes (429, 500, 529) to the share of requests
+    that fail with them; timeout_rate is the share that hang for
+    hang_seconds; the first fail_first requests fail with fail_status.
+    """
+
+    def __init__(
+        self,
+        latency_median=0.0,
+        latency_p95=None,
+        token_latency=0.0,
+        error_rates=None,
+        timeout_rate=0.0,
+        hang_seconds=60.0,
+        retry_after=1.0,
+        fail_first=0,
+        fail_status=500,
+        answers=None,
+        seed=None,
+    ):
+        self.latency_median = latency_median
+        self.latency_p95 = latency_p95 or latency_median
+        self.token_latency = token_latency
+        self.error_rates = error_rates or {}
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.answers = answers or CannedAnswers()
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def latency(self):
+        if not self.latency_median:
+            return 0.0
+        # p95 of a log-normal sits 1.645 sigma above the median (in log space)
+        sigma = math.log(self.latency_p95 / self.latency_median) / 1.645
+        with self._lock:
+            return self.random.lognormvariate(math.log(self.latency_median), sigma)
+
+    def fault(self):
+        """None, "timeout" or an HTTP status code to fail this request with"""
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return self.fail_status
+            roll = self.random.random()
+        if roll < self.timeout_rate:
+            return "timeout"
+        roll -= self.timeout_rate
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+
+
+class FakeMessagesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.split("?")[0] != "/v1/messages":
+            return self.send_json(404, error_body("not_found_error", "Not found"))
+
+        server = self.server
+        server.count("requests")
+        params = json.loads(body or b"{}")
+        config = server.config
+
+        fault = config.fault()
+        if fault == "timeout":
+            server.count("timeouts")
+            time.sleep(config.hang_seconds)
+            self.close_connection = True
+            return
+        time.sleep(config.latency())
+        if fault is not None:
+            server.count("errors")
+            headers = {"retry-after": str(config.retry_after)} if fault == 429 else {}
+            message = f"Injected {fault}"
+            return self.send_json(
+                fault, error_body(ERROR_TYPES.get(fault, "api_error"), message), headers
+            )
+
+        message = server.llm._build_message(params)
+        if params.get("stream"):
+            return self.send_stream(message)
+        return self.send_json(200, message_body(message))
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, message):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True  # the body ends when the socket closes
+
+        text = message.content[0].text
+        start = message_body(message)
+        start.update(content=[], stop_reason=None, usage={**start["usage"]})
+        start["usage"]["output_tokens"] = 1
+        self.send_event("message_start", {"message": start})
+        self.send_event(
+            "content_block_start",
+            {"index": 0, "content_block": {"type": "text", "text": ""}},
+        )
+        for i, delta in enumerate(text_deltas(text)):
+            if i and self.server.config.token_latency:
+                time.sleep(self.server.config.token_latency)
+            self.send_event(
+                "content_block_delta",
+                {"index": 0, "delta": {"type": "text_delta", "text": delta}},
+            )
+        self.send_event("content_block_stop", {"index": 0})
+        self.send_event(
+            "message_delta",
+            {
+                "delta": {"stop_reason": message.stop_reason, "stop_sequence": None},
+                "usage": {"output_tokens": message.usage.output_tokens},
+            },
+        )
+        self.send_event("message_stop", {})
+
+    def send_event(self, event, data):
+        payload = json.dumps({"type": event, **data})
+        self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode())
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def message_body(message):
+    return {
+        "id": message.id,
+        "type": "message",
+        "role": "assistant",
+        "model": message.model,
+        "content": [{"type": "text", "text": message.content[0].text}],
+        "stop_reason": message.stop_reason,
+        "stop_sequence": None,
+        "usage": vars(message.usage),
+    }
+
+
+def error_body(error_type, message):
+    return {"type": "error", "error": {"type": error_type, "message": message}}
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    """Threaded fake Messages API; counts requests, errors and timeouts"""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), config=None, model="claude-fake"):
+        super().__init__(address, FakeMessagesHandler)
+        self.config = config or FakeServerConfig()
+        self.llm = FakeAnthropic(answer=self.config.answers, model=model)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def handle_error(self, request, client_address):
+        pass  # clients that time out hang up mid-response
+
+    def start(self):
+        """Serve from a daemon thread; returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def error_rates(value):
+    """Parse "429=0.05,500=0.01" into {429: 0.05, 500: 0.01}"""
+    rates = {}
+    for item in filter(None, value.split(",")):
+        status, _, rate = item.partition("=")
+        rates[int(status)] = float(rate)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run a fake Anthropic Messages API for load tests "
+            "(point the app at it with ANTHROPIC_BASE_URL)"
+        )
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency-median",
+        type=float,
+        default=0.8,
+        help="Median seconds before the response (log-normal)",
+    )
+    parser.add_argument(
+        "--latency-p95", type=float, default=2.0, help="95th percentile seconds"
+    )
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=0.02,
+        help="Seconds between streamed deltas",
+    )
+    parser.add_argument(
+        "--error-rates",
+        type=error_rates,
+        default={},
+        help='Share of requests failing per status, e.g. "429=0.05,500=0.01"',
+    )
+    parser.add_argument(
+        "--timeout-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests that hang for --hang-seconds",
+    )
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After sent with 429s"
+    )
+    parser.add_argument(
+        "--answers",
+        help='JSON file of {"keyword": "answer", ..., "default": "answer"}',
+    )
+    parser.add_argument("--model", default="claude-fake")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.latency_p95 < args.latency_median:
+        parser.error("--latency-p95 must be at least --latency-median")
+
+    config = FakeServerConfig(
+        latency_median=args.latency_median,
+        latency_p95=args.latency_p95,
+        token_latency=args.token_latency,
+        error_rates=args.error_rates,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        retry_after=args.retry_after,
+        answers=CannedAnswers.from_file(args.answers) if args.answers else None,
+        seed=args.seed,
+    )
+    server = FakeAnthropicServer((args.host, args.port), config, model=args.model)
+
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+
+    server.start()
+    print(
+        f"Fake Anthropic API on {server.base_url} "
+        f"(set ANTHROPIC_BASE_URL={server.base_url})"
+    )
+    stopped.wait()
+    server.stop()
+    print(f"Served {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
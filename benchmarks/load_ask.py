@@ -0,0 +1,207 @@
+"""
+Load generator: replays a mix of ask, list and children traffic over HTTP.
+
+Runs against a live server, e.g. one pointed at the fake Anthropic API:
+
+    python -m benchmarks.fake_anthropic_server --latency-median 0.8 --latency-p95 2
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 gunicorn config.wsgi -w 4 --threads 8
+    python -m benchmarks.load_ask --token <parent token> --duration 60
+
+Child ids come from GET /children/ (needs --token) or --child-ids. Asks are
+rate limited per child, so spread load over enough children or raise the
+ai_questions rate for the test.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+QUESTIONS = [
+    "Why do lions roar?",
+    "How do volcanoes erupt?",
+    "Why is the sky blue?",
+    "How far away is the moon?",
+    "Why do cats purr?",
+    "How do plants drink water?",
+    "What makes thunder so loud?",
+    "How do birds know where to fly in winter?",
+]
+
+
+class Recorder:
+    """Thread-safe latency and status samples per request kind"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, kind, status, latency):
+        with self._lock:
+            self.latencies[kind].append(latency)
+            self.statuses[kind][status] += 1
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def parse_mix(value):
+    """Parse "ask=6,list=3,children=1" into weights"""
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+class LoadGenerator:
+    def __init__(
+        self, base_url, child_ids, token=None, mix=None, unique=False, seed=None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.child_ids = child_ids
+        self.token = token
+        self.unique = unique
+        self.mix = mix or {"ask": 6, "list": 3, "children": 1}
+        if not token:
+            self.mix.pop("children", None)
+        self.random = random.Random(seed)
+        self.recorder = Recorder()
+
+    def client(self):
+        headers = {"Authorization": f"Token {self.token}"} if self.token else {}
+        return httpx.Client(base_url=self.base_url, headers=headers, timeout=60)
+
+    def request(self, client, kind):
+        if kind == "ask":
+            question = self.random.choice(QUESTIONS)
+            if self.unique:
+                # Defeat the answer cache so every ask reaches the LLM
+                question = f"{question} ({self.random.getrandbits(32)})"
+            return client.post(
+                "/api/v1/questions/ask/",
+                json={
+                    "child_id": self.random.choice(self.child_ids),
+                    "question": question,
+                },
+            )
+        if kind == "list":
+            return client.get(
+                "/api/v1/questions/",
+                params={"child_id": self.random.choice(self.child_ids)},
+            )
+        if kind == "children":
+            return client.get("/api/v1/children/")
+        raise ValueError(f"Unknown request kind {kind!r}")
+
+    def worker(self, stop_at, remaining):
+        kinds, weights = zip(*self.mix.items())
+        with self.client() as client:
+            while time.monotonic() < stop_at:
+                if remaining is not None:
+                    with remaining["lock"]:
+                        if remaining["count"] <= 0:
+                            return
+                        remaining["count"] -= 1
+                kind = self.random.choices(kinds, weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = self.request(client, kind).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                self.recorder.record(kind, status, time.perf_counter() - started)
+
+    def run(self, concurrency, duration, requests=None):
+        stop_at = time.monotonic() + duration
+        remaining = {"count": requests, "lock": threading.Lock()} if requests else None
+        threads = [
+            threading.Thread(target=self.worker, args=(stop_at, remaining))
+            for _ in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    def report(self, elapsed):
+        total = sum(len(v) for v in self.recorder.latencies.values())
+        print(f"{total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s")
+        for kind, latencies in sorted(self.recorder.latencies.items()):
+            statuses = ", ".join(
+                f"{status}: {count}"
+                for status, count in sorted(
+                    self.recorder.statuses[kind].items(), key=str
+                )
+            )
+            print(
+                f"{kind:<9} n={len(latencies):<6} "
+                f"p50={percentile(latencies, 0.50) * 1000:7.0f}ms "
+                f"p95={percentile(latencies, 0.95) * 1000:7.0f}ms "
+                f"p99={percentile(latencies, 0.99) * 1000:7.0f}ms "
+                f"mean={statistics.fmean(latencies) * 1000:7.0f}ms  [{statuses}]"
+            )
+
+
+def discover_child_ids(base_url, token):
+    response = httpx.get(
+        f"{base_url.rstrip('/')}/api/v1/children/",
+        headers={"Authorization": f"Token {token}"},
+    )
+    response.raise_for_status()
+    data = response.json()
+    return [child["id"] for child in data.get("results", data)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", help="Parent API token (enables children traffic)")
+    parser.add_argument(
+        "--child-ids", type=lambda v: [int(i) for i in v.split(",")], default=None
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--mix", type=parse_mix, default="ask=6,list=3,children=1")
+    parser.add_argument(
+        "--unique",
+        action="store_true",
+        help="Make every question unique so none is served from the answer cache",
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    child_ids = args.child_ids
+    if child_ids is None:
+        if not args.token:
+            parser.error("pass --child-ids or --token to discover children")
+        child_ids = discover_child_ids(args.base_url, args.token)
+    if not child_ids:
+        parser.error("no children to ask questions for")
+
+    generator = LoadGenerator(
+        args.base_url,
+        child_ids,
+        token=args.token,
+        mix=args.mix,
+        unique=args.unique,
+        seed=args.seed,
+    )
+    print(
+        f"{args.concurrency} clients for {args.duration:.0f}s against "
+        f"{args.base_url}, mix {generator.mix}, {len(child_ids)} children"
+    )
+    generator.report(generator.run(args.concurrency, args.duration, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Load active topics once per process before serving traffic
+from core.services.topic_registry import topic_registry  # noqa: E402
+
+topic_registry.warm()
@@ -0,0 +1,22 @@
+"""
+URL configuration for ASGI deployments (see core.middleware).
+
+Routes the ask and wait endpoints to their native async views and everything
+else to config.urls.
+"""
+
+from django.urls import path
+
+from core.views import AsyncAskQuestionView, AsyncWaitQuestionView
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+ask_view = AsyncAskQuestionView.as_view()
+wait_view = AsyncWaitQuestionView.as_view()
+
+urlpatterns = [
+    path("api/v1/questions/ask/", ask_view, name="question-ask-async"),
+    path("api/questions/ask/", ask_view),
+    path("api/v1/questions/<int:pk>/wait/", wait_view, name="question-wait-async"),
+    path("api/questions/<int:pk>/wait/", wait_view),
+] + wsgi_urlpatterns
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.asgi_urlconf_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,6 +54,8 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = "config.urls"
+# Used instead of ROOT_URLCONF for requests served by config/asgi.py
+ASGI_URLCONF = "config.asgi_urls"
 
 TEMPLATES = [
     {
@@ -94,6 +97,18 @@ DATABASES = {
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # orjson when installed, else the stdlib encoder/decoder (same output)
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        # Opt-in with ?format=columnar: lists as dictionary-encoded columns
+        "core.renderers.ColumnarJSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.TokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
@@ -113,6 +128,17 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "core.exceptions.custom_exception_handler",
 }
 
+# MessagePack bodies (Accept/Content-Type: application/msgpack) when installed
+try:
+    import msgpack  # noqa
+
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "core.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("core.parsers.MessagePackParser")
+except ImportError:
+    pass
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -155,8 +181,117 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache Configuration
+# Process-local caches (topic registry, etc.) coordinate invalidation through
+# version keys in this cache, so multi-worker deployments need a shared
+# backend such as django.core.cache.backends.redis.RedisCache.
+# ETags are built from the same version keys and are off with LocMemCache.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# How often (seconds) each worker checks whether its topic registry is stale
+TOPIC_REGISTRY_REFRESH_SECONDS = int(os.getenv("TOPIC_REGISTRY_REFRESH_SECONDS", "5"))
+
+# How long (seconds) a child's allowed-topic set stays cached; access changes
+# invalidate it immediately
+CHILD_TOPICS_CACHE_TIMEOUT = int(os.getenv("CHILD_TOPICS_CACHE_TIMEOUT", "3600"))
+
 # Anthropic API Configuration
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+# Point the client at another server (e.g. a local stub); defaults to the API
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL") or None
+# Each process shares one pooled client: at most ANTHROPIC_MAX_CONNECTIONS
+# concurrent connections, of which ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS are kept
+# open for reuse for up to ANTHROPIC_KEEPALIVE_EXPIRY idle seconds
+ANTHROPIC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "20"))
+ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", "10")
+)
+ANTHROPIC_KEEPALIVE_EXPIRY = float(os.getenv("ANTHROPIC_KEEPALIVE_EXPIRY", "30"))
+# Per-attempt timeouts (seconds). SDK-level retries are off by default:
+# create_message() retries itself, within the breaker and the call deadline.
+ANTHROPIC_TIMEOUT = float(os.getenv("ANTHROPIC_TIMEOUT", "30"))
+ANTHROPIC_CONNECT_TIMEOUT = float(os.getenv("ANTHROPIC_CONNECT_TIMEOUT", "5"))
+ANTHROPIC_MAX_RETRIES = int(os.getenv("ANTHROPIC_MAX_RETRIES", "0"))
+# All attempts of one answer must finish within ANTHROPIC_CALL_DEADLINE
+# seconds; retryable errors (timeouts, 429, 5xx, 529) are retried up to
+# ANTHROPIC_RETRY_ATTEMPTS times after Retry-After or a jittered exponential
+# backoff (ANTHROPIC_RETRY_BACKOFF * 2^n, at most ANTHROPIC_RETRY_MAX_DELAY)
+ANTHROPIC_CALL_DEADLINE = float(os.getenv("ANTHROPIC_CALL_DEADLINE", "20"))
+ANTHROPIC_RETRY_ATTEMPTS = int(os.getenv("ANTHROPIC_RETRY_ATTEMPTS", "2"))
+ANTHROPIC_RETRY_BACKOFF = float(os.getenv("ANTHROPIC_RETRY_BACKOFF", "0.5"))
+ANTHROPIC_RETRY_MAX_DELAY = float(os.getenv("ANTHROPIC_RETRY_MAX_DELAY", "8"))
+# Circuit breaker: after ANTHROPIC_BREAKER_FAILURE_THRESHOLD consecutive
+# failures, calls fail fast for ANTHROPIC_BREAKER_RECOVERY_TIMEOUT seconds
+# before one trial call is let through. State is shared through the cache.
+ANTHROPIC_BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("ANTHROPIC_BREAKER_FAILURE_THRESHOLD", "5")
+)
+ANTHROPIC_BREAKER_RECOVERY_TIMEOUT = float(
+    os.getenv("ANTHROPIC_BREAKER_RECOVERY_TIMEOUT", "30")
+)
+
+# USD per million tokens, for the estimated cost in /stats/llm/. Models not
+# listed are reported without a cost.
+LLM_PRICING = {
+    "claude-sonnet-4-20250514": {
+        "input": 3.00,
+        "output": 15.00,
+        "cache_write": 3.75,
+        "cache_read": 0.30,
+    },
+}
+
+# Exact-match answer cache (per process): entries expire after
+# ANSWER_CACHE_TTL seconds and the least recently used are evicted beyond
+# ANSWER_CACHE_MAX_ENTRIES
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "86400"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "10000"))
+
+# Near-duplicate answer reuse: a new question reuses a prior answer (same
+# topic and reading level) when its estimated similarity reaches the
+# threshold. Workers load the snapshot written by
+# `manage.py rebuild_similar_questions` and add new answers incrementally.
+SIMILAR_QUESTIONS_THRESHOLD = float(os.getenv("SIMILAR_QUESTIONS_THRESHOLD", "0.8"))
+# While the Claude circuit is open, a looser match beats the error message
+SIMILAR_QUESTIONS_DEGRADED_THRESHOLD = float(
+    os.getenv("SIMILAR_QUESTIONS_DEGRADED_THRESHOLD", "0.5")
+)
+SIMILAR_QUESTIONS_INDEX_PATH = os.getenv(
+    "SIMILAR_QUESTIONS_INDEX_PATH", str(BASE_DIR / "data" / "similar_questions.idx")
+)
+
+# Single-flight: identical questions asked at the same time share one Claude
+# call. Duplicates in other workers wait up to SINGLE_FLIGHT_WAIT_SECONDS for
+# the result, which is kept in the cache for SINGLE_FLIGHT_RESULT_TTL seconds.
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "25"))
+SINGLE_FLIGHT_RESULT_TTL = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL", "10"))
+
+# Ask pipeline: "sync" answers inside the request; "async" saves the question
+# as pending, returns 202 and lets `manage.py run_answer_workers` answer it.
+# Clients can override per request with {"mode": "sync" | "async"}.
+QUESTION_ASK_MODE = os.getenv("QUESTION_ASK_MODE", "sync")
+# Answer workers: a claimed question is re-queued if not finished within the
+# visibility timeout; failed calls are retried with exponential backoff
+# before the friendly fallback is saved.
+ANSWER_WORKER_VISIBILITY_TIMEOUT = int(
+    os.getenv("ANSWER_WORKER_VISIBILITY_TIMEOUT", "60")
+)
+ANSWER_WORKER_MAX_ATTEMPTS = int(os.getenv("ANSWER_WORKER_MAX_ATTEMPTS", "3"))
+ANSWER_WORKER_RETRY_BACKOFF = float(os.getenv("ANSWER_WORKER_RETRY_BACKOFF", "5"))
+# Longest a client may block on GET /api/questions/{id}/wait/. Under ASGI the
+# wait sleeps on the event loop; under WSGI every waiting client pins a worker
+# thread for the whole wait, so that cap is kept much lower.
+QUESTION_WAIT_MAX_SECONDS = int(os.getenv("QUESTION_WAIT_MAX_SECONDS", "30"))
+QUESTION_WAIT_SYNC_MAX_SECONDS = int(os.getenv("QUESTION_WAIT_SYNC_MAX_SECONDS", "5"))
+# Rows fetched per round trip from the server-side cursor behind exports
+QUESTION_EXPORT_CHUNK_SIZE = int(os.getenv("QUESTION_EXPORT_CHUNK_SIZE", "2000"))
 
 # Logging Configuration
 # Structured JSON logging for production-ready observability
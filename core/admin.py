@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Child, ChildTopicAccess, Family, Parent, Question, TopicCategory
+from .services.question_search import search_query
 
 
 @admin.register(Family)
@@ -47,7 +48,23 @@ class QuestionAdmin(admin.ModelAdmin):
     ]
     list_filter = ["was_within_boundaries", "detected_topic", "child__family"]
     search_fields = ["text", "answer"]
-    readonly_fields = ["created_at", "response_generated_at"]
+    readonly_fields = [
+        "created_at",
+        "response_generated_at",
+        "llm_model",
+        "llm_latency_ms",
+        "stop_reason",
+        "input_tokens",
+        "output_tokens",
+        "cache_read_input_tokens",
+        "cache_creation_input_tokens",
+    ]
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the full-text GIN index instead of ILIKE scans"""
+        if not search_term:
+            return queryset, False
+        return queryset.filter(search_vector=search_query(search_term)), False
 
     def text_preview(self, obj):
         return obj.text[:50] + "..." if len(obj.text) > 50 else obj.text
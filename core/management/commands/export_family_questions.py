@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Family
+from core.services.question_export import EXPORT_FORMATS, export_chunks, export_filename
+
+
+class Command(BaseCommand):
+    help = "Write a family's question history to an NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("family_id", type=int)
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument(
+            "--output",
+            help="File to write (defaults to family-<id>-questions.<format>[.gz])",
+        )
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+        parser.add_argument(
+            "--chunk-size", type=int, default=settings.QUESTION_EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        family_id = options["family_id"]
+        if not Family.objects.filter(pk=family_id).exists():
+            raise CommandError(f"Family {family_id} does not exist")
+
+        export_format = options["format"]
+        output = options["output"] or export_filename(
+            family_id, export_format, gzip=options["gzip"]
+        )
+        gzip = options["gzip"] or output.endswith(".gz")
+
+        written = 0
+        with open(output, "wb") as f:
+            for chunk in export_chunks(
+                family_id,
+                export_format,
+                gzip=gzip,
+                chunk_size=options["chunk_size"],
+            ):
+                f.write(chunk)
+                written += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {written} bytes of questions to {output}")
+        )
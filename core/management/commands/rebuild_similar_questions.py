@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import Question
+from core.services.question_service import FALLBACK_ANSWER
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the near-duplicate question index from answered questions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SIMILAR_QUESTIONS_INDEX_PATH,
+            help="Snapshot path (defaults to SIMILAR_QUESTIONS_INDEX_PATH)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        index = SimilarQuestionIndex()
+        # Answers marked unhelpful on any question that carries them
+        rejected = Question.objects.filter(
+            child_marked_helpful=False, answer__isnull=False
+        ).values("answer")
+        questions = (
+            Question.objects.filter(
+                was_within_boundaries=True,
+                status=Question.STATUS_ANSWERED,
+                answer__isnull=False,
+            )
+            .exclude(answer="")
+            .exclude(answer=FALLBACK_ANSWER)
+            .exclude(answer__in=rejected)
+            .values_list("id", "text", "detected_topic__slug", "child__reading_level")
+            .order_by("id")
+        )
+
+        for question_id, text, topic_slug, reading_level in questions.iterator(
+            chunk_size=options["chunk_size"]
+        ):
+            index.add(question_id, text, topic_slug, reading_level)
+
+        index.save(options["output"])
+        reset_similar_question_index(index)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {len(index)} questions into {options['output']}"
+            )
+        )
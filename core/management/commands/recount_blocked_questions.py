@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.services.blocked_questions import recount_unreviewed
+
+
+class Command(BaseCommand):
+    help = "Recompute each family's unreviewed blocked-question count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "family_ids", nargs="*", type=int, help="Only these families"
+        )
+
+    def handle(self, *args, **options):
+        updated = recount_unreviewed(options["family_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} families"))
@@ -0,0 +1,76 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services import QuestionService
+from core.services.answer_queue import AnswerWorker, AnswerWorkerPool
+
+
+class Command(BaseCommand):
+    help = "Answer questions queued by async asks (mode=async)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=1)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=settings.ANSWER_WORKER_VISIBILITY_TIMEOUT,
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=settings.ANSWER_WORKER_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            "--retry-backoff",
+            type=float,
+            default=settings.ANSWER_WORKER_RETRY_BACKOFF,
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the questions that are ready now and exit",
+        )
+
+    def make_worker(self, options):
+        return AnswerWorker(
+            QuestionService(),
+            batch_size=options["batch_size"],
+            visibility_timeout=options["visibility_timeout"],
+            max_attempts=options["max_attempts"],
+            retry_backoff=options["retry_backoff"],
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            worker = self.make_worker(options)
+            answered = 0
+            while True:
+                claimed = worker.run_once()
+                if not claimed:
+                    break
+                answered += claimed
+            self.stdout.write(self.style.SUCCESS(f"Processed {answered} questions"))
+            return
+
+        pool = AnswerWorkerPool(
+            lambda: self.make_worker(options),
+            size=options["workers"],
+            poll_interval=options["poll_interval"],
+        )
+        stopped = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopped.set())
+
+        pool.start()
+        self.stdout.write(f"Started {options['workers']} answer workers")
+        stopped.wait()
+        self.stdout.write("Stopping answer workers...")
+        pool.stop(timeout=options["visibility_timeout"])
@@ -0,0 +1,27 @@
+"""Project middleware."""
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+
+@sync_and_async_middleware
+def asgi_urlconf_middleware(get_response):
+    """
+    Resolve ASGI requests against settings.ASGI_URLCONF.
+
+    The ASGI URLconf swaps in native async views (e.g. the ask endpoint) in
+    front of the regular routes. The middleware is a no-op under WSGI and
+    adds no thread hop under ASGI.
+    """
+    if not iscoroutinefunction(get_response):
+        return get_response
+
+    urlconf = getattr(settings, "ASGI_URLCONF", None)
+
+    async def middleware(request):
+        if urlconf:
+            request.urlconf = urlconf
+        return await get_response(request)
+
+    return middleware
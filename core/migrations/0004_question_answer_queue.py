@@ -0,0 +1,56 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Add async answer queue state to Question.
+
+    Existing rows were answered synchronously, so they default to "answered".
+    The partial index keeps the worker claim query cheap: it only covers rows
+    still waiting in the queue, which is a tiny fraction of the table.
+    """
+
+    dependencies = [
+        ("core", "0003_add_performance_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("answered", "Answered"),
+                    ("failed", "Failed"),
+                ],
+                default="answered",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="available_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="last_error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        # Used by: answer workers claiming pending/expired questions
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "processing"])),
+                fields=["available_at"],
+                name="question_queue_idx",
+            ),
+        ),
+    ]
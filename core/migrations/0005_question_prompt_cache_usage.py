@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Record Anthropic prompt-cache usage per answered question.
+
+    Both counts stay null for questions answered before prompt caching, from
+    the answer cache, or by the fallback message.
+    """
+
+    dependencies = [
+        ("core", "0004_question_answer_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="cache_read_input_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="cache_creation_input_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
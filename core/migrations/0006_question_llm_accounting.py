@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Record model, upstream latency, stop reason and token usage per question.
+
+    Only the question that actually called Claude gets these; answers served
+    from the cache or shared with a concurrent duplicate leave them empty, so
+    sums over the table are real spend.
+    """
+
+    dependencies = [
+        ("core", "0005_question_prompt_cache_usage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="llm_model",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="llm_latency_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="stop_reason",
+            field=models.CharField(blank=True, default="", max_length=30),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="input_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="output_tokens",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
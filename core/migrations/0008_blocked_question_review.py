@@ -0,0 +1,49 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Blocked-question review feeds.
+
+    A partial index covers only was_within_boundaries = false rows, a small
+    slice of the table, so the feeds stay cheap as answered questions pile
+    up. Family.unreviewed_blocked_count is backfilled once here and then
+    maintained incrementally.
+    """
+
+    dependencies = [
+        ("core", "0007_question_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="reviewed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="family",
+            name="unreviewed_blocked_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                condition=models.Q(("was_within_boundaries", False)),
+                fields=["child", "-created_at"],
+                name="question_blocked_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE core_family SET unreviewed_blocked_count = (
+                SELECT COUNT(*) FROM core_question
+                JOIN core_child ON core_child.id = core_question.child_id
+                WHERE core_child.family_id = core_family.id
+                  AND NOT core_question.was_within_boundaries
+                  AND core_question.reviewed_at IS NULL
+            )
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
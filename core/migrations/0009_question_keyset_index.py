@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Index for keyset pages over all questions.
+
+    KeysetPagination orders by (-created_at, -id) and seeks past the last
+    (created_at, id) of the previous page. Without a child_id filter no
+    existing index matched that order, so every page sorted the whole table.
+    """
+
+    dependencies = [
+        ("core", "0008_blocked_question_review"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="question_keyset_idx"
+            ),
+        ),
+    ]
@@ -6,6 +6,9 @@ class Family(models.Model):
 
     name = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Blocked questions parents haven't reviewed yet; kept up to date by
+    # core.services.blocked_questions instead of COUNT on every dashboard load
+    unreviewed_blocked_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         verbose_name_plural = "Families"
@@ -1,12 +1,32 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 from .child import Child
 from .topic import TopicCategory
 
 
+class QuestionManager(models.Manager):
+    def get_queryset(self):
+        # The search document is only read by Postgres; don't ship it to Python
+        return super().get_queryset().defer("search_vector")
+
+
 class Question(models.Model):
     """Questions asked by children"""
 
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_ANSWERED = "answered"
+    STATUS_FAILED = "failed"
+    STATUSES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_ANSWERED, "Answered"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    QUEUED_STATUSES = [STATUS_PENDING, STATUS_PROCESSING]
+
     child = models.ForeignKey(Child, on_delete=models.CASCADE, related_name="questions")
     text = models.TextField()
 
@@ -24,17 +44,60 @@ class Question(models.Model):
     answer = models.TextField(null=True, blank=True)
     response_generated_at = models.DateTimeField(null=True, blank=True)
 
+    # LLM accounting, filled in only when this question made the Claude call
+    llm_model = models.CharField(max_length=100, blank=True, default="")
+    llm_latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    stop_reason = models.CharField(max_length=30, blank=True, default="")
+    input_tokens = models.PositiveIntegerField(null=True, blank=True)
+    output_tokens = models.PositiveIntegerField(null=True, blank=True)
+    # Prompt tokens Anthropic read from / wrote to its prompt cache
+    cache_read_input_tokens = models.PositiveIntegerField(null=True, blank=True)
+    cache_creation_input_tokens = models.PositiveIntegerField(null=True, blank=True)
+
+    # Async answer queue (see core.services.answer_queue)
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_ANSWERED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # When a pending row may next be claimed, or when a claim's lease expires
+    available_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
     # Engagement
     child_marked_helpful = models.BooleanField(null=True, blank=True)
+    # When a parent reviewed this question (only tracked for blocked ones)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
 
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Full-text search document kept up to date by Postgres (see
+    # core.services.question_search); question text outranks the answer
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", weight="A", config="english")
+        + SearchVector("answer", weight="B", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = QuestionManager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["child", "-created_at"]),
             models.Index(fields=["detected_topic", "-created_at"]),
+            models.Index(
+                fields=["available_at"],
+                name="question_queue_idx",
+                condition=models.Q(status__in=["pending", "processing"]),
+            ),
+            GinIndex(fields=["search_vector"], name="question_search_idx"),
+            models.Index(
+                fields=["child", "-created_at"],
+                name="question_blocked_idx",
+                condition=models.Q(was_within_boundaries=False),
+            ),
+            # Keyset pages over all questions seek on (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="question_keyset_idx"),
         ]
 
     def __str__(self):
@@ -0,0 +1,119 @@
+"""Pagination for question lists."""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on (created_at, id), newest first.
+
+    Each page is one query that seeks past the last row of the previous page
+    instead of counting and OFFSET-scanning, so deep pages cost the same as
+    the first. The seek follows the (-created_at, -id) index, or the
+    (child, -created_at) index with a child filter. The opaque cursor encodes
+    the last row's created_at and id; id breaks ties between questions
+    created in the same microsecond.
+    """
+
+    cursor_query_param = "cursor"
+    # Row attributes the cursor is built from; rows may be model instances
+    # or named .values_list() tuples that include these
+    cursor_fields = ("created_at", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by("-created_at", "-id")
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            created_at, pk = position
+            # The plain bound lets the index range scan start at the cursor
+            queryset = queryset.filter(created_at__lte=created_at).filter(
+                Q(created_at__lt=created_at) | Q(id__lt=pk)
+            )
+
+        # One extra row tells us whether there is a next page, without a COUNT
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        default = getattr(settings, "REST_FRAMEWORK", {}).get("PAGE_SIZE") or 20
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return default
+        return min(size, self.max_page_size) if size > 0 else default
+
+    def decode_cursor(self, request):
+        """(created_at, id) from ?cursor=, or None on the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, _, pk = decoded.rpartition("|")
+            return datetime.fromisoformat(created_at), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, question):
+        position = f"{question.created_at.isoformat()}|{question.id}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.last)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class QuestionPagination(PageNumberPagination):
+    """
+    Page numbers by default; keyset pages when ?cursor= is present.
+
+    Pass an empty ?cursor= to start from the newest question, then follow
+    `next` links. Numbered pages keep their `count` for existing clients.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,117 @@
+"""API renderers: orjson-backed JSON, a columnar format for lists, MessagePack."""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+# Datetimes go through DRF's encoder like every other non-JSON type, so
+# output matches JSONRenderer byte for byte ("Z" for UTC, Decimals as
+# floats, lazy strings, querysets, timedeltas...)
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Indented output (the browsable API, ?format=json; indent=4) and non
+    default UNICODE_JSON/COMPACT_JSON settings use the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        default = self.encoder_class().default
+        ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+        # Same JavaScript-safe escaping of U+2028/U+2029 as JSONRenderer
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+def to_columns(rows):
+    """
+    Rows (dicts) as {"length", "columns", "dictionaries"}.
+
+    Every field becomes one array in "columns", null where a row lacks it.
+    Low-cardinality columns (each value repeated on average) are dictionary
+    encoded: "dictionaries"[field] lists the distinct values and the column
+    holds indexes into it (null stays null). Booleans are left as they are.
+    """
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    columns = {name: [row.get(name) for row in rows] for name in names}
+    dictionaries = {}
+    for name, values in columns.items():
+        present = [value for value in values if value is not None]
+        if not present or any(
+            isinstance(value, bool) or not isinstance(value, (str, int))
+            for value in present
+        ):
+            continue
+        distinct = list(dict.fromkeys(present))
+        if len(distinct) * 2 > len(present):
+            continue
+        index = {value: position for position, value in enumerate(distinct)}
+        dictionaries[name] = distinct
+        columns[name] = [None if value is None else index[value] for value in values]
+    return {"length": len(rows), "columns": columns, "dictionaries": dictionaries}
+
+
+def is_rows(data):
+    return isinstance(data, list) and all(isinstance(row, dict) for row in data)
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Lists as columns instead of rows: ?format=columnar or this media type.
+
+    A list response, or the "results" of a paginated one, is replaced by
+    to_columns(); pagination keys are kept. Anything else (details,
+    errors) renders as plain JSON.
+    """
+
+    media_type = "application/vnd.curiositybox.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and is_rows(data.get("results")):
+            data = {**data, "results": to_columns(data["results"])}
+        elif is_rows(data):
+            data = to_columns(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack responses, for Accept: application/msgpack or ?format=msgpack.
+
+    Values are the same as in the JSON responses (datetimes stay ISO 8601
+    strings, Decimals floats) so clients can share their models.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default, use_bin_type=True)
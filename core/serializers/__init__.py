@@ -1,6 +1,11 @@
 from .auth import LoginSerializer, ParentSerializer, RegisterSerializer
 from .child import ChildSerializer
-from .question import AskQuestionSerializer, QuestionSerializer
+from .question import (
+    AskQuestionSerializer,
+    QuestionSearchSerializer,
+    QuestionSerializer,
+    ReviewBlockedQuestionsSerializer,
+)
 from .topic import ChildTopicAccessSerializer, TopicCategorySerializer
 
 __all__ = [
@@ -11,5 +16,7 @@ __all__ = [
     "TopicCategorySerializer",
     "ChildTopicAccessSerializer",
     "QuestionSerializer",
+    "QuestionSearchSerializer",
     "AskQuestionSerializer",
+    "ReviewBlockedQuestionsSerializer",
 ]
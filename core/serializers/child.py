@@ -2,10 +2,11 @@ from rest_framework import serializers
 
 from core.models import Child, TopicCategory
 
+from .sparse import SparseFieldsetMixin
 from .topic import ChildTopicAccessSerializer, TopicCategorySerializer
 
 
-class ChildSerializer(serializers.ModelSerializer):
+class ChildSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     topic_access = ChildTopicAccessSerializer(many=True, read_only=True)
     enabled_topics = serializers.SerializerMethodField()
 
@@ -20,6 +21,7 @@ class ChildSerializer(serializers.ModelSerializer):
             "topic_access",
             "enabled_topics",
         ]
+        sparse_sources = {"enabled_topics": "topic_access"}
 
     def get_enabled_topics(self, obj):
         """
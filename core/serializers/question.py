@@ -1,9 +1,13 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from core.models import Question
+from core.services.question_search import highlight_html
 
+from .sparse import SparseFieldsetMixin
 
-class QuestionSerializer(serializers.ModelSerializer):
+
+class QuestionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     child_name = serializers.CharField(source="child.name", read_only=True)
     topic_name = serializers.CharField(source="detected_topic.name", read_only=True)
 
@@ -18,16 +22,58 @@ class QuestionSerializer(serializers.ModelSerializer):
             "was_within_boundaries",
             "answer",
             "child_marked_helpful",
+            "status",
             "created_at",
+            "reviewed_at",
         ]
         read_only_fields = [
             "detected_topic",
             "was_within_boundaries",
             "answer",
+            "status",
             "created_at",
+            "reviewed_at",
+        ]
+
+
+class HighlightField(serializers.Field):
+    """A search highlight as escaped HTML with <mark>-ed matches"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return highlight_html(value)
+
+
+class QuestionSearchSerializer(QuestionSerializer):
+    """A question matched by ?q=, with its rank and <mark>-ed highlights"""
+
+    rank = serializers.FloatField(read_only=True)
+    text_highlight = HighlightField()
+    answer_highlight = HighlightField(allow_null=True)
+
+    class Meta(QuestionSerializer.Meta):
+        fields = QuestionSerializer.Meta.fields + [
+            "rank",
+            "text_highlight",
+            "answer_highlight",
         ]
 
 
 class AskQuestionSerializer(serializers.Serializer):
     child_id = serializers.IntegerField()
     question = serializers.CharField(max_length=500)
+    mode = serializers.ChoiceField(choices=["sync", "async"], required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("mode", getattr(settings, "QUESTION_ASK_MODE", "sync"))
+        return attrs
+
+
+class ReviewBlockedQuestionsSerializer(serializers.Serializer):
+    # Omit to mark every unreviewed blocked question in the family
+    question_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
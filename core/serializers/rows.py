@@ -0,0 +1,104 @@
+"""
+Read-only serializer output built straight from .values_list() rows.
+
+ModelSerializer builds a model instance per row and walks every field's
+get_attribute and to_representation, which dominates CPU on big list
+pages. When every field of a serializer is a column, a foreign-key column
+or an annotation, ValuesRows selects those as tuples (joins included) and
+builds the same dicts, only running to_representation for fields that
+change the value (dates, decimals).
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def is_column(queryset, attrs):
+    """Whether a field source reads one column, following forward relations"""
+    if len(attrs) == 1 and attrs[0] in queryset.query.annotations:
+        return True
+    opts = queryset.model._meta
+    for depth, attr in enumerate(attrs, 1):
+        try:
+            field = opts.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        if not field.concrete or field.many_to_many:
+            return False
+        if depth < len(attrs):
+            if not field.is_relation:
+                return False
+            opts = field.related_model._meta
+    return True
+
+
+class ValuesRows:
+    """A tuple queryset plus how to turn each tuple into serializer output"""
+
+    def __init__(self, queryset, plan, extra=()):
+        """
+        plan holds (output name, lookup, guard lookups, converter) per field;
+        extra lookups are selected but not output, e.g. for cursors.
+        """
+        lookups = list(extra)
+        for _, lookup, guards, _ in plan:
+            lookups += [lookup, *guards]
+        lookups = list(dict.fromkeys(lookups))
+        self.queryset = queryset.prefetch_related(None).values_list(
+            *lookups, named=True
+        )
+        index = {lookup: position for position, lookup in enumerate(lookups)}
+        self.compiled = [
+            (name, index[lookup], [index[guard] for guard in guards], convert)
+            for name, lookup, guards, convert in plan
+        ]
+
+    @classmethod
+    def for_serializer(cls, serializer, queryset, extra=()):
+        """
+        ValuesRows for serializer's fields, or None if any field needs a
+        model instance (methods, nested serializers, properties).
+        """
+        plan = []
+        for name, field in serializer.fields.items():
+            if (
+                field.source == "*"
+                or isinstance(field, (serializers.BaseSerializer, ManyRelatedField))
+                or not is_column(queryset, field.source_attrs)
+            ):
+                return None
+            attrs = field.source_attrs
+            # DRF leaves a field out when a relation on its path is null
+            guards = ["__".join(attrs[:depth]) for depth in range(1, len(attrs))]
+            convert = (
+                None
+                if isinstance(field, PASSTHROUGH_FIELDS)
+                else field.to_representation
+            )
+            plan.append((name, "__".join(attrs), guards, convert))
+        return cls(queryset, plan, extra)
+
+    def to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, position, guards, convert in self.compiled:
+                if guards and any(row[guard] is None for guard in guards):
+                    continue
+                value = row[position]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                item[name] = value
+            data.append(item)
+        return data
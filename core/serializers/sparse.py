@@ -0,0 +1,71 @@
+from django.core.exceptions import FieldDoesNotExist
+
+# _source_attrs() result for relations loaded by prefetch_related
+_PREFETCHED = object()
+
+
+class SparseFieldsetMixin:
+    """
+    A ModelSerializer that can be trimmed to some of its fields.
+
+    Pass fields=[...] to keep only those. prune_queryset() then narrows a
+    queryset to the columns and relations the kept fields read. Fields
+    sourced from a method ("*") must say what they read in
+    Meta.sparse_sources, or the queryset is left untouched.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def prune_queryset(self, queryset):
+        """.only() the columns the fields read; keep just the joins they use"""
+        columns = {queryset.model._meta.pk.name}
+        related = set()
+        prefetch = False
+
+        for name, field in self.fields.items():
+            attrs = self._source_attrs(name, field, queryset)
+            if attrs is None:
+                return queryset
+            if attrs is _PREFETCHED:
+                prefetch = True
+                continue
+            for depth in range(1, len(attrs)):
+                related.add("__".join(attrs[:depth]))
+            if attrs:
+                columns.add("__".join(attrs))
+
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        if not prefetch:
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*columns, *related)
+
+    def _source_attrs(self, name, field, queryset):
+        """
+        The model attributes a kept field reads, e.g. ["child", "name"].
+
+        [] for annotations (always selected), _PREFETCHED for reverse and
+        many-to-many relations (loaded by prefetch_related, keyed on the pk),
+        None when the columns it reads can't be told.
+        """
+        sparse_sources = getattr(self.Meta, "sparse_sources", {})
+        source = sparse_sources.get(name, field.source)
+        if source == "*":
+            return None
+        attrs = source.split(".")
+        try:
+            model_field = queryset.model._meta.get_field(attrs[0])
+        except FieldDoesNotExist:
+            if attrs[0] in queryset.query.annotations:
+                return []
+            return None  # a property: can't tell what it reads
+        if model_field.one_to_many or model_field.many_to_many:
+            return _PREFETCHED
+        if not model_field.concrete:
+            return None
+        return attrs
@@ -2,8 +2,10 @@ from rest_framework import serializers
 
 from core.models import ChildTopicAccess, TopicCategory
 
+from .sparse import SparseFieldsetMixin
 
-class TopicCategorySerializer(serializers.ModelSerializer):
+
+class TopicCategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = TopicCategory
         fields = [
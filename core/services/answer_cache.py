@@ -0,0 +1,205 @@
+"""Exact-match cache of generated answers, checked before calling Claude."""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_versions import bump_version, current_version
+
+# (upper age bound, label) - children in one bucket get the same answer
+AGE_BUCKETS = [
+    (5, "3-5"),
+    (7, "6-7"),
+    (10, "8-10"),
+    (13, "11-13"),
+    (18, "14-18"),
+]
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+AnswerCacheKey = namedtuple(
+    "AnswerCacheKey", ["question", "age_bucket", "reading_level", "topic"]
+)
+
+
+def normalize_question(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_PUNCTUATION_RE.sub("", text.lower()).split())
+
+
+def _version_name(key):
+    """Name of the shared version token for one cache key"""
+    digest = hashlib.sha1(repr(tuple(key)).encode("utf-8")).hexdigest()
+    return f"answer:{digest}"
+
+
+def age_bucket(age):
+    for upper, label in AGE_BUCKETS:
+        if age <= upper:
+            return label
+    return AGE_BUCKETS[-1][1]
+
+
+class AnswerCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    Keys are built by make_key() from the normalized question text, the
+    child's age bucket and reading level, and the topic slug, so only answers
+    written for an equivalent audience are reused.
+
+    Each entry remembers the shared version token for its key at the time it
+    was stored. evict_question_answer() bumps that token, so an answer dropped in one
+    worker is also treated as a miss by every other worker's copy.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, "ANSWER_CACHE_MAX_ENTRIES", 10000)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "ANSWER_CACHE_TTL", 86400)
+
+    @staticmethod
+    def make_key(question_text, child, topic):
+        return AnswerCacheKey(
+            question=normalize_question(question_text),
+            age_bucket=age_bucket(child.age),
+            reading_level=child.reading_level,
+            topic=topic.slug if topic else None,
+        )
+
+    def get(self, key):
+        """Return the cached answer for key, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            answer, expires_at, version = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+        # Only consult the shared cache for a live local hit, and never while
+        # holding the lock
+        if current_version(_version_name(key)) != version:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return answer
+
+    def set(self, key, answer):
+        version = current_version(_version_name(key))
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (answer, expires_at, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, key, answer=None):
+        """
+        Remove key from the cache.
+
+        When answer is given, the entry is only removed if it still holds that
+        answer, so a newer answer for the same key is not thrown away.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (answer is not None and entry[0] != answer):
+                return False
+            del self._entries[key]
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+            self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+answer_cache = AnswerCache()
+
+
+def evict_question_answer(question):
+    """
+    Drop a question's answer from the cache (e.g. after it was marked unhelpful).
+
+    The local entry is only removed if it still holds this answer, but the
+    shared version token is bumped regardless: other workers may still have
+    the unhelpful answer even when this one already replaced it.
+    """
+    if not question.answer:
+        return False
+    key = AnswerCache.make_key(question.text, question.child, question.detected_topic)
+    evicted = answer_cache.evict(key, answer=question.answer)
+    bump_version(_version_name(key), timeout=answer_cache.ttl)
+    return evicted
+
+
+def _rejected_key(answer):
+    digest = hashlib.sha1(answer.encode("utf-8")).hexdigest()
+    return f"rejected_answer:{digest}"
+
+
+def reject_answer(answer):
+    """
+    Never reuse this answer text again, whichever question it is stored on.
+
+    A reused answer is also stored on the question it was first written
+    for and on every other question it was handed to, so evicting only the
+    question marked unhelpful would leave those copies in circulation.
+    """
+    cache.set(_rejected_key(answer), True, None)
+
+
+def is_rejected_answer(answer):
+    return cache.get(_rejected_key(answer)) is not None
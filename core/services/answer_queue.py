@@ -0,0 +1,164 @@
+"""Database-backed queue that answers deferred questions in worker threads."""
+
+import logging
+import random
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Question
+
+from .etags import child_questions_changed
+
+logger = logging.getLogger(__name__)
+
+
+def claim_questions(limit=1, visibility_timeout=60):
+    """
+    Lease up to `limit` questions that are ready to be answered.
+
+    Pending rows whose available_at has passed are claimed, as are rows
+    still "processing" whose lease expired (their worker died). The lock is
+    taken with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+    never block on or double-claim the same row.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        question_ids = list(
+            Question.objects.select_for_update(skip_locked=True)
+            .filter(status__in=Question.QUEUED_STATUSES, available_at__lte=now)
+            .order_by("available_at")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not question_ids:
+            return []
+        Question.objects.filter(id__in=question_ids).update(
+            status=Question.STATUS_PROCESSING,
+            attempts=F("attempts") + 1,
+            available_at=now + timedelta(seconds=visibility_timeout),
+        )
+
+    questions = list(
+        Question.objects.filter(id__in=question_ids)
+        .select_related("child", "detected_topic")
+        .order_by("available_at")
+    )
+    # .update() sends no post_save; their status changed
+    child_questions_changed(question.child_id for question in questions)
+    return questions
+
+
+def retry_delay(attempts, retry_backoff):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, retry_backoff * 2 ** (attempts - 1))
+
+
+class AnswerWorker:
+    """Claims queued questions and answers them through QuestionService."""
+
+    def __init__(
+        self,
+        service,
+        batch_size=1,
+        visibility_timeout=60,
+        max_attempts=3,
+        retry_backoff=5.0,
+    ):
+        self.service = service
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+    def run_once(self):
+        """Claim and answer one batch; returns how many questions were claimed"""
+        questions = claim_questions(self.batch_size, self.visibility_timeout)
+        for question in questions:
+            self.answer(question)
+        return len(questions)
+
+    def run(self, stop_event, poll_interval=1.0):
+        """Work until stop_event is set, sleeping when the queue is empty"""
+        try:
+            while not stop_event.is_set():
+                close_old_connections()
+                try:
+                    claimed = self.run_once()
+                except Exception:
+                    logger.exception("Answer worker failed to claim questions")
+                    claimed = 0
+                if not claimed:
+                    stop_event.wait(poll_interval)
+        finally:
+            connection.close()
+
+    def answer(self, question):
+        if question.attempts > self.max_attempts:
+            # Lease expired too many times (e.g. the worker keeps crashing)
+            self.give_up(question, "Exceeded max attempts")
+            return
+
+        try:
+            self.service.generate_answer(question, fallback_on_error=False)
+        except Exception as e:
+            if question.attempts >= self.max_attempts:
+                self.give_up(question, str(e))
+                return
+
+            delay = retry_delay(question.attempts, self.retry_backoff)
+            Question.objects.filter(
+                pk=question.pk,
+                status=Question.STATUS_PROCESSING,
+                attempts=question.attempts,
+            ).update(
+                status=Question.STATUS_PENDING,
+                available_at=timezone.now() + timedelta(seconds=delay),
+                last_error=str(e)[:1000],
+            )
+            child_questions_changed([question.child_id])
+            logger.warning(
+                "Answer attempt failed, will retry",
+                extra={
+                    "question_id": question.id,
+                    "attempts": question.attempts,
+                    "retry_in_seconds": round(delay, 2),
+                },
+            )
+
+    def give_up(self, question, error):
+        question.last_error = error[:1000]
+        self.service.save_fallback_answer(question)
+        logger.error(
+            "Giving up on question",
+            extra={"question_id": question.id, "attempts": question.attempts},
+        )
+
+
+class AnswerWorkerPool:
+    """Runs several AnswerWorkers in threads sharing one stop event."""
+
+    def __init__(self, worker_factory, size=4, poll_interval=1.0):
+        self.worker_factory = worker_factory
+        self.size = size
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        for number in range(self.size):
+            thread = threading.Thread(
+                target=self.worker_factory().run,
+                args=(self.stop_event, self.poll_interval),
+                name=f"answer-worker-{number}",
+                daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
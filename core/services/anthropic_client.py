@@ -0,0 +1,350 @@
+"""Process-wide Anthropic clients sharing one pooled HTTP connection pool."""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+import anthropic
+import httpx
+from anthropic import Anthropic, AsyncAnthropic
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """
+    Counts API requests and the TCP connections opened to serve them.
+
+    httpcore reports a connect_tcp event only when no pooled keep-alive
+    connection was available, so 1 - connections / requests is the share of
+    requests that reused a connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self.record_connection()
+
+    async def atrace(self, event_name, info):
+        self.trace(event_name, info)
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.connections_opened = 0
+
+    def stats(self):
+        with self._lock:
+            requests, connections = self.requests, self.connections_opened
+        reused = max(requests - connections, 0)
+        return {
+            "requests": requests,
+            "connections_opened": connections,
+            "connection_reuse_rate": round(reused / requests, 4) if requests else 0.0,
+        }
+
+
+connection_stats = ConnectionStats()
+
+# Shared by every caller of the Messages API in this deployment
+anthropic_breaker = CircuitBreaker("anthropic")
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=getattr(settings, "ANTHROPIC_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=getattr(
+            settings, "ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", 10
+        ),
+        keepalive_expiry=getattr(settings, "ANTHROPIC_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+
+def _timeout():
+    return httpx.Timeout(
+        getattr(settings, "ANTHROPIC_TIMEOUT", 30.0),
+        connect=getattr(settings, "ANTHROPIC_CONNECT_TIMEOUT", 5.0),
+    )
+
+
+def _client_kwargs():
+    return {
+        "api_key": os.getenv("ANTHROPIC_API_KEY"),
+        "base_url": getattr(settings, "ANTHROPIC_BASE_URL", None) or None,
+        "timeout": _timeout(),
+        "max_retries": getattr(settings, "ANTHROPIC_MAX_RETRIES", 2),
+    }
+
+
+def _trace_request(request):
+    connection_stats.record_request()
+    request.extensions["trace"] = connection_stats.trace
+
+
+async def _atrace_request(request):
+    connection_stats.record_request()
+    request.extensions["trace"] = connection_stats.atrace
+
+
+def build_anthropic_client():
+    """A new Anthropic client with its own instrumented connection pool"""
+    http_client = httpx.Client(
+        limits=_limits(),
+        timeout=_timeout(),
+        event_hooks={"request": [_trace_request]},
+    )
+    return Anthropic(http_client=http_client, **_client_kwargs())
+
+
+def build_async_anthropic_client():
+    """A new AsyncAnthropic client with its own instrumented connection pool"""
+    http_client = httpx.AsyncClient(
+        limits=_limits(),
+        timeout=_timeout(),
+        event_hooks={"request": [_atrace_request]},
+    )
+    return AsyncAnthropic(http_client=http_client, **_client_kwargs())
+
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+# Async connections belong to the event loop that opened them
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_anthropic_client():
+    """
+    Return the process-wide Anthropic client.
+
+    The client is created on first use. A process forked after that (e.g.
+    gunicorn --preload) builds its own instead of sharing the parent's
+    sockets.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                _client = build_anthropic_client()
+                _client_pid = pid
+    return _client
+
+
+def get_async_anthropic_client():
+    """Return the AsyncAnthropic client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = build_async_anthropic_client()
+    return client
+
+
+def reset_anthropic_clients():
+    """
+    Forget the shared clients without closing them.
+
+    Called in forked children: closing would shut down TLS sessions the
+    parent is still using.
+    """
+    global _lock, _client, _client_pid
+    _lock = threading.Lock()  # another thread may have held it at fork time
+    _client = None
+    _client_pid = None
+    _async_clients.clear()
+
+
+def is_retryable(error):
+    """Timeouts, connection errors, 408/409/429 and 5xx (incl. 529 overloaded)"""
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def is_upstream_failure(error):
+    """
+    Whether an error says the API is unhealthy (and counts against the breaker).
+
+    Other 4xx responses mean our request was wrong, not that the API is down.
+    """
+    return not isinstance(error, anthropic.APIStatusError) or is_retryable(error)
+
+
+def retry_after(error):
+    """Seconds the API asked us to wait (Retry-After on 429/529), if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:  # an HTTP date; fall back to our own backoff
+        pass
+    return None
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter, so workers do not retry in step"""
+    base = getattr(settings, "ANTHROPIC_RETRY_BACKOFF", 0.5)
+    cap = getattr(settings, "ANTHROPIC_RETRY_MAX_DELAY", 8.0)
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def _attempt_timeout(deadline):
+    remaining = deadline - time.monotonic()
+    return httpx.Timeout(
+        min(getattr(settings, "ANTHROPIC_TIMEOUT", 30.0), remaining),
+        connect=min(getattr(settings, "ANTHROPIC_CONNECT_TIMEOUT", 5.0), remaining),
+    )
+
+
+def _record_error(error):
+    if is_upstream_failure(error):
+        anthropic_breaker.record_failure()
+    else:
+        anthropic_breaker.record_success()  # the API answered, if unhappily
+
+
+def _failed_attempt(error, attempt, deadline):
+    """Record a failed attempt; return the delay before retrying, or None"""
+    if not is_retryable(error) or attempt >= getattr(
+        settings, "ANTHROPIC_RETRY_ATTEMPTS", 2
+    ):
+        return None
+
+    delay = retry_after(error)
+    if delay is None:
+        delay = backoff_delay(attempt)
+    if time.monotonic() + delay >= deadline:
+        return None  # the retry could not finish before the deadline
+
+    logger.warning(
+        "Retrying Claude API call",
+        extra={"attempt": attempt + 1, "delay": round(delay, 3), "error": str(error)},
+    )
+    return delay
+
+
+def _deadline():
+    return time.monotonic() + getattr(settings, "ANTHROPIC_CALL_DEADLINE", 20.0)
+
+
+def create_message(client, **params):
+    """
+    client.messages.create() guarded by the circuit breaker.
+
+    Raises CircuitOpenError without calling the API while the circuit is
+    open. Retryable errors are retried up to ANTHROPIC_RETRY_ATTEMPTS times,
+    after the API's Retry-After or a jittered backoff, and all attempts
+    together must finish within ANTHROPIC_CALL_DEADLINE seconds.
+    """
+    deadline = _deadline()
+    attempt = 0
+    while True:
+        if not anthropic_breaker.allow_request():
+            raise CircuitOpenError(anthropic_breaker.name, anthropic_breaker.retry_in())
+        try:
+            message = client.messages.create(
+                timeout=_attempt_timeout(deadline), **params
+            )
+        except Exception as error:
+            _record_error(error)
+            delay = _failed_attempt(error, attempt, deadline)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        anthropic_breaker.record_success()
+        return message
+
+
+async def acreate_message(client, **params):
+    """Async version of create_message"""
+    deadline = _deadline()
+    attempt = 0
+    while True:
+        if not await anthropic_breaker.aallow_request():
+            raise CircuitOpenError(anthropic_breaker.name, anthropic_breaker.retry_in())
+        try:
+            message = await client.messages.create(
+                timeout=_attempt_timeout(deadline), **params
+            )
+        except Exception as error:
+            await sync_to_async(_record_error)(error)
+            delay = _failed_attempt(error, attempt, deadline)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        await anthropic_breaker.arecord_success()
+        return message
+
+
+@contextmanager
+def stream_message(client, **params):
+    """
+    client.messages.stream() guarded by the circuit breaker.
+
+    Streams are not retried: part of the answer may already have been sent.
+    """
+    if not anthropic_breaker.allow_request():
+        raise CircuitOpenError(anthropic_breaker.name, anthropic_breaker.retry_in())
+    try:
+        with client.messages.stream(**params) as stream:
+            yield stream
+    except Exception as error:
+        _record_error(error)
+        raise
+    anthropic_breaker.record_success()
+
+
+@asynccontextmanager
+async def astream_message(client, **params):
+    """Async version of stream_message"""
+    if not await anthropic_breaker.aallow_request():
+        raise CircuitOpenError(anthropic_breaker.name, anthropic_breaker.retry_in())
+    try:
+        async with client.messages.stream(**params) as stream:
+            yield stream
+    except Exception as error:
+        await sync_to_async(_record_error)(error)
+        raise
+    await anthropic_breaker.arecord_success()
+
+
+def _after_fork_in_child():
+    connection_stats.__init__()  # count the child's own connections
+    reset_anthropic_clients()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
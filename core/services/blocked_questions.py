@@ -0,0 +1,111 @@
+"""
+Blocked questions (asked outside a child's enabled topics) for parent review.
+
+Feeds read through the partial question_blocked_idx index. Each family's
+unreviewed count lives on Family.unreviewed_blocked_count and is adjusted
+by one UPDATE when a blocked question is saved, reviewed or deleted
+(including admin and cascade deletes), so dashboards read a column instead
+of running COUNT. Writes that bypass these hooks (bulk_create, raw SQL,
+queryset.update()) can be squared up with `manage.py recount_blocked_questions`.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import Child, Family, Question
+
+from .etags import child_questions_changed
+
+
+def blocked_questions():
+    return Question.objects.filter(was_within_boundaries=False).select_related(
+        "child", "detected_topic"
+    )
+
+
+def adjust_unreviewed_count(family_id, delta):
+    Family.objects.filter(pk=family_id).update(
+        unreviewed_blocked_count=F("unreviewed_blocked_count") + delta
+    )
+
+
+def question_saved(question, created):
+    """A newly saved blocked question waits for review"""
+    if created and not question.was_within_boundaries and not question.reviewed_at:
+        adjust_unreviewed_count(question.child.family_id, 1)
+
+
+def question_deleting(question):
+    """
+    Before a blocked question's DELETE: lock its row and remember whether
+    it is still unreviewed.
+
+    The in-memory reviewed_at may be stale. Reading it under the row lock,
+    inside the delete's transaction, means a concurrent mark_reviewed()
+    either finished first (and already uncounted it) or waits and then
+    finds the row gone.
+    """
+    if question.was_within_boundaries:
+        return
+    question._unreviewed_family_id = (
+        Question.objects.select_for_update(of=("self",))
+        .filter(pk=question.pk, reviewed_at=None)
+        .values_list("child__family_id", flat=True)
+        .first()
+    )
+
+
+def question_deleted(question):
+    """After the DELETE: uncount it if question_deleting() found it unreviewed"""
+    family_id = getattr(question, "_unreviewed_family_id", None)
+    if family_id is not None:
+        # Never below zero, even if the counter had drifted
+        Family.objects.filter(pk=family_id, unreviewed_blocked_count__gt=0).update(
+            unreviewed_blocked_count=F("unreviewed_blocked_count") - 1
+        )
+
+
+def mark_reviewed(family_id, question_ids=None):
+    """
+    Mark a family's unreviewed blocked questions (or just question_ids) as
+    reviewed; returns how many changed.
+
+    Only rows this UPDATE actually flips are subtracted, so concurrent
+    reviews of the same questions can't double-count.
+    """
+    queryset = Question.objects.filter(
+        child__family_id=family_id, was_within_boundaries=False, reviewed_at=None
+    )
+    if question_ids is not None:
+        queryset = queryset.filter(pk__in=question_ids)
+
+    with transaction.atomic():
+        reviewed = queryset.update(reviewed_at=timezone.now())
+        if reviewed:
+            adjust_unreviewed_count(family_id, -reviewed)
+    if reviewed:
+        child_questions_changed(
+            Child.objects.filter(family_id=family_id).values_list("id", flat=True)
+        )
+    return reviewed
+
+
+def recount_unreviewed(family_ids=None):
+    """Recompute unreviewed counts from scratch; returns families updated"""
+    unreviewed = (
+        Question.objects.filter(
+            child__family_id=OuterRef("pk"),
+            was_within_boundaries=False,
+            reviewed_at=None,
+        )
+        .order_by()
+        .values("child__family_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    families = Family.objects.all()
+    if family_ids is not None:
+        families = families.filter(pk__in=family_ids)
+    return families.update(unreviewed_blocked_count=Coalesce(Subquery(unreviewed), 0))
@@ -0,0 +1,49 @@
+"""Shared version tokens for invalidating process-local caches across workers."""
+
+import uuid
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = "cache_version"
+
+
+def _key(name):
+    return f"{VERSION_KEY_PREFIX}:{name}"
+
+
+def get_version(name):
+    """
+    Return the current version token for name, creating one if missing.
+
+    Tokens never expire on their own; if the cache evicts one, a fresh token
+    is issued, which simply looks like an invalidation to every reader.
+    """
+    version = cache.get(_key(name))
+    if version is None:
+        cache.add(_key(name), uuid.uuid4().hex, None)
+        version = cache.get(_key(name))
+    return version
+
+
+def current_version(name):
+    """Return the current version token for name, or None if none was issued"""
+    return cache.get(_key(name))
+
+
+def bump_version(name, timeout=None):
+    """
+    Issue a new version token so every holder of the old one goes stale.
+
+    A timeout is only safe when nothing can hold the old token for longer
+    than that, e.g. entries that expire on their own after a TTL.
+    """
+    version = uuid.uuid4().hex
+    cache.set(_key(name), version, timeout)
+    return version
+
+
+def get_versions(names):
+    """Current tokens for several names in one cache round trip, in order"""
+    keys = [_key(name) for name in names]
+    found = cache.get_many(keys)
+    return [found.get(key) or get_version(name) for key, name in zip(keys, names)]
@@ -0,0 +1,88 @@
+"""Per-child cache of allowed topics used for the ask-path boundary check."""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import ChildTopicAccess
+
+from .topic_registry import topic_registry
+
+NO_TOPICS_MESSAGE = (
+    "You don't have any topics unlocked yet. "
+    "Ask your parent to unlock some topics for you!"
+)
+
+AllowedTopics = namedtuple("AllowedTopics", ["version", "slugs", "message"])
+
+
+def _key(child_id):
+    return f"child_topics:{child_id}"
+
+
+def build_allowed_topics_message(topics):
+    """Generate a friendly message listing allowed topics"""
+    if not topics:
+        return NO_TOPICS_MESSAGE
+
+    topic_list = ", ".join([f"{topic.icon} {topic.name}" for topic in topics])
+    return f"Instead, you can ask me about: {topic_list}"
+
+
+def get_allowed_topics(child_id):
+    """
+    Return the child's allowed topic slugs and rendered suggestion message.
+
+    Entries are tagged with the topic registry version, so renaming or
+    deactivating a topic invalidates every child at once. Access changes are
+    handled by invalidate_allowed_topics().
+    """
+    version = topic_registry.version
+    allowed = cache.get(_key(child_id))
+    if allowed is not None and allowed.version == version:
+        return allowed
+
+    topic_ids = ChildTopicAccess.objects.filter(child_id=child_id).values_list(
+        "topic_id", flat=True
+    )
+    allowed = _build_allowed_topics(version, topic_ids)
+    cache.set(_key(child_id), allowed, _timeout())
+    return allowed
+
+
+async def aget_allowed_topics(child_id):
+    """Async version of get_allowed_topics using the async cache and ORM"""
+    await topic_registry.aensure_fresh()
+    version = topic_registry.version
+    allowed = await cache.aget(_key(child_id))
+    if allowed is not None and allowed.version == version:
+        return allowed
+
+    topic_ids = [
+        topic_id
+        async for topic_id in ChildTopicAccess.objects.filter(
+            child_id=child_id
+        ).values_list("topic_id", flat=True)
+    ]
+    allowed = _build_allowed_topics(version, topic_ids)
+    await cache.aset(_key(child_id), allowed, _timeout())
+    return allowed
+
+
+def _build_allowed_topics(version, topic_ids):
+    topics = topic_registry.for_ids(topic_ids)
+    return AllowedTopics(
+        version=version,
+        slugs=frozenset(topic.slug for topic in topics),
+        message=build_allowed_topics_message(topics),
+    )
+
+
+def _timeout():
+    return getattr(settings, "CHILD_TOPICS_CACHE_TIMEOUT", 3600)
+
+
+def invalidate_allowed_topics(child_id):
+    """Forget the cached allowed topics for a child"""
+    cache.delete(_key(child_id))
@@ -0,0 +1,160 @@
+"""Circuit breaker whose state is shared by every worker through the cache."""
+
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+    def __init__(self, name, retry_in=None):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected without touching the dependency. Once recovery_timeout
+    seconds have passed it is half-open: a single trial call (across all
+    workers) is let through, and its outcome closes or re-opens the circuit.
+
+    The failure count, the time the circuit opened and the trial-call lock
+    live in the default cache, so with a shared backend (Redis) one worker's
+    failures open the circuit for all of them. Thresholds are read from
+    settings on use unless given explicitly.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=None, recovery_timeout=None):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self.rejected = 0  # calls short-circuited by this process
+
+    @property
+    def failure_threshold(self):
+        return self._failure_threshold or getattr(
+            settings, "ANTHROPIC_BREAKER_FAILURE_THRESHOLD", 5
+        )
+
+    @property
+    def recovery_timeout(self):
+        return self._recovery_timeout or getattr(
+            settings, "ANTHROPIC_BREAKER_RECOVERY_TIMEOUT", 30.0
+        )
+
+    def _key(self, suffix):
+        return f"circuit:{self.name}:{suffix}"
+
+    def _state(self, opened_at):
+        if opened_at is None:
+            return self.CLOSED
+        if time.time() - opened_at < self.recovery_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def state(self):
+        return self._state(cache.get(self._key("opened_at")))
+
+    def allow_request(self):
+        """Return True if a call may go ahead, False to fail fast"""
+        opened_at = cache.get(self._key("opened_at"))
+        state = self._state(opened_at)
+        if state == self.CLOSED:
+            return True
+        # The trial lock expires, so a worker dying mid-trial cannot wedge it
+        if state == self.HALF_OPEN and cache.add(
+            self._key("trial"), 1, self.recovery_timeout
+        ):
+            logger.info(
+                "Circuit half-open, trying one call", extra={"circuit": self.name}
+            )
+            return True
+
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def retry_in(self):
+        """Seconds until the circuit lets a trial call through"""
+        return self._retry_in(cache.get(self._key("opened_at")))
+
+    def _retry_in(self, opened_at):
+        if opened_at is None:
+            return 0.0
+        return max(opened_at + self.recovery_timeout - time.time(), 0.0)
+
+    def record_success(self):
+        values = cache.get_many([self._key("failures"), self._key("opened_at")])
+        if self._key("opened_at") in values:
+            logger.info("Circuit closed", extra={"circuit": self.name})
+            cache.delete_many(
+                [self._key("opened_at"), self._key("trial"), self._key("failures")]
+            )
+        elif values.get(self._key("failures")):
+            cache.delete(self._key("failures"))
+
+    def record_failure(self):
+        if cache.get(self._key("opened_at")) is not None:
+            # A failed trial call keeps the circuit open for another period
+            self._open()
+            return
+
+        cache.add(self._key("failures"), 0, None)
+        try:
+            failures = cache.incr(self._key("failures"))
+        except ValueError:  # evicted between add() and incr()
+            failures = 1
+            cache.set(self._key("failures"), failures, None)
+        if failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        logger.warning(
+            "Circuit opened",
+            extra={"circuit": self.name, "recovery_timeout": self.recovery_timeout},
+        )
+        cache.set(self._key("opened_at"), time.time(), None)
+        cache.delete(self._key("trial"))
+
+    async def aallow_request(self):
+        return await sync_to_async(self.allow_request)()
+
+    async def arecord_success(self):
+        await sync_to_async(self.record_success)()
+
+    def reset(self):
+        cache.delete_many(
+            [self._key("opened_at"), self._key("trial"), self._key("failures")]
+        )
+        with self._lock:
+            self.rejected = 0
+
+    def stats(self):
+        values = cache.get_many([self._key("failures"), self._key("opened_at")])
+        opened_at = values.get(self._key("opened_at"))
+        with self._lock:
+            rejected = self.rejected
+        return {
+            "state": self._state(opened_at),
+            "consecutive_failures": values.get(self._key("failures"), 0),
+            "failure_threshold": self.failure_threshold,
+            "retry_in": round(self._retry_in(opened_at), 1),
+            "rejected_calls": rejected,
+        }
@@ -0,0 +1,75 @@
+"""
+ETags for read endpoints, built from version tokens instead of the data.
+
+Each cacheable response depends on a few named version tokens (see
+cache_versions) that writers bump: "topics" on any topic change,
+"children" on any child or topic-access change, and one token per child
+for its questions. The ETag hashes those tokens with the request, so a
+conditional GET is answered from the cache without querying or
+serializing anything.
+
+That only holds when every process sees the same tokens. With a
+per-process cache (LocMemCache, the default) a bump made by the answer
+worker or another web worker never reaches this one, and a 304 could stay
+stale forever, so ETags are only sent with a shared cache backend.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.utils.http import parse_etags
+
+from .cache_versions import bump_version, get_versions
+
+TOPICS_VERSION = "topics"  # bumped by topic_registry.notify_changed()
+CHILDREN_VERSION = "children"
+
+# Cache backends whose contents other processes can't see
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def etags_enabled():
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES
+
+
+def child_questions_version(child_id):
+    return f"child_questions:{child_id}"
+
+
+def children_changed():
+    bump_version(CHILDREN_VERSION)
+
+
+def child_questions_changed(child_ids):
+    for child_id in set(child_ids):
+        bump_version(child_questions_version(child_id))
+
+
+def compute_etag(request, version_names):
+    """
+    Strong ETag for this request given the versions its response depends on.
+
+    The path, query string, user and Accept header are part of the hash,
+    since each of them can change the representation.
+    """
+    user = request.user
+    parts = [
+        request.get_full_path(),
+        str(user.pk) if user.is_authenticated else "",
+        request.META.get("HTTP_ACCEPT", ""),
+        *get_versions(version_names),
+    ]
+    digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag):
+    """Whether If-None-Match names this ETag (weak comparison, as for GET)"""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in (tag.removeprefix("W/") for tag in etags)
@@ -0,0 +1,182 @@
+"""In-process stand-in for the Anthropic client, for tests and benchmarks."""
+
+import asyncio
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+DEFAULT_ANSWER = "That's a great question! Here is a simple, friendly answer."
+
+
+class FakeLLMError(Exception):
+    """Raised by FakeAnthropic for injected failures"""
+
+
+class FakeAnthropic:
+    """
+    Mimics the parts of anthropic.Anthropic that QuestionService uses.
+
+    `answer` may be a string or a callable taking the question text. `latency`
+    (seconds) is slept on every call, and the first `failures` calls raise
+    `error` so retry paths can be exercised. Every call's kwargs are recorded
+    in `calls`. messages.stream() yields the answer word by word, sleeping
+    `token_latency` between deltas. System blocks marked with cache_control
+    are reported as prompt-cache writes the first time and reads afterwards.
+    """
+
+    def __init__(
+        self,
+        answer=DEFAULT_ANSWER,
+        latency=0.0,
+        failures=0,
+        error=None,
+        model="claude-fake",
+        token_latency=0.0,
+    ):
+        self.answer = answer
+        self.latency = latency
+        self.token_latency = token_latency
+        self.failures = failures
+        self.error = error or FakeLLMError("Injected failure")
+        self.model = model
+        self.calls = []
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self._create, stream=self._stream)
+
+    def _next_failure(self):
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                return True
+            return False
+
+    def _create(self, **kwargs):
+        self._create_started(kwargs)
+        return self._build_message(kwargs)
+
+    def _create_started(self, kwargs):
+        """Record the call, wait out the latency and maybe inject a failure"""
+        with self._lock:
+            self.calls.append(kwargs)
+        if self.latency:
+            time.sleep(self.latency)
+        if self._next_failure():
+            raise self.error
+
+    def _stream(self, **kwargs):
+        return _FakeStream(self, kwargs)
+
+    def _answer_text(self, kwargs):
+        question = kwargs["messages"][-1]["content"]
+        return self.answer(question) if callable(self.answer) else self.answer
+
+    def _usage(self, kwargs, text):
+        question = kwargs["messages"][-1]["content"]
+        system = kwargs.get("system", "")
+        if isinstance(system, str):
+            system = [{"type": "text", "text": system}]
+
+        cached = "".join(b["text"] for b in system if b.get("cache_control"))
+        uncached = "".join(b["text"] for b in system if not b.get("cache_control"))
+        cached_tokens = len(cached.split())
+        with self._lock:
+            cache_hit = cached in self._cached_prefixes
+            self._cached_prefixes.add(cached)
+
+        return SimpleNamespace(
+            input_tokens=len(uncached.split()) + len(question.split()),
+            output_tokens=len(text.split()),
+            cache_read_input_tokens=cached_tokens if cache_hit else 0,
+            cache_creation_input_tokens=0 if cache_hit else cached_tokens,
+        )
+
+    def _build_message(self, kwargs):
+        text = self._answer_text(kwargs)
+        return SimpleNamespace(
+            id="msg_fake",
+            model=self.model,
+            role="assistant",
+            content=[SimpleNamespace(type="text", text=text)],
+            stop_reason="end_turn",
+            usage=self._usage(kwargs, text),
+        )
+
+
+def text_deltas(text):
+    """Split text into word-sized deltas that join back to the original"""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+class _FakeStream:
+    """Context manager returned by FakeAnthropic.messages.stream()"""
+
+    def __init__(self, client, kwargs):
+        self.client = client
+        self.kwargs = kwargs
+
+    def __enter__(self):
+        self.client._create_started(self.kwargs)
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        for index, delta in enumerate(
+            text_deltas(self.client._answer_text(self.kwargs))
+        ):
+            if index and self.client.token_latency:
+                time.sleep(self.client.token_latency)
+            yield delta
+
+    def get_final_message(self):
+        return self.client._build_message(self.kwargs)
+
+
+class FakeAsyncAnthropic(FakeAnthropic):
+    """Async counterpart of FakeAnthropic (mimics anthropic.AsyncAnthropic)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages = SimpleNamespace(create=self._acreate, stream=self._astream)
+
+    async def _acreate(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._next_failure():
+            raise self.error
+        return self._build_message(kwargs)
+
+    def _astream(self, **kwargs):
+        return _FakeAsyncStream(self, kwargs)
+
+
+class _FakeAsyncStream(_FakeStream):
+    async def __aenter__(self):
+        with self.client._lock:
+            self.client.calls.append(self.kwargs)
+        if self.client.latency:
+            await asyncio.sleep(self.client.latency)
+        if self.client._next_failure():
+            raise self.client.error
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for index, delta in enumerate(
+            text_deltas(self.client._answer_text(self.kwargs))
+        ):
+            if index and self.client.token_latency:
+                await asyncio.sleep(self.client.token_latency)
+            yield delta
+
+    async def get_final_message(self):
+        return self.client._build_message(self.kwargs)
@@ -0,0 +1,111 @@
+"""Aggregated Claude latency, token and cost figures from Question rows."""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Aggregate, Count, FloatField, Sum
+from django.db.models.functions import TruncDate
+
+from core.models import Question
+
+TOKEN_FIELDS = [
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+]
+
+# Price per token field, matching the keys of LLM_PRICING entries
+PRICE_KEYS = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_read_input_tokens": "cache_read",
+    "cache_creation_input_tokens": "cache_write",
+}
+
+
+class Percentile(Aggregate):
+    """PostgreSQL percentile_cont(fraction) WITHIN GROUP (ORDER BY expression)"""
+
+    function = "PERCENTILE_CONT"
+    name = "Percentile"
+    output_field = FloatField()
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def estimated_cost(model, tokens):
+    """USD cost of token counts at LLM_PRICING (per million tokens) rates"""
+    prices = getattr(settings, "LLM_PRICING", {}).get(model)
+    if prices is None:
+        return None
+    return sum(
+        (tokens.get(field) or 0) * prices.get(key, 0) / 1_000_000
+        for field, key in PRICE_KEYS.items()
+    )
+
+
+def _summaries(queryset, group_field, label):
+    """One summary per value of group_field, best-effort cost included"""
+    rows = (
+        queryset.values(group_field)
+        .annotate(
+            calls=Count("id"),
+            latency_p50_ms=Percentile("llm_latency_ms", 0.5),
+            latency_p95_ms=Percentile("llm_latency_ms", 0.95),
+            **{field: Sum(field) for field in TOKEN_FIELDS},
+        )
+        .order_by(group_field)
+    )
+
+    # Prices differ per model, so cost needs token sums per (group, model)
+    costs = defaultdict(float)
+    unpriced = set()
+    for row in queryset.values(group_field, "llm_model").annotate(
+        **{field: Sum(field) for field in TOKEN_FIELDS}
+    ):
+        cost = estimated_cost(row["llm_model"], row)
+        if cost is None:
+            unpriced.add(row[group_field])
+        else:
+            costs[row[group_field]] += cost
+
+    summaries = []
+    for row in rows:
+        group = row.pop(group_field)
+        summaries.append(
+            {
+                label: group,
+                **row,
+                "latency_p50_ms": _round(row["latency_p50_ms"]),
+                "latency_p95_ms": _round(row["latency_p95_ms"]),
+                **{field: row[field] or 0 for field in TOKEN_FIELDS},
+                "estimated_cost_usd": (
+                    None if group in unpriced else round(costs[group], 6)
+                ),
+            }
+        )
+    return summaries
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def llm_stats(since):
+    """
+    Latency percentiles, token sums and estimated cost per topic and per day.
+
+    Only questions that made a Claude call since `since` are counted: cache
+    hits and coalesced duplicates carry no usage of their own.
+    """
+    queryset = Question.objects.filter(
+        response_generated_at__gte=since, llm_latency_ms__isnull=False
+    ).annotate(day=TruncDate("response_generated_at"))
+
+    return {
+        "by_topic": _summaries(queryset, "detected_topic__slug", "topic"),
+        "by_day": _summaries(queryset, "day", "day"),
+    }
@@ -0,0 +1,70 @@
+"""Precompiled system prompts, split for Anthropic prompt caching."""
+
+from functools import lru_cache
+
+from core.models import Child
+
+BASE_INSTRUCTIONS = """You are a friendly, educational AI helping a child learn about the world.
+
+Guidelines:
+- Use simple, age-appropriate language
+- Be encouraging and positive
+- Keep answers concise (2-3 paragraphs max)
+- Make learning fun and engaging
+- Never include scary or inappropriate content
+"""
+
+READING_LEVELS = dict(Child.READING_LEVELS)
+
+# Anthropic ignores cache_control on prefixes shorter than this (Sonnet's
+# minimum). Tokens are estimated at ~4 characters each, which errs towards
+# leaving the marker off.
+PROMPT_CACHE_MIN_TOKENS = 1024
+CHARS_PER_TOKEN = 4
+
+
+def get_system_prompt(child, topic):
+    """
+    System prompt blocks for a child and topic, ready for messages.create().
+
+    The first block holds everything shared by all children asking about the
+    topic; the second block is the child-specific part. The first block only
+    carries a cache_control breakpoint when it is long enough to be cached
+    (PROMPT_CACHE_MIN_TOKENS), i.e. for topics with long guidelines.
+    """
+    if topic is None:
+        return _compile(child.age, child.reading_level, None, None, None)
+    return _compile(
+        child.age,
+        child.reading_level,
+        topic.id,
+        topic.name,
+        topic.context_guidelines,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compile(age, reading_level, topic_id, topic_name, context_guidelines):
+    # topic name and guidelines are part of the key, so an edited topic can
+    # never be served a stale prompt even before invalidate_prompts() runs
+    prefix = BASE_INSTRUCTIONS + f"\nTopic: {topic_name or 'General'}\n"
+    if context_guidelines:
+        prefix += f"\nTopic-Specific Guidelines:\n{context_guidelines}\n"
+
+    audience = (
+        f"The child is {age} years old.\n"
+        f"Reading Level: {READING_LEVELS.get(reading_level, reading_level)}"
+    )
+    shared = {"type": "text", "text": prefix}
+    if len(prefix) >= PROMPT_CACHE_MIN_TOKENS * CHARS_PER_TOKEN:
+        shared["cache_control"] = {"type": "ephemeral"}
+    return (shared, {"type": "text", "text": audience})
+
+
+def invalidate_prompts():
+    """Drop every compiled prompt (called when a topic changes)"""
+    _compile.cache_clear()
+
+
+def prompt_cache_info():
+    return _compile.cache_info()._asdict()
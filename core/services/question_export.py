@@ -0,0 +1,138 @@
+"""
+Streaming export of a family's question history as NDJSON or CSV.
+
+Rows are read through a server-side cursor (`.iterator(chunk_size=...)`)
+as plain tuples and encoded one at a time, so memory stays flat whatever
+the size of the history. Lines are joined into ~64 KB chunks before they
+are handed to the response or file, optionally gzip-compressed on the fly.
+
+Under ASGI, Django buffers a sync iterator in full before sending it, so
+the view streams aexport_chunks() instead, which pulls one chunk at a time
+from the sync generator.
+"""
+
+import csv
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import Question
+
+# (column name, Question lookup) in export order
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("child_id", "child_id"),
+    ("child_name", "child__name"),
+    ("text", "text"),
+    ("topic", "detected_topic__slug"),
+    ("was_within_boundaries", "was_within_boundaries"),
+    ("answer", "answer"),
+    ("status", "status"),
+    ("child_marked_helpful", "child_marked_helpful"),
+    ("created_at", "created_at"),
+    ("response_generated_at", "response_generated_at"),
+]
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+CHUNK_BYTES = 64 * 1024
+
+
+def export_rows(family_id, chunk_size=None):
+    """Tuples in EXPORT_COLUMNS order, oldest first, from a server-side cursor"""
+    chunk_size = chunk_size or getattr(settings, "QUESTION_EXPORT_CHUNK_SIZE", 2000)
+    return (
+        Question.objects.filter(child__family_id=family_id)
+        .order_by("id")
+        .values_list(*(lookup for _, lookup in EXPORT_COLUMNS))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def ndjson_lines(rows):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + "\n"
+
+
+class _Line:
+    """File-like target for csv.writer that hands back each written line"""
+
+    def write(self, value):
+        return value
+
+
+# Cells starting with these are run as formulas by spreadsheet apps
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    """Defuse child- or LLM-written text that a spreadsheet would evaluate"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def batched(lines, size=CHUNK_BYTES):
+    """Join text lines into UTF-8 chunks of about `size` bytes"""
+    buffer, buffered = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzipped(chunks):
+    """Compress a stream of byte chunks into one gzip member"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(family_id, export_format="ndjson", gzip=False, chunk_size=None):
+    """Byte chunks of a family's question history in the given format"""
+    encode = {"ndjson": ndjson_lines, "csv": csv_lines}[export_format]
+    chunks = batched(encode(export_rows(family_id, chunk_size)))
+    return gzipped(chunks) if gzip else chunks
+
+
+async def aexport_chunks(family_id, export_format="ndjson", gzip=False):
+    """
+    Async iterator over export_chunks(), for StreamingHttpResponse under ASGI.
+
+    Each chunk is produced in the sync thread, so the server-side cursor
+    keeps using the same database connection from first row to last.
+    """
+    chunks = export_chunks(family_id, export_format, gzip=gzip)
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+def export_filename(family_id, export_format, gzip=False):
+    _, extension = EXPORT_FORMATS[export_format]
+    return f"family-{family_id}-questions.{extension}" + (".gz" if gzip else "")
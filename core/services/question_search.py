@@ -0,0 +1,59 @@
+"""
+Full-text search over question text and answers.
+
+Matches against Question.search_vector (a generated tsvector column with a
+GIN index) instead of ILIKE '%...%', ranks matches with ts_rank (question
+text weighs more than the answer) and highlights matched words.
+"""
+
+from html import escape
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+
+SEARCH_CONFIG = "english"
+
+# ts_headline marks matches with control characters, not <mark>: the text
+# is children's and Claude's, so it is HTML-escaped before the delimiters
+# become tags (see highlight_html)
+START_SEL, STOP_SEL = "\x02", "\x03"
+MARKS = {"start_sel": START_SEL, "stop_sel": STOP_SEL}
+# Answers are long: show up to two fragments around the matches
+ANSWER_FRAGMENTS = {"max_words": 35, "min_words": 15, "max_fragments": 2}
+
+
+def search_query(terms):
+    """Web-search syntax: words, "quoted phrases", or, -exclusions"""
+    return SearchQuery(terms, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def search_questions(queryset, terms, highlight=True):
+    """
+    Filter to questions matching `terms`, best match first.
+
+    Adds `rank` and, with highlight, `text_highlight` and `answer_highlight`
+    with matched words delimited by MARKS: the whole question, fragments of
+    the answer. Pass them through highlight_html() before display. Postgres
+    only builds highlights for the rows it returns, so paging keeps them
+    cheap.
+    """
+    query = search_query(terms)
+    queryset = queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F("search_vector"), query)
+    )
+    if highlight:
+        queryset = queryset.annotate(
+            text_highlight=SearchHeadline(
+                "text", query, config=SEARCH_CONFIG, highlight_all=True, **MARKS
+            ),
+            answer_highlight=SearchHeadline(
+                "answer", query, config=SEARCH_CONFIG, **MARKS, **ANSWER_FRAGMENTS
+            ),
+        )
+    return queryset.order_by("-rank", "-id")
+
+
+def highlight_html(headline):
+    """Escape a highlight as HTML, keeping only its matches as <mark> tags"""
+    html = escape(headline)
+    return html.replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
@@ -1,203 +1,649 @@
+import asyncio
 import logging
-import os
+import time
 
-from anthropic import Anthropic
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 
-from core.models import Question, TopicCategory
+from core.models import Question
+
+from .answer_cache import answer_cache, is_rejected_answer
+from .anthropic_client import (
+    acreate_message,
+    astream_message,
+    create_message,
+    get_anthropic_client,
+    get_async_anthropic_client,
+    stream_message,
+)
+from .child_topics import aget_allowed_topics, get_allowed_topics
+from .circuit_breaker import CircuitOpenError
+from .etags import child_questions_changed
+from .prompts import get_system_prompt
+from .similar_questions import get_similar_question_index
+from .single_flight import question_flights
+from .topic_matcher import get_topic_matcher
+from .topic_registry import topic_registry
 
 logger = logging.getLogger(__name__)
 
+FALLBACK_ANSWER = (
+    "I'm having trouble answering right now. Please try again in a moment!"
+)
+
+# Everything _save_answer() writes, including _record_usage() and the
+# last_error a giving-up worker sets
+ANSWER_FIELDS = [
+    "answer",
+    "response_generated_at",
+    "status",
+    "available_at",
+    "last_error",
+    "llm_model",
+    "llm_latency_ms",
+    "stop_reason",
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+]
+
+
+async def release_db_connection():
+    """
+    Close this request's database connection before a long await.
+
+    Under ASGI every in-flight request keeps its own connection, so holding
+    it while Claude generates would need one Postgres connection per open
+    question. Skipped inside a transaction (e.g. in tests).
+    """
+
+    def close():
+        if not connection.in_atomic_block:
+            connection.close()
+
+    await sync_to_async(close)()
+
+
+def _degraded_threshold():
+    return getattr(settings, "SIMILAR_QUESTIONS_DEGRADED_THRESHOLD", 0.5)
+
 
 class QuestionService:
     """Handles question processing and AI integration"""
 
-    def __init__(self):
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    def __init__(self, client=None, async_client=None):
+        # Clients are shared per process so connections are pooled and reused
+        self.client = client or get_anthropic_client()
+        self._async_client = async_client
 
     def detect_topic(self, question_text):
-        """Simple keyword-based topic detection (MVP version)"""
+        """Keyword-based topic detection: return the best-scoring active topic"""
         # TODO: Replace with ML-based classification for better accuracy
-        question_lower = question_text.lower()
-
-        # Get all active topics
-        topics = TopicCategory.objects.filter(is_active=True)
-
-        # Simple keyword matching (enhance later with AI)
-        topic_keywords = {
-            "animals": [
-                "animal",
-                "dog",
-                "cat",
-                "lion",
-                "tiger",
-                "bird",
-                "fish",
-                "pet",
-                "zoo",
-                "wild",
-            ],
-            "space": [
-                "space",
-                "planet",
-                "star",
-                "moon",
-                "sun",
-                "astronaut",
-                "rocket",
-                "galaxy",
-                "mars",
-            ],
-            "how-things-work": [
-                "work",
-                "how does",
-                "why does",
-                "machine",
-                "engine",
-                "computer",
-                "phone",
-            ],
-            "weather": [
-                "weather",
-                "rain",
-                "snow",
-                "storm",
-                "wind",
-                "cloud",
-                "thunder",
-                "lightning",
-                "season",
-            ],
-            "science": [
-                "science",
-                "experiment",
-                "chemical",
-                "reaction",
-                "physics",
-                "chemistry",
-            ],
-            "history": [
-                "history",
-                "ancient",
-                "war",
-                "president",
-                "king",
-                "queen",
-                "civilization",
-            ],
-            "ocean": [
-                "ocean",
-                "sea",
-                "whale",
-                "shark",
-                "dolphin",
-                "coral",
-                "beach",
-                "marine",
-            ],
-            "human-body": [
-                "body",
-                "heart",
-                "brain",
-                "muscle",
-                "bone",
-                "blood",
-                "health",
-                "sick",
-            ],
-        }
-
-        for slug, keywords in topic_keywords.items():
-            if any(keyword in question_lower for keyword in keywords):
-                try:
-                    return topics.get(slug=slug)
-                except TopicCategory.DoesNotExist:
-                    continue
+        for match in self.match_topics(question_text):
+            topic = topic_registry.get(match.slug)
+            if topic is not None:
+                return topic
 
         return None
 
-    def generate_answer(self, question_obj):
-        """Generate age-appropriate answer using Claude"""
-        child = question_obj.child
-        topic = question_obj.detected_topic
-
-        # Build system prompt
-        system_prompt = f"""You are a friendly, educational AI helping a {child.age}-year-old child learn about the world.
-
-Reading Level: {child.get_reading_level_display()}
-Topic: {topic.name if topic else 'General'}
+    def match_topics(self, question_text):
+        """Return every (slug, score) keyword match for the question, best first"""
+        return get_topic_matcher().match(question_text)
 
-Guidelines:
-- Use simple, age-appropriate language
-- Be encouraging and positive
-- Keep answers concise (2-3 paragraphs max)
-- Make learning fun and engaging
-- Never include scary or inappropriate content
-"""
+    def generate_answer(self, question_obj, fallback_on_error=True):
+        """
+        Generate age-appropriate answer using Claude.
 
-        if topic:
-            system_prompt += (
-                f"\n\nTopic-Specific Guidelines:\n{topic.context_guidelines}"
-            )
+        With fallback_on_error=False, API errors are re-raised instead of
+        saving the friendly fallback, so the answer queue can retry. While
+        the Claude circuit is open no call is made at all. Identical
+        questions asked concurrently share a single Claude call.
+        """
+        reused_answer = self.find_reusable_answer(question_obj)
+        if reused_answer is not None:
+            self._save_answer(question_obj, reused_answer)
+            return reused_answer
 
         # Call Claude API
         try:
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=500,
-                system=system_prompt,
-                messages=[{"role": "user", "content": question_obj.text}],
+            answer, shared = question_flights.do(
+                self._flight_key(question_obj),
+                lambda: self._call_claude(question_obj),
             )
 
-            answer = message.content[0].text
-
             # Update question with answer
-            question_obj.answer = answer
-            question_obj.response_generated_at = timezone.now()
-            question_obj.save()
+            self._save_answer(question_obj, answer)
+            self._remember_answer(question_obj, answer, shared)
 
             return answer
 
         except Exception as e:
-            # Log error and save friendly message
-            error_message = (
-                "I'm having trouble answering right now. Please try again in a moment!"
+            self._log_api_error(question_obj, e)
+            if not fallback_on_error:
+                raise
+
+            # Save error message (or a looser cached match) to question
+            return self._fallback_answer(question_obj, e)
+
+    async def agenerate_answer(self, question_obj):
+        """
+        Async version of generate_answer: awaits AsyncAnthropic instead of
+        blocking a thread, and saves through the async ORM.
+        """
+        reused_answer = await self.afind_reusable_answer(question_obj)
+        if reused_answer is not None:
+            await self._asave_answer(question_obj, reused_answer)
+            return reused_answer
+
+        await release_db_connection()
+        try:
+            answer, shared = await question_flights.ado(
+                self._flight_key(question_obj),
+                lambda: self._acall_claude(question_obj),
+            )
+        except Exception as e:
+            self._log_api_error(question_obj, e)
+            return await self._afallback_answer(question_obj, e)
+
+        await self._asave_answer(question_obj, answer)
+        await sync_to_async(self._remember_answer)(question_obj, answer, shared)
+        return answer
+
+    def _flight_key(self, question_obj):
+        # Questions that would share a cached answer share the call too
+        return answer_cache.make_key(
+            question_obj.text, question_obj.child, question_obj.detected_topic
+        )
+
+    def _call_claude(self, question_obj):
+        started = time.monotonic()
+        message = create_message(self.client, **self._message_params(question_obj))
+        self._record_usage(question_obj, message, started)
+        return message.content[0].text
+
+    async def _acall_claude(self, question_obj):
+        started = time.monotonic()
+        message = await acreate_message(
+            self.async_client, **self._message_params(question_obj)
+        )
+        self._record_usage(question_obj, message, started)
+        return message.content[0].text
+
+    def stream_answer(self, question_obj):
+        """
+        Generate the answer with Claude's streaming API, yielding text deltas.
+
+        The question (which may be unsaved) is written once, after the last
+        delta. On an API error the fallback is saved and yielded instead; if
+        the client disconnects mid-answer, the part streamed so far is saved
+        as failed.
+        """
+        reused_answer = self.find_reusable_answer(question_obj)
+        if reused_answer is not None:
+            self._save_answer(question_obj, reused_answer)
+            yield reused_answer
+            return
+
+        chunks = []
+        started = time.monotonic()
+        try:
+            with stream_message(
+                self.client, **self._message_params(question_obj)
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+                self._record_usage(question_obj, stream.get_final_message(), started)
+        except GeneratorExit:
+            self._save_answer(
+                question_obj, "".join(chunks), status=Question.STATUS_FAILED
+            )
+            raise
+        except Exception as e:
+            self._log_api_error(question_obj, e)
+            yield self._fallback_delta(chunks, self._fallback_answer(question_obj, e))
+            return
+
+        answer = "".join(chunks)
+        self._save_answer(question_obj, answer)
+        self._remember_answer(question_obj, answer)
+
+    async def astream_answer(self, question_obj):
+        """
+        Async version of stream_answer for ASGI: streams through
+        AsyncAnthropic and saves with the async ORM, so no thread is held
+        while Claude generates.
+        """
+        reused_answer = await self.afind_reusable_answer(question_obj)
+        if reused_answer is not None:
+            await self._asave_answer(question_obj, reused_answer)
+            yield reused_answer
+            return
+
+        await release_db_connection()
+        chunks = []
+        started = time.monotonic()
+        try:
+            async with astream_message(
+                self.async_client, **self._message_params(question_obj)
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+                final_message = await stream.get_final_message()
+                self._record_usage(question_obj, final_message, started)
+        except (GeneratorExit, asyncio.CancelledError):
+            await self._asave_answer(
+                question_obj, "".join(chunks), status=Question.STATUS_FAILED
             )
-            logger.error(
-                "Error generating answer from Claude API",
+            raise
+        except Exception as e:
+            self._log_api_error(question_obj, e)
+            answer = await self._afallback_answer(question_obj, e)
+            yield self._fallback_delta(chunks, answer)
+            return
+
+        answer = "".join(chunks)
+        await self._asave_answer(question_obj, answer)
+        await sync_to_async(self._remember_answer)(question_obj, answer)
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = get_async_anthropic_client()
+        return self._async_client
+
+    def _message_params(self, question_obj):
+        return {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 500,
+            "system": list(
+                get_system_prompt(question_obj.child, question_obj.detected_topic)
+            ),
+            "messages": [{"role": "user", "content": question_obj.text}],
+        }
+
+    def _fallback_delta(self, chunks, answer):
+        # Part of an answer may already have been streamed
+        return f"\n\n{answer}" if chunks else answer
+
+    def find_reusable_answer(self, question_obj):
+        """
+        Return a cached answer to the same question or an earlier paraphrase,
+        or None if Claude has to be called.
+        """
+        cache_key, cached_answer = self._cached_answer(question_obj)
+        if cached_answer is not None:
+            return cached_answer
+
+        # Reuse the answer of an earlier paraphrase of this question
+        similar_answer = self.find_similar_answer(question_obj)
+        if similar_answer is not None:
+            answer_cache.set(cache_key, similar_answer)
+        return similar_answer
+
+    async def afind_reusable_answer(self, question_obj):
+        """
+        Async version of find_reusable_answer.
+
+        The answer cache checks version tokens and the index may load its
+        snapshot from disk on first use; both run in a thread, not on the
+        event loop.
+        """
+        cache_key, cached_answer = await sync_to_async(self._cached_answer)(
+            question_obj
+        )
+        if cached_answer is not None:
+            return cached_answer
+
+        similar_answer = await self.afind_similar_answer(question_obj)
+        if similar_answer is not None:
+            await sync_to_async(answer_cache.set)(cache_key, similar_answer)
+        return similar_answer
+
+    def _cached_answer(self, question_obj):
+        child = question_obj.child
+        topic = question_obj.detected_topic
+
+        # Serve repeated questions from the answer cache without calling Claude
+        cache_key = answer_cache.make_key(question_obj.text, child, topic)
+        cached_answer = answer_cache.get(cache_key)
+        if cached_answer is None or cached_answer == FALLBACK_ANSWER:
+            return cache_key, None
+        if is_rejected_answer(cached_answer):
+            # Marked unhelpful on another question it was reused for
+            answer_cache.evict(cache_key, answer=cached_answer)
+            return cache_key, None
+
+        logger.info(
+            "Serving cached answer",
+            extra={
+                "child_id": child.id,
+                "question_id": question_obj.id,
+                "topic": topic.slug if topic else None,
+            },
+        )
+        return cache_key, cached_answer
+
+    def _remember_answer(self, question_obj, answer, shared=False):
+        """Make a fresh Claude answer reusable by later questions"""
+        topic = question_obj.detected_topic
+        # Only real answers are cached; the error fallback never is
+        answer_cache.set(
+            answer_cache.make_key(question_obj.text, question_obj.child, topic),
+            answer,
+        )
+        if shared:
+            # The question that made the call is the one indexed
+            return
+        get_similar_question_index().add(
+            question_obj.id,
+            question_obj.text,
+            topic.slug if topic else None,
+            question_obj.child.reading_level,
+        )
+
+    def _log_api_error(self, question_obj, error):
+        child = question_obj.child
+        topic = question_obj.detected_topic
+        if isinstance(error, CircuitOpenError):
+            logger.warning(
+                "Claude API circuit open, failing fast",
                 extra={
-                    "error": str(e),
                     "child_id": child.id,
-                    "child_age": child.age,
                     "question_id": question_obj.id,
-                    "topic": topic.slug if topic else None,
+                    "retry_in": error.retry_in,
                 },
-                exc_info=True,
             )
+            return
 
-            # Save error message to question
-            question_obj.answer = error_message
-            question_obj.response_generated_at = timezone.now()
-            question_obj.save()
+        logger.error(
+            "Error generating answer from Claude API",
+            extra={
+                "error": str(error),
+                "child_id": child.id,
+                "child_age": child.age,
+                "question_id": question_obj.id,
+                "topic": topic.slug if topic else None,
+            },
+            exc_info=True,
+        )
 
-            return error_message
+    def find_similar_answer(self, question_obj, threshold=None):
+        """Return the answer of a near-duplicate earlier question, if any"""
+        match = self._similar_question(question_obj, threshold)
+        if match is None:
+            return None
+
+        row = (
+            Question.objects.filter(pk=match[0])
+            .values_list("answer", "child_marked_helpful", "status")
+            .first()
+        )
+        return self._similar_answer(question_obj, match, row)
+
+    async def afind_similar_answer(self, question_obj, threshold=None):
+        """Async version of find_similar_answer"""
+        match = await sync_to_async(self._similar_question)(question_obj, threshold)
+        if match is None:
+            return None
+
+        row = (
+            await Question.objects.filter(pk=match[0])
+            .values_list("answer", "child_marked_helpful", "status")
+            .afirst()
+        )
+        return await sync_to_async(self._similar_answer)(question_obj, match, row)
+
+    def _similar_question(self, question_obj, threshold=None):
+        topic = question_obj.detected_topic
+        if threshold is None:
+            threshold = getattr(settings, "SIMILAR_QUESTIONS_THRESHOLD", 0.8)
+        return get_similar_question_index().query(
+            question_obj.text,
+            topic.slug if topic else None,
+            question_obj.child.reading_level,
+            threshold=threshold,
+        )
+
+    def _similar_answer(self, question_obj, match, row):
+        similar_id, similarity = match
+        if (
+            row is None
+            or not row[0]
+            or row[0] == FALLBACK_ANSWER
+            or row[1] is False
+            or row[2] != Question.STATUS_ANSWERED
+            or is_rejected_answer(row[0])
+        ):
+            # Deleted, failed (e.g. a stream cut short) or unhelpful (here or
+            # where it was reused) since it was indexed
+            get_similar_question_index().remove(similar_id)
+            return None
+
+        logger.info(
+            "Reusing answer from similar question",
+            extra={
+                "question_id": question_obj.id,
+                "similar_question_id": similar_id,
+                "similarity": similarity,
+            },
+        )
+        return row[0]
+
+    def _record_usage(self, question_obj, message, started):
+        """Copy model, latency, stop reason and token usage onto the question"""
+        question_obj.llm_latency_ms = round((time.monotonic() - started) * 1000)
+        for field, value in (
+            ("llm_model", getattr(message, "model", None)),
+            ("stop_reason", getattr(message, "stop_reason", None)),
+        ):
+            setattr(question_obj, field, value if isinstance(value, str) else "")
+
+        usage = getattr(message, "usage", None)
+        for field in (
+            "input_tokens",
+            "output_tokens",
+            "cache_read_input_tokens",
+            "cache_creation_input_tokens",
+        ):
+            value = getattr(usage, field, None)
+            setattr(question_obj, field, value if isinstance(value, int) else None)
+
+        if question_obj.cache_read_input_tokens:
+            logger.info(
+                "System prompt served from prompt cache",
+                extra={
+                    "question_id": question_obj.id,
+                    "cache_read_input_tokens": question_obj.cache_read_input_tokens,
+                },
+            )
+
+    def _fallback_answer(self, question_obj, error):
+        """
+        Save and return what to answer when Claude could not be called.
+
+        While the circuit is open, the answer of a looser paraphrase match
+        (SIMILAR_QUESTIONS_DEGRADED_THRESHOLD) beats the error message.
+        """
+        if isinstance(error, CircuitOpenError):
+            answer = self.find_similar_answer(question_obj, _degraded_threshold())
+            if answer is not None:
+                self._save_answer(question_obj, answer)
+                return answer
+
+        self.save_fallback_answer(question_obj)
+        return FALLBACK_ANSWER
+
+    async def _afallback_answer(self, question_obj, error):
+        """Async version of _fallback_answer"""
+        if isinstance(error, CircuitOpenError):
+            answer = await self.afind_similar_answer(
+                question_obj, _degraded_threshold()
+            )
+            if answer is not None:
+                await self._asave_answer(question_obj, answer)
+                return answer
+
+        await self._asave_answer(
+            question_obj, FALLBACK_ANSWER, status=Question.STATUS_FAILED
+        )
+        return FALLBACK_ANSWER
+
+    def save_fallback_answer(self, question_obj):
+        """Give up on a question: store the friendly error message"""
+        self._save_answer(question_obj, FALLBACK_ANSWER, status=Question.STATUS_FAILED)
+
+    def _save_answer(self, question_obj, answer, status=Question.STATUS_ANSWERED):
+        """
+        Store the answer; returns False if it was dropped.
+
+        A question claimed from the answer queue is only written while this
+        worker still holds the claim. Once the lease expires another worker
+        may reclaim the row, and a full save() here would overwrite that
+        worker's attempts, status and available_at.
+        """
+        claimed_attempts = self._claimed_attempts(question_obj)
+        self._set_answer(question_obj, answer, status)
+        if claimed_attempts is None:
+            # Streamed questions are still unsaved and are inserted here
+            question_obj.save(update_fields=self._update_fields(question_obj))
+            return True
+
+        updated = self._owned_row(question_obj, claimed_attempts).update(
+            **self._answer_values(question_obj)
+        )
+        if not updated:
+            self._log_lost_claim(question_obj)
+            return False
+        # .update() sends no post_save
+        child_questions_changed([question_obj.child_id])
+        return True
+
+    async def _asave_answer(
+        self, question_obj, answer, status=Question.STATUS_ANSWERED
+    ):
+        """Async version of _save_answer"""
+        claimed_attempts = self._claimed_attempts(question_obj)
+        self._set_answer(question_obj, answer, status)
+        if claimed_attempts is None:
+            await question_obj.asave(update_fields=self._update_fields(question_obj))
+            return True
+
+        updated = await self._owned_row(question_obj, claimed_attempts).aupdate(
+            **self._answer_values(question_obj)
+        )
+        if not updated:
+            self._log_lost_claim(question_obj)
+            return False
+        await sync_to_async(child_questions_changed)([question_obj.child_id])
+        return True
+
+    def _claimed_attempts(self, question_obj):
+        """The attempt this process claimed the question for, if it was queued"""
+        if question_obj.status == Question.STATUS_PROCESSING:
+            return question_obj.attempts
+        return None
+
+    def _update_fields(self, question_obj):
+        return ANSWER_FIELDS if question_obj.pk is not None else None
+
+    def _set_answer(self, question_obj, answer, status):
+        question_obj.answer = answer
+        question_obj.response_generated_at = timezone.now()
+        question_obj.status = status
+        question_obj.available_at = None
+
+    def _answer_values(self, question_obj):
+        return {field: getattr(question_obj, field) for field in ANSWER_FIELDS}
+
+    def _owned_row(self, question_obj, claimed_attempts):
+        return Question.objects.filter(
+            pk=question_obj.pk,
+            status=Question.STATUS_PROCESSING,
+            attempts=claimed_attempts,
+        )
+
+    def _log_lost_claim(self, question_obj):
+        logger.warning(
+            "Dropped answer for a question reclaimed by another worker",
+            extra={"question_id": question_obj.id, "attempts": question_obj.attempts},
+        )
 
     def get_allowed_topics_message(self, child):
         """Generate a friendly message listing allowed topics"""
-        allowed_topics = TopicCategory.objects.filter(
-            child_access__child=child, is_active=True
-        ).order_by("name")
+        return get_allowed_topics(child.id).message
+
+    def process_question(self, child, question_text, defer=False):
+        """
+        Main method: detect topic, check boundaries, generate answer.
+
+        With defer=True a within-boundary question is saved as pending and
+        answered later by the answer workers (manage.py run_answer_workers).
+        """
+        question, within_boundaries = self.screen_question(child, question_text)
+        if not within_boundaries:
+            question.save()
+            return question, False  # False = outside boundaries
 
-        if not allowed_topics.exists():
-            return "You don't have any topics unlocked yet. Ask your parent to unlock some topics for you!"
+        if defer:
+            question.status = Question.STATUS_PENDING
+            question.available_at = timezone.now()
+            question.save()
+            return question, True
 
-        topic_list = ", ".join(
-            [f"{topic.icon} {topic.name}" for topic in allowed_topics]
-        )
-        return f"Instead, you can ask me about: {topic_list}"
+        # Create question
+        question.save()
+
+        # Generate answer
+        self.generate_answer(question)
+
+        return question, True  # True = within boundaries
+
+    async def aprocess_question(self, child, question_text, defer=False):
+        """Async version of process_question for the ASGI ask view"""
+        question, within_boundaries = await self.ascreen_question(child, question_text)
+        if not within_boundaries:
+            await question.asave()
+            return question, False
+
+        if defer:
+            question.status = Question.STATUS_PENDING
+            question.available_at = timezone.now()
+            await question.asave()
+            return question, True
+
+        await question.asave()
+        await self.agenerate_answer(question)
+        return question, True
+
+    def screen_question(self, child, question_text):
+        """
+        Detect the topic and check the child's boundaries.
+
+        Returns an unsaved Question and whether it is within boundaries; a
+        question outside them already carries the friendly denial as answer.
+        """
+        self._log_processing(child, question_text)
+
+        # Detect topic
+        detected_topic = self.detect_topic(question_text)
+        allowed = get_allowed_topics(child.id)
+        return self._screened_question(child, question_text, detected_topic, allowed)
 
-    def process_question(self, child, question_text):
-        """Main method: detect topic, check boundaries, generate answer"""
+    async def ascreen_question(self, child, question_text):
+        """Async version of screen_question"""
+        self._log_processing(child, question_text)
+
+        await topic_registry.aensure_fresh()
+        detected_topic = self.detect_topic(question_text)
+        allowed = await aget_allowed_topics(child.id)
+        return self._screened_question(child, question_text, detected_topic, allowed)
+
+    def _log_processing(self, child, question_text):
         logger.info(
             "Processing question",
             extra={
@@ -208,19 +654,13 @@ Guidelines:
             },
         )
 
-        # Detect topic
-        detected_topic = self.detect_topic(question_text)
-
+    def _screened_question(self, child, question_text, detected_topic, allowed):
         # Check if question is outside boundaries:
         # 1. No topic detected (unclassified/potentially unsafe), OR
         # 2. Topic detected but child doesn't have access
-        if not detected_topic or not child.can_ask_about(detected_topic.slug):
+        if not detected_topic or detected_topic.slug not in allowed.slugs:
             # Question outside boundaries - suggest allowed topics
-            allowed_topics = list(
-                TopicCategory.objects.filter(
-                    child_access__child=child, is_active=True
-                ).values_list("slug", flat=True)
-            )
+            allowed_topics = sorted(allowed.slugs)
 
             logger.warning(
                 "Question outside boundaries",
@@ -237,7 +677,7 @@ Guidelines:
                 },
             )
 
-            allowed_topics_message = self.get_allowed_topics_message(child)
+            allowed_topics_message = allowed.message
 
             # Customize message based on whether topic was detected
             if detected_topic:
@@ -245,16 +685,15 @@ Guidelines:
             else:
                 denial_prefix = "I can't help you with that right now."
 
-            question = Question.objects.create(
+            question = Question(
                 child=child,
                 text=question_text,
                 detected_topic=detected_topic,
                 was_within_boundaries=False,
                 answer=f"{denial_prefix} \n\n{allowed_topics_message}",
             )
-            return question, False  # False = outside boundaries
+            return question, False
 
-        # Create question
         logger.info(
             "Question within boundaries, generating answer",
             extra={
@@ -263,14 +702,10 @@ Guidelines:
             },
         )
 
-        question = Question.objects.create(
+        question = Question(
             child=child,
             text=question_text,
             detected_topic=detected_topic,
             was_within_boundaries=True,
         )
-
-        # Generate answer
-        self.generate_answer(question)
-
-        return question, True  # True = within boundaries
+        return question, True
@@ -0,0 +1,251 @@
+"""MinHash + LSH index for reusing answers to near-duplicate questions."""
+
+import logging
+import os
+import pickle
+import random
+import threading
+import zlib
+from array import array
+
+from django.conf import settings
+
+from .answer_cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+# Words that carry no topic meaning; dropping them lets "why do cats purr"
+# and "how come my cat purrs" reduce to the same token set.
+STOPWORDS = frozenset(
+    """
+    a about am an and any are as at be because but by can come could did do
+    does doing for from get got happen happens has have how i if in into is it
+    its just know make makes me much my of on or please really so some tell
+    than that the their them then there they this to us very was we were what
+    when where which who why will with would you your
+    """.split()
+)
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def question_tokens(text):
+    """Content words of a question, lightly stemmed (plural "s" removed)"""
+    tokens = set()
+    for word in normalize_question(text).split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+
+class SimilarQuestionIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures of questions.
+
+    Each question is reduced to its content-word set and a num_perm MinHash
+    signature, split into `bands` bands. Questions sharing any band land in the
+    same bucket and are candidates; candidates are ranked by the fraction of
+    equal signature slots, an estimate of Jaccard similarity. Buckets are
+    namespaced by (topic slug, reading level), so answers are only reused for
+    the same topic and audience.
+
+    Storage is compact so the index can hold millions of questions: all
+    signatures live in one flat array and bucket keys are deterministic ints,
+    so snapshots written by one process can be loaded by another.
+    """
+
+    def __init__(self, num_perm=32, bands=8, max_bucket_size=32, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket_size = max_bucket_size
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self._lock = threading.RLock()
+        self._question_ids = array("q")
+        self._signatures = array("I")
+        self._slot_for_question = {}
+        # band key -> slot, or list of slots once a bucket holds several
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._slot_for_question)
+
+    def signature(self, tokens):
+        hashes = [zlib.crc32(token.encode()) for token in tokens]
+        if not hashes:
+            return None
+        return [
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _band_keys(self, signature, topic_slug, reading_level):
+        namespace = zlib.crc32(f"{topic_slug}|{reading_level}".encode())
+        rows = self.rows
+        return [
+            hash((namespace, band, *signature[band * rows : (band + 1) * rows]))
+            for band in range(self.bands)
+        ]
+
+    def add(self, question_id, text, topic_slug, reading_level):
+        """Index a question; returns False when it has no content words"""
+        signature = self.signature(question_tokens(text))
+        if signature is None:
+            return False
+
+        with self._lock:
+            if question_id in self._slot_for_question:
+                return True
+            slot = len(self._question_ids)
+            self._question_ids.append(question_id)
+            self._signatures.extend(signature)
+            self._slot_for_question[question_id] = slot
+
+            for key in self._band_keys(signature, topic_slug, reading_level):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    self._buckets[key] = slot
+                elif isinstance(bucket, int):
+                    self._buckets[key] = [bucket, slot]
+                else:
+                    bucket.append(slot)
+                    if len(bucket) > self.max_bucket_size:
+                        # Near-identical questions pile up in one bucket;
+                        # keeping the newest is enough to find a match.
+                        del bucket[0]
+        return True
+
+    def remove(self, question_id):
+        """Stop returning a question (its slot is tombstoned, not reclaimed)"""
+        with self._lock:
+            slot = self._slot_for_question.pop(question_id, None)
+            if slot is None:
+                return False
+            self._question_ids[slot] = -1
+            return True
+
+    def query(self, text, topic_slug, reading_level, threshold):
+        """
+        Return (question_id, similarity) of the most similar indexed question
+        at or above threshold, or None.
+        """
+        signature = self.signature(question_tokens(text))
+        if signature is None:
+            return None
+
+        num_perm = self.num_perm
+        best_id, best_similarity = None, threshold
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature, topic_slug, reading_level):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+                if isinstance(bucket, int):
+                    candidates.add(bucket)
+                else:
+                    candidates.update(bucket)
+
+            for slot in candidates:
+                question_id = self._question_ids[slot]
+                if question_id < 0:
+                    continue
+                start = slot * num_perm
+                stored = self._signatures[start : start + num_perm]
+                similarity = (
+                    sum(1 for x, y in zip(signature, stored) if x == y) / num_perm
+                )
+                if similarity >= best_similarity and (
+                    best_id is None or similarity > best_similarity
+                ):
+                    best_id, best_similarity = question_id, similarity
+
+        if best_id is None:
+            return None
+        return best_id, best_similarity
+
+    def save(self, path):
+        """Write a snapshot that another process can load()"""
+        with self._lock:
+            state = {
+                "format": SNAPSHOT_FORMAT,
+                "params": (self.num_perm, self.bands, self.max_bucket_size),
+                "question_ids": self._question_ids,
+                "signatures": self._signatures,
+                "slots": self._slot_for_question,
+                "buckets": self._buckets,
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported similar-question snapshot: {path}")
+        num_perm, bands, max_bucket_size = state["params"]
+        index = cls(num_perm=num_perm, bands=bands, max_bucket_size=max_bucket_size)
+        index._question_ids = state["question_ids"]
+        index._signatures = state["signatures"]
+        index._slot_for_question = state["slots"]
+        index._buckets = state["buckets"]
+        return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_similar_question_index():
+    """
+    Return the process-wide index, loading the snapshot written by the
+    rebuild_similar_questions command on first use (or starting empty).
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _load_snapshot()
+    return _index
+
+
+def reset_similar_question_index(index=None):
+    """Replace the process-wide index (used after a rebuild and in tests)"""
+    global _index
+    with _index_lock:
+        _index = index
+
+
+def _load_snapshot():
+    path = getattr(settings, "SIMILAR_QUESTIONS_INDEX_PATH", None)
+    if path and os.path.exists(path):
+        try:
+            index = SimilarQuestionIndex.load(path)
+            logger.info(
+                "Loaded similar-question index",
+                extra={"path": str(path), "questions": len(index)},
+            )
+            return index
+        except Exception as e:
+            logger.warning(
+                "Could not load similar-question index",
+                extra={"path": str(path), "error": str(e)},
+            )
+    return SimilarQuestionIndex()
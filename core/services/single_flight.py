@@ -0,0 +1,227 @@
+"""Single-flight coalescing: concurrent identical calls share one execution."""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "single_flight"
+
+
+class _Flight:
+    """One in-process execution that duplicate callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run fn once per key while other callers with the same key wait for it.
+
+    Within a process the first caller (the leader) runs fn and duplicates
+    block on its result, or re-raise its error. Across workers the leader
+    also takes a short cache lock and publishes its result in the cache for
+    SINGLE_FLIGHT_RESULT_TTL seconds. Leaders in other workers that find
+    the lock taken poll for that result instead of calling fn. If the
+    owning worker fails or takes longer than SINGLE_FLIGHT_WAIT_SECONDS,
+    they call fn themselves. The published result is only read by waiters,
+    so it is never a second, stale answer cache.
+
+    If the leader is interrupted without an error to share (a cancelled
+    task, KeyboardInterrupt), waiters start over rather than wait it out.
+
+    Results must be picklable and not None. Each call returns
+    (result, shared).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._async_flights = {}
+        self.calls = 0
+        self.saved_in_process = 0
+        self.saved_across_workers = 0
+
+    @property
+    def wait_seconds(self):
+        return getattr(settings, "SINGLE_FLIGHT_WAIT_SECONDS", 25.0)
+
+    @property
+    def result_ttl(self):
+        return getattr(settings, "SINGLE_FLIGHT_RESULT_TTL", 10)
+
+    def _cache_key(self, kind, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f"{KEY_PREFIX}:{self.name}:{kind}:{digest}"
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(self.wait_seconds):
+                raise TimeoutError(f"Timed out waiting for in-flight call {key!r}")
+            if flight.error is not None:
+                raise flight.error
+            if flight.result is None:
+                # The leader was interrupted by a BaseException; start over
+                return self.do(key, fn)
+            self._count("saved_in_process")
+            return flight.result, True
+
+        try:
+            flight.result, shared = self._do_across_workers(key, fn)
+            return flight.result, shared
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _do_across_workers(self, key, fn):
+        lock_key = self._cache_key("lock", key)
+        result_key = self._cache_key("result", key)
+
+        if not cache.add(lock_key, 1, self.wait_seconds):
+            result = self._wait_for_result(lock_key, result_key)
+            if result is not None:
+                self._count("saved_across_workers")
+                return result, True
+            logger.warning(
+                "In-flight call in another worker failed or timed out",
+                extra={"single_flight": self.name},
+            )
+            lock_key = None
+
+        self._count("calls")
+        try:
+            result = fn()
+            cache.set(result_key, result, self.result_ttl)
+            return result, False
+        finally:
+            if lock_key is not None:
+                cache.delete(lock_key)
+
+    def _wait_for_result(self, lock_key, result_key):
+        """Poll for another worker's result; None if it gave up or timed out"""
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.05
+        while time.monotonic() < deadline:
+            result = cache.get(result_key)
+            if result is not None:
+                return result
+            if cache.get(lock_key) is None:
+                return cache.get(result_key)  # finished (or failed) just now
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        return None
+
+    async def ado(self, key, afn):
+        """Async version of do() for coroutine functions"""
+        loop = asyncio.get_running_loop()
+        flight = self._async_flights.get((loop, key))
+        if flight is not None:
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(flight), self.wait_seconds
+                )
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                return await self.ado(key, afn)
+            self._count("saved_in_process")
+            return result, True
+
+        flight = self._async_flights[(loop, key)] = loop.create_future()
+        try:
+            result, shared = await self._ado_across_workers(key, afn)
+            flight.set_result(result)
+            return result, shared
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            # Still pending if the leader was cancelled (e.g. the client went
+            # away); waiters then run afn themselves instead of timing out
+            if not flight.done():
+                flight.cancel()
+            del self._async_flights[(loop, key)]
+
+    async def _ado_across_workers(self, key, afn):
+        lock_key = self._cache_key("lock", key)
+        result_key = self._cache_key("result", key)
+
+        if not await cache.aadd(lock_key, 1, self.wait_seconds):
+            result = await self._await_result(lock_key, result_key)
+            if result is not None:
+                self._count("saved_across_workers")
+                return result, True
+            logger.warning(
+                "In-flight call in another worker failed or timed out",
+                extra={"single_flight": self.name},
+            )
+            lock_key = None
+
+        self._count("calls")
+        try:
+            result = await afn()
+            await cache.aset(result_key, result, self.result_ttl)
+            return result, False
+        finally:
+            if lock_key is not None:
+                await cache.adelete(lock_key)
+
+    async def _await_result(self, lock_key, result_key):
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.05
+        while time.monotonic() < deadline:
+            result = await cache.aget(result_key)
+            if result is not None:
+                return result
+            if await cache.aget(lock_key) is None:
+                return await cache.aget(result_key)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        return None
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.saved_in_process = self.saved_across_workers = 0
+
+    def stats(self):
+        with self._lock:
+            calls = self.calls
+            saved = self.saved_in_process + self.saved_across_workers
+            return {
+                "calls": calls,
+                "calls_saved": saved,
+                "calls_saved_in_process": self.saved_in_process,
+                "calls_saved_across_workers": self.saved_across_workers,
+                "coalesce_rate": (
+                    round(saved / (calls + saved), 4) if calls + saved else 0.0
+                ),
+            }
+
+
+# Claude calls for questions that share an answer cache key
+question_flights = SingleFlight("questions")
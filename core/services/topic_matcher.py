@@ -0,0 +1,216 @@
+"""Compiled multi-keyword topic matcher used by QuestionService.detect_topic."""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Keyword vocabulary per topic slug. Order matters: it breaks score ties so
+# detection stays deterministic for questions that hit several topics equally.
+TOPIC_KEYWORDS = {
+    "animals": [
+        "animal",
+        "dog",
+        "cat",
+        "lion",
+        "tiger",
+        "bird",
+        "fish",
+        "pet",
+        "zoo",
+        "wild",
+    ],
+    "space": [
+        "space",
+        "planet",
+        "star",
+        "moon",
+        "sun",
+        "astronaut",
+        "rocket",
+        "galaxy",
+        "mars",
+    ],
+    "how-things-work": [
+        "work",
+        "how does",
+        "why does",
+        "machine",
+        "engine",
+        "computer",
+        "phone",
+    ],
+    "weather": [
+        "weather",
+        "rain",
+        "snow",
+        "storm",
+        "wind",
+        "cloud",
+        "thunder",
+        "lightning",
+        "season",
+    ],
+    "science": [
+        "science",
+        "experiment",
+        "chemical",
+        "reaction",
+        "physics",
+        "chemistry",
+    ],
+    "history": [
+        "history",
+        "ancient",
+        "war",
+        "president",
+        "king",
+        "queen",
+        "civilization",
+    ],
+    "ocean": [
+        "ocean",
+        "sea",
+        "whale",
+        "shark",
+        "dolphin",
+        "coral",
+        "beach",
+        "marine",
+    ],
+    "human-body": [
+        "body",
+        "heart",
+        "brain",
+        "muscle",
+        "bone",
+        "blood",
+        "health",
+        "sick",
+    ],
+}
+
+# Inflections accepted after a keyword so "lions", "cloudy" and "bodies"
+# still match while "education" no longer matches "cat".
+KEYWORD_SUFFIXES = ["es", "s", "ing", "ed", "er", "ers", "y", "ier", "iest", "ness"]
+
+# Most keyword forms counted in one word ("thunderstorm" is two). Longer
+# runs of forms are no real word and are skipped, which also keeps the
+# backtracking split of a word short whatever the length of the input.
+MAX_FORMS_PER_WORD = 4
+
+# Consonant-vowel-consonant endings double before a vowel: sunny, starry
+DOUBLED_ENDING = re.compile(r"[^aeiou][aeiou][b-df-hj-np-tv-z]$")
+
+
+def word_forms(keyword):
+    """The keyword and every inflection of it the matcher accepts"""
+    forms = [keyword] + [keyword + suffix for suffix in KEYWORD_SUFFIXES]
+    if keyword.endswith("y"):
+        # body -> bodies, bodied
+        forms += [keyword[:-1] + "i" + suffix for suffix in ("es", "ed", "er")]
+    elif DOUBLED_ENDING.search(keyword):
+        forms += [
+            keyword + keyword[-1] + suffix
+            for suffix in KEYWORD_SUFFIXES
+            if suffix[0] in "aeiouy"
+        ]
+    return forms
+
+
+TopicMatch = namedtuple("TopicMatch", ["slug", "score", "keywords"])
+
+
+class TopicMatcher:
+    """
+    Match every topic keyword in a single pass over the question text.
+
+    Every accepted word form (keyword plus inflections) is compiled once into
+    a character trie and emitted as one regex anchored on word boundaries.
+    Shared prefixes are factored out, so at each word the backtracking
+    engine follows a single branch per character instead of trying every
+    keyword in turn. A word made of up to MAX_FORMS_PER_WORD keyword forms
+    ("thunderstorm", "starfish") counts each of them, as the old substring
+    matcher did.
+    """
+
+    def __init__(self, topic_keywords):
+        self._topics_for_keyword = {}
+        self._order = {}
+        for position, (slug, keywords) in enumerate(topic_keywords.items()):
+            self._order[slug] = position
+            for keyword in keywords:
+                slugs = self._topics_for_keyword.setdefault(keyword.lower(), [])
+                if slug not in slugs:
+                    slugs.append(slug)
+
+        # Accepted word form -> keyword it inflects
+        self._keyword_for_form = {}
+        for keyword in self._topics_for_keyword:
+            for form in word_forms(keyword):
+                self._keyword_for_form.setdefault(form, keyword)
+
+        trie = {}
+        for form in self._keyword_for_form:
+            node = trie
+            for char in form:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        forms = _trie_to_regex(trie)
+        self._pattern = re.compile(rf"\b(?:{forms}){{1,{MAX_FORMS_PER_WORD}}}\b")
+        # Split a matched word into forms; the lookahead backtracks so
+        # "seastar" is sea + star rather than seas + (nothing)
+        self._form_pattern = re.compile(rf"(?:{forms})(?=(?:{forms})*$)")
+
+    def match(self, text):
+        """
+        Return a TopicMatch for every topic hit in text, best score first.
+
+        The score is the number of keyword occurrences for the topic; ties keep
+        the declaration order of the keyword table.
+        """
+        found_forms = [
+            form
+            for word in self._pattern.findall(text.lower())
+            for form in self._form_pattern.findall(word)
+        ]
+        if not found_forms:
+            return []
+
+        hits = {}
+        for form in found_forms:
+            keyword = self._keyword_for_form.get(form)
+            if keyword is None:
+                # Phrase keyword matched with irregular whitespace
+                keyword = self._keyword_for_form[" ".join(form.split())]
+            for slug in self._topics_for_keyword[keyword]:
+                hits.setdefault(slug, []).append(keyword)
+
+        matches = [
+            TopicMatch(slug, len(keywords), tuple(keywords))
+            for slug, keywords in hits.items()
+        ]
+        if len(matches) > 1:
+            matches.sort(key=lambda m: (-m.score, self._order[m.slug]))
+        return matches
+
+
+def _trie_to_regex(node):
+    """Render a character trie as a regex with shared prefixes factored out."""
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if "" in node:
+        # A form ends here but longer forms continue; prefer the longer one
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+@lru_cache(maxsize=1)
+def get_topic_matcher():
+    """Build the process-wide matcher on first use."""
+    return TopicMatcher(TOPIC_KEYWORDS)
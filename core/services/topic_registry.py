@@ -0,0 +1,128 @@
+"""Process-local registry of active topics so the ask path never queries them."""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from core.models import TopicCategory
+
+from .cache_versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = "topics"
+
+_Snapshot = namedtuple("_Snapshot", ["version", "by_slug", "by_id", "ordered"])
+
+
+class TopicRegistry:
+    """
+    In-memory copy of every active TopicCategory, indexed by slug and id.
+
+    The snapshot is tagged with the shared "topics" version token. Committing
+    a topic save or delete bumps the token (see core.signals), and each process
+    re-reads the token at most every TOPIC_REGISTRY_REFRESH_SECONDS, so all
+    workers drop a stale copy within that bound. The process that made the
+    change drops its copy immediately.
+    """
+
+    def __init__(self, refresh_interval=None):
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+
+    @property
+    def refresh_interval(self):
+        if self._refresh_interval is not None:
+            return self._refresh_interval
+        return getattr(settings, "TOPIC_REGISTRY_REFRESH_SECONDS", 5)
+
+    @property
+    def version(self):
+        """Version token of the topics currently held in memory"""
+        return self._current().version
+
+    def get(self, slug):
+        """Return the active topic with this slug, or None"""
+        return self._current().by_slug.get(slug)
+
+    def get_by_id(self, topic_id):
+        """Return the active topic with this id, or None"""
+        return self._current().by_id.get(topic_id)
+
+    def all(self):
+        """Return every active topic ordered by name"""
+        return list(self._current().ordered)
+
+    def for_ids(self, topic_ids):
+        """Return the active topics among topic_ids, ordered by name"""
+        topic_ids = set(topic_ids)
+        return [topic for topic in self._current().ordered if topic.id in topic_ids]
+
+    async def aensure_fresh(self):
+        """
+        Refresh a stale snapshot from async code.
+
+        Lookups are plain memory reads, but a refresh may query the cache and
+        database, which async code must not do synchronously. Awaiting this
+        first makes the following get()/for_ids() calls safe on the event loop.
+        """
+        if (
+            self._snapshot is None
+            or time.monotonic() - self._checked_at >= self.refresh_interval
+        ):
+            await sync_to_async(self._current)()
+
+    def invalidate(self):
+        """Drop this process's copy; the next access reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+    def notify_changed(self):
+        """Invalidate the registry in this process and, via the cache, in all others"""
+        bump_version(VERSION_NAME)
+        self.invalidate()
+
+    def warm(self):
+        """Load topics ahead of the first request (e.g. at worker startup)"""
+        try:
+            self._current()
+        except DatabaseError as e:
+            logger.warning("Could not preload topic registry", extra={"error": str(e)})
+        finally:
+            # Never hand a pre-fork connection to worker processes
+            connections.close_all()
+
+    def _current(self):
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < self.refresh_interval:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            version = get_version(VERSION_NAME)
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._load(version)
+                self._snapshot = snapshot
+            self._checked_at = now
+            return snapshot
+
+    def _load(self, version):
+        ordered = tuple(TopicCategory.objects.filter(is_active=True).order_by("name"))
+        logger.info("Loaded topic registry", extra={"topic_count": len(ordered)})
+        return _Snapshot(
+            version=version,
+            by_slug={topic.slug: topic for topic in ordered},
+            by_id={topic.id: topic for topic in ordered},
+            ordered=ordered,
+        )
+
+
+topic_registry = TopicRegistry()
@@ -0,0 +1,70 @@
+"""Model signal handlers that keep caches and counters consistent."""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.models import Child, ChildTopicAccess, Question, TopicCategory
+from core.services.blocked_questions import (
+    question_deleted,
+    question_deleting,
+    question_saved,
+)
+from core.services.child_topics import invalidate_allowed_topics
+from core.services.etags import child_questions_changed, children_changed
+from core.services.prompts import invalidate_prompts
+from core.services.topic_registry import topic_registry
+
+
+@receiver(post_save, sender=TopicCategory)
+@receiver(post_delete, sender=TopicCategory)
+def invalidate_topic_registry(sender, **kwargs):
+    """Any topic change makes every worker's registry stale"""
+    # The writer sees its own change at once, but other workers only get the
+    # new token after commit; bumping it earlier lets them cache the
+    # pre-commit topics under it
+    topic_registry.invalidate()
+    transaction.on_commit(topic_registry.notify_changed)
+    # Prompts embed topic names and context_guidelines
+    invalidate_prompts()
+
+
+@receiver(post_save, sender=ChildTopicAccess)
+@receiver(post_delete, sender=ChildTopicAccess)
+def invalidate_child_allowed_topics(sender, instance, **kwargs):
+    """Granting or revoking a topic changes the child's boundary check"""
+    # Again after commit, in case a concurrent request re-cached the old set
+    invalidate_allowed_topics(instance.child_id)
+    transaction.on_commit(partial(invalidate_allowed_topics, instance.child_id))
+    children_changed()  # enabled_topics is part of the child representation
+
+
+@receiver(post_save, sender=Child)
+@receiver(post_delete, sender=Child)
+def invalidate_children_etags(sender, **kwargs):
+    children_changed()
+
+
+@receiver(post_save, sender=Question)
+def count_blocked_question(sender, instance, created, **kwargs):
+    """New blocked questions bump their family's unreviewed count"""
+    question_saved(instance, created)
+
+
+@receiver(pre_delete, sender=Question)
+def lock_deleted_blocked_question(sender, instance, **kwargs):
+    question_deleting(instance)
+
+
+@receiver(post_delete, sender=Question)
+def uncount_blocked_question(sender, instance, **kwargs):
+    """Deleting an unreviewed blocked question (API, admin or cascade) uncounts it"""
+    question_deleted(instance)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_child_questions_etags(sender, instance, **kwargs):
+    child_questions_changed([instance.child_id])
@@ -1,12 +1,58 @@
 # Import all test classes for easy discovery
+from .test_answer_queue import AnswerQueueConcurrencyTests, AnswerQueueTests
+from .test_anthropic_client import AnthropicClientHealthTests, AnthropicClientTests
+from .test_async_ask import AsyncAskTests
 from .test_auth import AuthenticationAPITests
+from .test_blocked_questions import BlockedQuestionsTests
+from .test_circuit_breaker import CircuitBreakerTests
+from .test_conditional_get import ConditionalGetTests
+from .test_export import QuestionExportTests
+from .test_fake_anthropic_server import FakeAnthropicServerTests
+from .test_llm_stats import LLMStatsTests
 from .test_models import ModelTests
-from .test_services import QuestionServiceTests
+from .test_renderers import ColumnarRendererTests, MessagePackTests, ORJSONRendererTests
+from .test_search import QuestionSearchTests
+from .test_services import (
+    AnswerCacheTests,
+    PromptTests,
+    QuestionServiceTests,
+    SimilarQuestionTests,
+    TopicMatcherTests,
+    TopicRegistryTests,
+)
+from .test_single_flight import SingleFlightTests
+from .test_sparse_fields import SparseFieldsTests
+from .test_streaming import AskStreamTests
+from .test_values_rows import ValuesRowsTests
 from .test_views import APIEndpointTests
 
 __all__ = [
     "ModelTests",
     "QuestionServiceTests",
+    "AnswerCacheTests",
+    "SimilarQuestionTests",
+    "TopicMatcherTests",
+    "TopicRegistryTests",
+    "PromptTests",
+    "AnswerQueueTests",
+    "AnswerQueueConcurrencyTests",
+    "AskStreamTests",
+    "AnthropicClientHealthTests",
+    "AnthropicClientTests",
+    "AsyncAskTests",
+    "CircuitBreakerTests",
+    "SingleFlightTests",
+    "LLMStatsTests",
+    "FakeAnthropicServerTests",
+    "QuestionExportTests",
+    "QuestionSearchTests",
+    "BlockedQuestionsTests",
+    "ConditionalGetTests",
+    "SparseFieldsTests",
+    "ValuesRowsTests",
+    "ORJSONRendererTests",
+    "ColumnarRendererTests",
+    "MessagePackTests",
     "AuthenticationAPITests",
     "APIEndpointTests",
 ]
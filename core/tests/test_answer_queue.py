@@ -0,0 +1,279 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+from core.services.answer_queue import AnswerWorker, claim_questions
+from core.services.fake_llm import FakeAnthropic, FakeLLMError
+from core.services.question_service import FALLBACK_ANSWER
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+
+
+class AnswerQueueTests(TestCase):
+    """Tests for async asks and the answer workers"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=self.family, name="Emma", age=7, reading_level="beginner"
+        )
+        self.animals_topic = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+            context_guidelines="Focus on fun facts",
+        )
+        ChildTopicAccess.objects.create(child=self.child, topic=self.animals_topic)
+
+    def tearDown(self):
+        # Don't leave anonymous throttle history behind for later tests
+        cache.clear()
+
+    def ask_async(self, text="Why do lions roar?"):
+        return self.client.post(
+            "/api/questions/ask/",
+            {"child_id": self.child.id, "question": text, "mode": "async"},
+            format="json",
+        )
+
+    def make_worker(self, client, **kwargs):
+        kwargs.setdefault("retry_backoff", 0)
+        return AnswerWorker(QuestionService(client=client), **kwargs)
+
+    def test_async_ask_returns_202_pending(self):
+        """An async ask queues the question without calling Claude"""
+        response = self.ask_async()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["question"]["status"], Question.STATUS_PENDING)
+        question = Question.objects.get(pk=response.data["question"]["id"])
+        self.assertIsNone(question.answer)
+        self.assertIsNotNone(question.available_at)
+
+    def test_async_ask_outside_boundaries_is_not_queued(self):
+        """Denials are answered immediately even in async mode"""
+        response = self.ask_async("What is a volcano?")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.data["within_boundaries"])
+        self.assertEqual(response.data["question"]["status"], Question.STATUS_ANSWERED)
+
+    def test_worker_answers_queued_question(self):
+        """A worker claims the question and saves Claude's answer"""
+        question_id = self.ask_async().data["question"]["id"]
+        llm = FakeAnthropic(answer="Lions roar to talk to their pride.")
+
+        self.assertEqual(self.make_worker(llm).run_once(), 1)
+
+        question = Question.objects.get(pk=question_id)
+        self.assertEqual(question.status, Question.STATUS_ANSWERED)
+        self.assertEqual(question.answer, "Lions roar to talk to their pride.")
+        self.assertEqual(question.attempts, 1)
+        self.assertIsNone(question.available_at)
+        self.assertEqual(len(llm.calls), 1)
+
+    def test_failed_attempt_is_retried_later(self):
+        """A failed call puts the question back as pending with a backoff"""
+        question_id = self.ask_async().data["question"]["id"]
+        worker = self.make_worker(FakeAnthropic(failures=1), retry_backoff=60)
+
+        worker.run_once()
+
+        question = Question.objects.get(pk=question_id)
+        self.assertEqual(question.status, Question.STATUS_PENDING)
+        self.assertEqual(question.attempts, 1)
+        self.assertIn("Injected failure", question.last_error)
+        self.assertEqual(worker.run_once(), 0)
+
+    def test_retry_succeeds(self):
+        """After a transient failure the next attempt answers the question"""
+        question_id = self.ask_async().data["question"]["id"]
+        worker = self.make_worker(FakeAnthropic(failures=1))
+
+        worker.run_once()
+        worker.run_once()
+
+        question = Question.objects.get(pk=question_id)
+        self.assertEqual(question.status, Question.STATUS_ANSWERED)
+        self.assertEqual(question.attempts, 2)
+
+    def test_gives_up_after_max_attempts(self):
+        """Exhausting the attempts saves the friendly fallback"""
+        question_id = self.ask_async().data["question"]["id"]
+        llm = FakeAnthropic(failures=10, error=FakeLLMError("overloaded"))
+        worker = self.make_worker(llm, max_attempts=3)
+
+        while worker.run_once():
+            pass
+
+        question = Question.objects.get(pk=question_id)
+        self.assertEqual(question.status, Question.STATUS_FAILED)
+        self.assertEqual(question.answer, FALLBACK_ANSWER)
+        self.assertEqual(question.attempts, 3)
+        self.assertEqual(question.last_error, "overloaded")
+        self.assertEqual(len(llm.calls), 3)
+
+    def test_expired_lease_is_reclaimed(self):
+        """A question whose worker died is picked up again"""
+        question_id = self.ask_async().data["question"]["id"]
+
+        self.assertEqual(len(claim_questions(visibility_timeout=60)), 1)
+        self.assertEqual(claim_questions(visibility_timeout=60), [])
+
+        Question.objects.filter(pk=question_id).update(
+            available_at=timezone.now() - timedelta(seconds=1)
+        )
+        reclaimed = claim_questions(visibility_timeout=60)
+        self.assertEqual([q.id for q in reclaimed], [question_id])
+        self.assertEqual(reclaimed[0].attempts, 2)
+
+    def test_stale_worker_does_not_overwrite_reclaimed_question(self):
+        """A worker whose lease expired drops its answer instead of saving it"""
+        question_id = self.ask_async().data["question"]["id"]
+        [stale] = claim_questions(visibility_timeout=60)
+
+        Question.objects.filter(pk=question_id).update(
+            available_at=timezone.now() - timedelta(seconds=1)
+        )
+        [current] = claim_questions(visibility_timeout=60)
+        available_at = current.available_at
+
+        self.make_worker(FakeAnthropic()).answer(stale)
+
+        question = Question.objects.get(pk=question_id)
+        self.assertEqual(question.status, Question.STATUS_PROCESSING)
+        self.assertEqual(question.attempts, 2)
+        self.assertEqual(question.available_at, available_at)
+        self.assertIsNone(question.answer)
+
+    def test_run_answer_workers_once(self):
+        """The management command drains the ready questions and exits"""
+        self.ask_async()
+        self.ask_async("How do fish breathe?")
+        out = StringIO()
+
+        with patch(
+            "core.services.question_service.get_anthropic_client",
+            return_value=FakeAnthropic(),
+        ):
+            call_command("run_answer_workers", "--once", stdout=out)
+
+        self.assertIn("Processed 2 questions", out.getvalue())
+        self.assertFalse(
+            Question.objects.filter(status__in=Question.QUEUED_STATUSES).exists()
+        )
+
+    def test_wait_returns_answered_question(self):
+        """Long-polling an answered question returns it immediately"""
+        question_id = self.ask_async().data["question"]["id"]
+        self.make_worker(FakeAnthropic(answer="Because.")).run_once()
+
+        response = self.client.get(f"/api/questions/{question_id}/wait/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], Question.STATUS_ANSWERED)
+        self.assertEqual(response.data["answer"], "Because.")
+
+    def test_wait_times_out_while_pending(self):
+        """Long-polling a queued question returns 202 after the timeout"""
+        question_id = self.ask_async().data["question"]["id"]
+
+        response = self.client.get(f"/api/questions/{question_id}/wait/?timeout=0")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], Question.STATUS_PENDING)
+
+    def test_wait_rejects_non_finite_timeout(self):
+        """nan and inf parse as floats but must not disable the wait cap"""
+        question_id = self.ask_async().data["question"]["id"]
+
+        for value in ("nan", "inf", "soon"):
+            response = self.client.get(
+                f"/api/questions/{question_id}/wait/?timeout={value}"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(
+                response.data["error"]["message"], "timeout: Must be a finite number."
+            )
+
+    @override_settings(QUESTION_WAIT_SYNC_MAX_SECONDS=0)
+    def test_wsgi_wait_uses_the_lower_cap(self):
+        """A WSGI wait holds a worker thread, so it is capped separately"""
+        question_id = self.ask_async().data["question"]["id"]
+
+        with patch("core.views.questions.time.sleep") as sleep:
+            response = self.client.get(f"/api/questions/{question_id}/wait/?timeout=30")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        sleep.assert_not_called()
+
+
+class AnswerQueueConcurrencyTests(TransactionTestCase):
+    """Concurrent workers must never claim the same question"""
+
+    def setUp(self):
+        family = Family.objects.create(name="Test Family")
+        child = Child.objects.create(
+            family=family, name="Emma", age=7, reading_level="beginner"
+        )
+        now = timezone.now()
+        Question.objects.bulk_create(
+            Question(
+                child=child,
+                text=f"Question {i}",
+                was_within_boundaries=True,
+                status=Question.STATUS_PENDING,
+                available_at=now,
+            )
+            for i in range(40)
+        )
+
+    def test_skip_locked_claims_are_disjoint(self):
+        if not connection.features.has_select_for_update_skip_locked:
+            self.skipTest("Database does not support SKIP LOCKED")
+
+        claimed = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(4)
+
+        def claim():
+            try:
+                barrier.wait()
+                while True:
+                    batch = claim_questions(limit=3)
+                    if not batch:
+                        break
+                    with lock:
+                        claimed.extend(q.id for q in batch)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=claim) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(claimed), 40)
+        self.assertEqual(len(set(claimed)), 40)
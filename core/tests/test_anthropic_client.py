@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import anthropic
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.services import QuestionService, anthropic_client
+from core.services.anthropic_client import (
+    connection_stats,
+    get_anthropic_client,
+    reset_anthropic_clients,
+)
+
+
+class StubMessagesHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/messages with a canned message over keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        delay = self.server.delay
+        if delay:
+            time.sleep(delay)
+        body = json.dumps(
+            {
+                "id": "msg_stub",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-stub",
+                "content": [{"type": "text", "text": "Stub answer"}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 10, "output_tokens": 2},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    delay = 0
+
+    def handle_error(self, request, client_address):
+        pass  # clients that time out hang up mid-response
+
+
+class StubServerMixin:
+    """Points the shared Anthropic client at a local stub server"""
+
+    def setUp(self):
+        self.server = StubServer(("127.0.0.1", 0), StubMessagesHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        settings = override_settings(
+            ANTHROPIC_BASE_URL=f"http://127.0.0.1:{self.server.server_port}",
+            ANTHROPIC_MAX_RETRIES=0,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        reset_anthropic_clients()
+        connection_stats.reset()
+        self.addCleanup(reset_anthropic_clients)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def ask(self, client):
+        return client.messages.create(
+            model="claude-stub",
+            max_tokens=10,
+            messages=[{"role": "user", "content": "Why is the sky blue?"}],
+        )
+
+
+class AnthropicClientTests(StubServerMixin, SimpleTestCase):
+    """Tests for the shared Anthropic client, against a local stub server"""
+
+    def test_client_is_shared(self):
+        """Every caller in the process gets the same client"""
+        self.assertIs(get_anthropic_client(), get_anthropic_client())
+        self.assertIs(QuestionService().client, get_anthropic_client())
+
+    def test_connections_are_reused(self):
+        """Sequential calls share one keep-alive connection"""
+        client = get_anthropic_client()
+        for _ in range(5):
+            self.assertEqual(self.ask(client).content[0].text, "Stub answer")
+
+        stats = connection_stats.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connection_reuse_rate"], 0.8)
+
+    def test_pool_size_limits_connections(self):
+        """Concurrent calls never open more than ANTHROPIC_MAX_CONNECTIONS"""
+        self.server.delay = 0.05
+        with self.settings(ANTHROPIC_MAX_CONNECTIONS=2):
+            client = get_anthropic_client()
+            threads = [
+                threading.Thread(target=self.ask, args=(client,)) for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(connection_stats.stats()["requests"], 6)
+        self.assertLessEqual(connection_stats.stats()["connections_opened"], 2)
+
+    def test_timeout_applies_per_call(self):
+        """A call slower than ANTHROPIC_TIMEOUT fails instead of hanging"""
+        self.server.delay = 0.5
+        with self.settings(ANTHROPIC_TIMEOUT=0.1):
+            with self.assertRaises(anthropic.APITimeoutError):
+                self.ask(get_anthropic_client())
+
+    def test_forked_process_builds_its_own_client(self):
+        """A new pid (e.g. a gunicorn worker after --preload) gets a new client"""
+        parent_client = get_anthropic_client()
+        with patch.object(anthropic_client.os, "getpid", return_value=-1):
+            child_client = get_anthropic_client()
+        self.assertIsNot(child_client, parent_client)
+
+
+class AnthropicClientHealthTests(StubServerMixin, TestCase):
+    """The health endpoint checks the database, so it needs a TestCase"""
+
+    def test_health_reports_connection_stats(self):
+        """The health endpoint exposes the reuse counters"""
+        self.ask(get_anthropic_client())
+        response = self.client.get("/api/health/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["anthropic_client"]["requests"], 1)
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+
+from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
+from core.services.answer_cache import answer_cache
+from core.services.fake_llm import FakeAsyncAnthropic
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+
+
+class AsyncAskTests(TestCase):
+    """Tests for the native async ask view served under ASGI"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        self.family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=self.family, name="Emma", age=7, reading_level="beginner"
+        )
+        self.animals = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+            context_guidelines="Focus on fun facts",
+        )
+        ChildTopicAccess.objects.create(child=self.child, topic=self.animals)
+
+    def tearDown(self):
+        cache.clear()
+
+    async def ask(self, question, child_id=None, **extra):
+        return await AsyncClient().post(
+            "/api/v1/questions/ask/",
+            {"child_id": child_id or self.child.id, "question": question, **extra},
+            content_type="application/json",
+        )
+
+    async def test_answers_with_async_client(self):
+        """Allowed questions are answered by AsyncAnthropic"""
+        llm = FakeAsyncAnthropic(answer="Lions roar to talk.")
+        with patch(
+            "core.services.question_service.get_anthropic_client"
+        ) as sync_client, patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=llm,
+        ):
+            response = await self.ask("Why do lions roar?")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["within_boundaries"])
+        self.assertEqual(response.data["question"]["answer"], "Lions roar to talk.")
+        self.assertEqual(len(llm.calls), 1)
+        sync_client.return_value.messages.create.assert_not_called()
+
+        question = await Question.objects.aget(pk=response.data["question"]["id"])
+        self.assertEqual(question.status, Question.STATUS_ANSWERED)
+
+    async def test_denied_question(self):
+        """Questions outside boundaries are denied without calling Claude"""
+        llm = FakeAsyncAnthropic()
+        with patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=llm,
+        ):
+            response = await self.ask("How big is the moon?")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.data["within_boundaries"])
+        self.assertEqual(llm.calls, [])
+
+    async def test_queued_mode(self):
+        """mode=async still queues the question for the answer workers"""
+        response = await self.ask("Why do lions roar?", mode="async")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["question"]["status"], Question.STATUS_PENDING)
+
+    async def test_unknown_child(self):
+        """A missing child is a 404 through the normal exception handler"""
+        response = await self.ask("Why do lions roar?", child_id=999999)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_invalid_payload(self):
+        """Validation errors are reported like on the sync endpoint"""
+        response = await self.ask("")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_shares_per_child_rate_limit(self):
+        """The async view is throttled per child like QuestionViewSet.ask"""
+        with patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=FakeAsyncAnthropic(),
+        ):
+            statuses = [
+                (await self.ask(f"Why do lions roar {i} times?")).status_code
+                for i in range(21)
+            ]
+        self.assertEqual(statuses[-1], 429)
+
+    async def test_concurrent_questions_overlap(self):
+        """Many in-flight questions wait on Claude concurrently"""
+        children = await Child.objects.abulk_create(
+            Child(family=self.family, name=f"Kid {i}", age=8) for i in range(50)
+        )
+        await ChildTopicAccess.objects.abulk_create(
+            ChildTopicAccess(child=child, topic=self.animals) for child in children
+        )
+        llm = FakeAsyncAnthropic(latency=0.2)
+
+        started = time.monotonic()
+        with patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=llm,
+        ):
+            responses = await asyncio.gather(
+                *(
+                    self.ask(f"Why do {i} lions roar?", child_id=child.id)
+                    for i, child in enumerate(children)
+                )
+            )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual({r.status_code for r in responses}, {201})
+        self.assertEqual(len(llm.calls), 50)
+        self.assertLess(elapsed, 50 * 0.2 / 4)  # serial would take 10s
+
+    async def test_answer_cache_and_index_stay_off_the_event_loop(self):
+        """Sync cache lookups and the index loader run in a thread"""
+        index = SimilarQuestionIndex()
+        loop_checks = []
+
+        def get_index():
+            try:
+                asyncio.get_running_loop()
+                loop_checks.append("event loop")
+            except RuntimeError:
+                loop_checks.append("thread")
+            return index
+
+        llm = FakeAsyncAnthropic(answer="Lions roar to talk.")
+        with patch(
+            "core.services.question_service.get_similar_question_index", get_index
+        ), patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=llm,
+        ):
+            await self.ask("Why do lions roar?")
+            response = await self.ask("How come lions roar")
+
+        self.assertEqual(response.data["question"]["answer"], "Lions roar to talk.")
+        self.assertEqual(len(llm.calls), 1)
+        self.assertTrue(loop_checks)
+        self.assertEqual(set(loop_checks), {"thread"})
+
+    async def wait(self, question_id, timeout):
+        return await AsyncClient().get(
+            f"/api/v1/questions/{question_id}/wait/?timeout={timeout}"
+        )
+
+    async def test_wait_sleeps_on_the_event_loop(self):
+        """The ASGI wait returns once the worker answers, without time.sleep"""
+        question_id = (await self.ask("Why do lions roar?", mode="async")).data[
+            "question"
+        ]["id"]
+
+        async def answer_soon():
+            await asyncio.sleep(0.3)
+            await Question.objects.filter(pk=question_id).aupdate(
+                status=Question.STATUS_ANSWERED, answer="Lions roar to talk."
+            )
+
+        with patch(
+            "core.views.questions.time.sleep",
+            side_effect=AssertionError("blocked a thread"),
+        ):
+            response, _ = await asyncio.gather(self.wait(question_id, 5), answer_soon())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["answer"], "Lions roar to talk.")
+
+    async def test_wait_times_out_while_pending(self):
+        """The ASGI wait returns 202 once its timeout passes"""
+        question_id = (await self.ask("Why do lions roar?", mode="async")).data[
+            "question"
+        ]["id"]
+
+        response = await self.wait(question_id, 0.2)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], Question.STATUS_PENDING)
+
+    async def test_wait_unknown_question(self):
+        response = await self.wait(999999, 0)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,176 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Child, ChildTopicAccess, Family, Parent, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+
+
+class BlockedQuestionsTests(TestCase):
+    """Tests for blocked-question feeds and the unreviewed counter"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        self.family = Family.objects.create(name="Review Family")
+        Parent.objects.create(family=self.family, email="p@x.com", name="Parent")
+        self.parent = User.objects.create_user("p", email="p@x.com", password="pw")
+        animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        TopicCategory.objects.create(
+            name="Space", slug="space", description="Space", icon="🚀"
+        )
+        self.emma = Child.objects.create(family=self.family, name="Emma", age=7)
+        self.leo = Child.objects.create(family=self.family, name="Leo", age=9)
+        for child in (self.emma, self.leo):
+            ChildTopicAccess.objects.create(child=child, topic=animals)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.parent)
+        self.family_url = f"/api/v1/families/{self.family.id}/blocked-questions/"
+
+    def tearDown(self):
+        cache.clear()
+
+    def block(self, child, text="How big is the moon?"):
+        question, within = QuestionService().process_question(child, text)
+        self.assertFalse(within)
+        return question
+
+    def unreviewed_count(self):
+        self.family.refresh_from_db()
+        return self.family.unreviewed_blocked_count
+
+    def test_blocked_questions_are_counted(self):
+        """Test that only blocked questions bump the family counter"""
+        self.block(self.emma)
+        self.block(self.leo, "How hot is the sun?")
+        Question.objects.create(child=self.emma, text="Why do lions roar?")
+        self.assertEqual(self.unreviewed_count(), 2)
+
+    def test_child_feed(self):
+        """Test that the child feed lists only that child's blocked questions"""
+        first = self.block(self.emma)
+        second = self.block(self.emma, "How hot is the sun?")
+        self.block(self.leo)
+        Question.objects.create(child=self.emma, text="Why do lions roar?")
+
+        response = self.client.get(
+            f"/api/v1/children/{self.emma.id}/blocked-questions/"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [q["id"] for q in response.data["results"]], [second.id, first.id]
+        )
+
+    def test_family_feed_reads_the_counter(self):
+        """Test that the family feed reports the count without COUNT(*)"""
+        self.block(self.emma)
+        self.block(self.leo)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.family_url)
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["unreviewed_count"], 2)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in queries))
+
+    def test_review(self):
+        """Test that reviewing decrements once per question"""
+        first = self.block(self.emma)
+        self.block(self.leo)
+        url = self.family_url + "review/"
+
+        response = self.client.post(url, {"question_ids": [first.id]}, format="json")
+        self.assertEqual(response.data, {"reviewed": 1, "unreviewed_count": 1})
+        # Reviewing the same question again changes nothing
+        response = self.client.post(url, {"question_ids": [first.id]}, format="json")
+        self.assertEqual(response.data, {"reviewed": 0, "unreviewed_count": 1})
+
+        unreviewed = self.client.get(self.family_url, {"unreviewed": "1"})
+        self.assertEqual(len(unreviewed.data["results"]), 1)
+
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.data, {"reviewed": 1, "unreviewed_count": 0})
+        first.refresh_from_db()
+        self.assertIsNotNone(first.reviewed_at)
+
+    def test_review_ignores_other_families(self):
+        """Test that question ids from another family are not touched"""
+        other = Family.objects.create(name="Other")
+        theirs = self.block(Child.objects.create(family=other, name="Zoe", age=6))
+
+        response = self.client.post(
+            self.family_url + "review/", {"question_ids": [theirs.id]}, format="json"
+        )
+
+        self.assertEqual(response.data["reviewed"], 0)
+        other.refresh_from_db()
+        self.assertEqual(other.unreviewed_blocked_count, 1)
+
+    def test_only_own_family(self):
+        """Test that other parents cannot read the family feed"""
+        stranger = User.objects.create_user("s", email="s@x.com", password="pw")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.family_url).status_code, 403)
+
+    def test_delete_decrements(self):
+        """Test that deleting an unreviewed blocked question is uncounted"""
+        question = self.block(self.emma)
+        self.client.delete(f"/api/v1/questions/{question.id}/")
+        self.assertEqual(self.unreviewed_count(), 0)
+
+    def test_delete_with_stale_reviewed_at(self):
+        """Test that a delete racing a review does not uncount twice"""
+        question = self.block(self.emma)
+        self.block(self.leo)
+        stale = Question.objects.get(pk=question.pk)
+        self.client.post(self.family_url + "review/", {"question_ids": [question.id]})
+        self.assertEqual(self.unreviewed_count(), 1)
+        self.assertIsNone(stale.reviewed_at)
+
+        stale.delete()
+
+        self.assertEqual(self.unreviewed_count(), 1)
+
+    def test_admin_and_cascade_deletes_decrement(self):
+        """Test that deletes outside the API keep the counter right"""
+        question = self.block(self.emma)
+        self.block(self.leo)
+        self.block(self.leo, "How hot is the sun?")
+
+        question.delete()
+        self.assertEqual(self.unreviewed_count(), 2)
+        self.leo.delete()
+        self.assertEqual(self.unreviewed_count(), 0)
+
+    def test_delete_never_goes_below_zero(self):
+        """Test that a drifted counter is not pushed negative"""
+        question = self.block(self.emma)
+        Family.objects.update(unreviewed_blocked_count=0)
+
+        response = self.client.delete(f"/api/v1/questions/{question.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.unreviewed_count(), 0)
+
+    def test_recount(self):
+        """Test that the recount command repairs drift from bulk writes"""
+        self.block(self.emma)
+        Question.objects.bulk_create(
+            Question(child=self.leo, text="Moon?", was_within_boundaries=False)
+            for _ in range(3)
+        )
+        self.assertEqual(self.unreviewed_count(), 1)
+
+        call_command("recount_blocked_questions", stdout=io.StringIO())
+        self.assertEqual(self.unreviewed_count(), 4)
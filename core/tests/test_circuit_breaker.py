@@ -0,0 +1,249 @@
+from unittest.mock import patch
+
+import anthropic
+import httpx
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Child, Family, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+from core.services.anthropic_client import anthropic_breaker, create_message
+from core.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.services.fake_llm import FakeAnthropic, FakeAsyncAnthropic
+from core.services.question_service import FALLBACK_ANSWER
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    get_similar_question_index,
+    reset_similar_question_index,
+)
+
+
+def api_error(status, headers=None):
+    response = httpx.Response(
+        status,
+        headers=headers or {},
+        request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+    )
+    return anthropic.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+@override_settings(
+    ANTHROPIC_BREAKER_FAILURE_THRESHOLD=3,
+    ANTHROPIC_BREAKER_RECOVERY_TIMEOUT=30,
+    ANTHROPIC_RETRY_ATTEMPTS=0,
+)
+class CircuitBreakerTests(TestCase):
+    """Tests for the Claude circuit breaker, retries and fast-fail fallback"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        anthropic_breaker.reset()
+        self.family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=self.family, name="Emma", age=7, reading_level="beginner"
+        )
+        self.topic = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+        )
+
+    def tearDown(self):
+        cache.clear()
+        anthropic_breaker.reset()
+
+    def question(self, text="Why do lions roar?"):
+        return Question.objects.create(
+            child=self.child,
+            text=text,
+            detected_topic=self.topic,
+            was_within_boundaries=True,
+        )
+
+    def params(self):
+        return {
+            "model": "claude-fake",
+            "max_tokens": 10,
+            "messages": [{"role": "user", "content": "Why do lions roar?"}],
+        }
+
+    def trip(self):
+        for _ in range(3):
+            anthropic_breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and a success resets it"""
+        anthropic_breaker.record_failure()
+        anthropic_breaker.record_failure()
+        anthropic_breaker.record_success()
+        anthropic_breaker.record_failure()
+        self.assertEqual(anthropic_breaker.state, CircuitBreaker.CLOSED)
+
+        anthropic_breaker.record_failure()
+        anthropic_breaker.record_failure()
+        self.assertEqual(anthropic_breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(anthropic_breaker.allow_request())
+
+    def test_state_is_shared_between_workers(self):
+        """Test that breakers with the same name share state through the cache"""
+        other_worker = CircuitBreaker("anthropic")
+        self.trip()
+        self.assertEqual(other_worker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_lets_one_trial_call_through(self):
+        """Test that after the recovery timeout only one caller may probe"""
+        self.trip()
+        later = anthropic_breaker.retry_in() + 1
+        with patch(
+            "core.services.circuit_breaker.time.time",
+            return_value=cache.get("circuit:anthropic:opened_at") + later,
+        ):
+            self.assertEqual(anthropic_breaker.state, CircuitBreaker.HALF_OPEN)
+            self.assertTrue(anthropic_breaker.allow_request())
+            self.assertFalse(CircuitBreaker("anthropic").allow_request())
+
+            anthropic_breaker.record_success()
+            self.assertEqual(anthropic_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        """Test that a failing trial call starts a new recovery period"""
+        self.trip()
+        opened_at = cache.get("circuit:anthropic:opened_at")
+        with patch(
+            "core.services.circuit_breaker.time.time", return_value=opened_at + 31
+        ):
+            self.assertTrue(anthropic_breaker.allow_request())
+            anthropic_breaker.record_failure()
+            self.assertEqual(anthropic_breaker.state, CircuitBreaker.OPEN)
+
+    def test_open_circuit_fails_fast(self):
+        """Test that no call is made while the circuit is open"""
+        self.trip()
+        llm = FakeAnthropic(latency=5)
+        question = self.question()
+
+        answer = QuestionService(client=llm).generate_answer(question)
+
+        self.assertEqual(answer, FALLBACK_ANSWER)
+        self.assertEqual(llm.calls, [])
+        question.refresh_from_db()
+        self.assertEqual(question.status, Question.STATUS_FAILED)
+
+    def test_open_circuit_serves_looser_cached_match(self):
+        """Test that a degraded paraphrase match beats the error message"""
+        earlier = self.question("Why do big lions roar so loudly at night?")
+        earlier.answer = "Lions roar to talk to their pride."
+        earlier.save()
+        get_similar_question_index().add(
+            earlier.id, earlier.text, "animals", "beginner"
+        )
+        self.trip()
+
+        answer = QuestionService(client=FakeAnthropic()).generate_answer(
+            self.question("Why do lions roar loudly?")
+        )
+        self.assertEqual(answer, "Lions roar to talk to their pride.")
+
+    def test_queue_path_raises_circuit_open(self):
+        """Test that answer workers see the open circuit and retry later"""
+        self.trip()
+        with self.assertRaises(CircuitOpenError):
+            QuestionService(client=FakeAnthropic()).generate_answer(
+                self.question(), fallback_on_error=False
+            )
+
+    def test_failures_open_circuit(self):
+        """Test that upstream errors trip the breaker, bad requests do not"""
+        bad_request = FakeAnthropic(failures=5, error=api_error(400))
+        for _ in range(3):
+            QuestionService(client=bad_request).generate_answer(self.question())
+        self.assertEqual(anthropic_breaker.state, CircuitBreaker.CLOSED)
+
+        overloaded = FakeAnthropic(failures=5, error=api_error(529))
+        for _ in range(3):
+            QuestionService(client=overloaded).generate_answer(self.question())
+        self.assertEqual(anthropic_breaker.state, CircuitBreaker.OPEN)
+
+    @override_settings(ANTHROPIC_RETRY_ATTEMPTS=2)
+    def test_retry_honors_retry_after(self):
+        """Test that a 429 is retried after the server's Retry-After"""
+        llm = FakeAnthropic(failures=1, error=api_error(429, {"retry-after": "1.5"}))
+        with patch("core.services.anthropic_client.time.sleep") as sleep:
+            message = create_message(llm, **self.params())
+        self.assertEqual(message.content[0].text, llm.answer)
+        sleep.assert_called_once_with(1.5)
+        self.assertEqual(len(llm.calls), 2)
+
+    @override_settings(
+        ANTHROPIC_BREAKER_FAILURE_THRESHOLD=10,
+        ANTHROPIC_RETRY_ATTEMPTS=3,
+        ANTHROPIC_RETRY_BACKOFF=0.5,
+        ANTHROPIC_RETRY_MAX_DELAY=1.5,
+    )
+    def test_retry_backoff_is_jittered_and_capped(self):
+        """Test that retries without Retry-After use capped, jittered delays"""
+        llm = FakeAnthropic(failures=3, error=api_error(529))
+        with patch("core.services.anthropic_client.time.sleep") as sleep:
+            create_message(llm, **self.params())
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 3)
+        for delay, cap in zip(delays, [0.5, 1.0, 1.5]):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, cap)
+
+    @override_settings(ANTHROPIC_RETRY_ATTEMPTS=2, ANTHROPIC_CALL_DEADLINE=1)
+    def test_retry_never_outlives_deadline(self):
+        """Test that a Retry-After beyond the call deadline is not waited for"""
+        llm = FakeAnthropic(failures=1, error=api_error(429, {"retry-after": "5"}))
+        with patch("core.services.anthropic_client.time.sleep") as sleep:
+            with self.assertRaises(anthropic.APIStatusError):
+                create_message(llm, **self.params())
+        sleep.assert_not_called()
+
+    @override_settings(ANTHROPIC_TIMEOUT=30, ANTHROPIC_CALL_DEADLINE=2)
+    def test_attempt_timeout_is_capped_by_deadline(self):
+        """Test that a single attempt cannot run past the call deadline"""
+        llm = FakeAnthropic()
+        create_message(llm, **self.params())
+        self.assertLessEqual(llm.calls[0]["timeout"].read, 2)
+
+    @override_settings(ANTHROPIC_RETRY_ATTEMPTS=5)
+    def test_open_circuit_stops_retries(self):
+        """Test that retries stop as soon as the failures open the circuit"""
+        llm = FakeAnthropic(failures=5, error=api_error(529))
+        with patch("core.services.anthropic_client.time.sleep"):
+            with self.assertRaises(CircuitOpenError):
+                create_message(llm, **self.params())
+        self.assertEqual(len(llm.calls), 3)
+
+    async def test_async_open_circuit_fails_fast(self):
+        """Test that the async path fails fast too"""
+        self.trip()
+        llm = FakeAsyncAnthropic(latency=5)
+        question = await Question.objects.acreate(
+            child=self.child,
+            text="Why do lions roar?",
+            detected_topic=self.topic,
+            was_within_boundaries=True,
+        )
+        question.child = self.child
+        question.detected_topic = self.topic
+
+        answer = await QuestionService(
+            client=FakeAnthropic(), async_client=llm
+        ).agenerate_answer(question)
+        self.assertEqual(answer, FALLBACK_ANSWER)
+        self.assertEqual(llm.calls, [])
+
+    def test_health_reports_breaker_state(self):
+        """Test that the health endpoint shows the circuit state"""
+        self.trip()
+        response = self.client.get("/api/health/")
+        circuit = response.json()["anthropic_circuit"]
+        self.assertEqual(circuit["state"], "open")
+        self.assertEqual(circuit["consecutive_failures"], 3)
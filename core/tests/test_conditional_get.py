@@ -0,0 +1,201 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
+from core.services.answer_queue import claim_questions
+from core.services.blocked_questions import mark_reviewed
+
+FILE_CACHE = "django.core.cache.backends.filebased.FileBasedCache"
+
+
+class ConditionalGetTests(TestCase):
+    """Tests for ETags and 304 responses on the read endpoints"""
+
+    def setUp(self):
+        # ETags need a cache every process sees; a directory is the simplest
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.enterContext(
+            override_settings(
+                CACHES={"default": {"BACKEND": FILE_CACHE, "LOCATION": self.cache_dir}}
+            )
+        )
+        cache.clear()
+        self.animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        self.family = Family.objects.create(name="ETag Family")
+        self.emma = Child.objects.create(family=self.family, name="Emma", age=7)
+        self.leo = Child.objects.create(family=self.family, name="Leo", age=9)
+        ChildTopicAccess.objects.create(child=self.emma, topic=self.animals)
+        for n in range(3):
+            Question.objects.create(child=self.emma, text=f"Why {n}?", answer="So.")
+
+        user = User.objects.create_user("parent", password="pw")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}"
+        )
+        self.questions_url = f"/api/v1/children/{self.emma.id}/questions/"
+
+    def tearDown(self):
+        cache.clear()
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def assertNotModified(self, url, params=None, queries=0):
+        first = self.client.get(url, params)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.content, b"")
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_topics_304_without_queries(self):
+        """Test that anonymous topic revalidation never touches the database"""
+        self.client.credentials()
+        self.assertNotModified("/api/v1/topics/")
+        self.assertNotModified("/api/v1/topics/animals/")
+
+    def test_children_304_with_one_query(self):
+        """Test that only the token lookup runs for a current child ETag"""
+        self.assertNotModified("/api/v1/children/", queries=1)
+        self.assertNotModified(f"/api/v1/children/{self.emma.id}/", queries=1)
+
+    def test_child_questions_304_with_one_query(self):
+        """Test that the question feed 304 does not load the child or rows"""
+        self.assertNotModified(self.questions_url, queries=1)
+        self.assertNotModified(
+            "/api/v1/questions/", {"child_id": self.emma.id}, queries=1
+        )
+
+    def test_etag_varies_with_query(self):
+        """Test that another page or window has its own ETag"""
+        etag = self.etag(self.questions_url)
+        response = self.client.get(
+            self.questions_url, {"page_size": 1}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_weak_and_listed_etags_match(self):
+        etag = self.etag("/api/v1/topics/")
+        for header in (f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.client.get("/api/v1/topics/", HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+
+    def test_new_question_changes_only_that_child(self):
+        """Test that a question invalidates its child's feed, not others'"""
+        emma_etag = self.etag(self.questions_url)
+        leo_url = f"/api/v1/children/{self.leo.id}/questions/"
+        leo_etag = self.etag(leo_url)
+
+        Question.objects.create(child=self.emma, text="Why 4?")
+
+        self.assertModified(self.questions_url, emma_etag)
+        response = self.client.get(leo_url, HTTP_IF_NONE_MATCH=leo_etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_updates_without_signals_invalidate(self):
+        """Test that queue claims, reviews and deletes change the feed ETag"""
+        Question.objects.create(
+            child=self.emma,
+            text="Later?",
+            status=Question.STATUS_PENDING,
+            available_at=timezone.now(),
+        )
+        blocked = Question.objects.create(
+            child=self.emma, text="Moon?", was_within_boundaries=False
+        )
+        for change in (
+            lambda: claim_questions(),
+            lambda: mark_reviewed(self.family.id),
+            lambda: self.client.delete(f"/api/v1/questions/{blocked.id}/"),
+        ):
+            etag = self.etag(self.questions_url)
+            change()
+            self.assertModified(self.questions_url, etag)
+
+    def test_deletes_outside_the_api_invalidate(self):
+        """Test that model and queryset deletes (admin) change the feed ETag"""
+        question = Question.objects.create(child=self.emma, text="Why 5?")
+        for change in (
+            lambda: question.delete(),
+            lambda: Question.objects.filter(child=self.emma).delete(),
+        ):
+            etag = self.etag(self.questions_url)
+            change()
+            self.assertModified(self.questions_url, etag)
+
+    def test_child_and_topic_changes_invalidate(self):
+        """Test that renames and topic access changes reach every ETag"""
+        for url, change in (
+            (
+                "/api/v1/children/",
+                lambda: Child.objects.create(family=self.family, name="Zoe", age=5),
+            ),
+            (self.questions_url, lambda: self.emma.save()),
+            (
+                f"/api/v1/children/{self.emma.id}/",
+                lambda: ChildTopicAccess.objects.filter(child=self.emma).delete(),
+            ),
+            ("/api/v1/children/", lambda: self.animals.save()),
+        ):
+            etag = self.etag(url)
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            self.assertModified(url, etag)
+
+    def test_version_bumped_in_another_process_invalidates(self):
+        """Test that a bump from another process (e.g. the worker) is seen"""
+        etag = self.etag(self.questions_url)
+
+        subprocess.run(
+            [
+                sys.executable,
+                "manage.py",
+                "shell",
+                "-c",
+                "from core.services.etags import child_questions_changed; "
+                f"child_questions_changed([{self.emma.id}])",
+            ],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                "CACHE_BACKEND": FILE_CACHE,
+                "CACHE_LOCATION": self.cache_dir,
+            },
+            check=True,
+        )
+
+        self.assertModified(self.questions_url, etag)
+
+    def test_no_etags_with_a_process_local_cache(self):
+        """Test that LocMemCache, whose bumps other processes miss, sends none"""
+        with self.settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        ):
+            for url in ("/api/v1/topics/", self.questions_url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("ETag", response)
@@ -0,0 +1,162 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Child, Family, Parent, Question, TopicCategory
+
+
+@override_settings(QUESTION_EXPORT_CHUNK_SIZE=2)
+class QuestionExportTests(TestCase):
+    """Tests for the streaming family question export"""
+
+    def setUp(self):
+        self.family = Family.objects.create(name="Export Family")
+        Parent.objects.create(family=self.family, email="p@x.com", name="Parent")
+        self.parent = User.objects.create_user("p", email="p@x.com", password="pw")
+        animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        emma = Child.objects.create(family=self.family, name="Emma", age=7)
+        leo = Child.objects.create(family=self.family, name="Leo", age=9)
+        Question.objects.create(
+            child=emma,
+            text="Why do lions roar?",
+            detected_topic=animals,
+            answer='To talk, "loudly",\nto their pride.',
+        )
+        Question.objects.create(child=leo, text="How far is the moon?")
+        Question.objects.create(child=emma, text="Do cats dream? 🐱", answer="Yes.")
+
+        other = Family.objects.create(name="Other Family")
+        Question.objects.create(
+            child=Child.objects.create(family=other, name="Zoe", age=6),
+            text="Not ours",
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.parent)
+        self.url = f"/api/v1/families/{self.family.id}/questions/export/"
+
+    def content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_ndjson_export(self):
+        """Test that every family question is streamed as one JSON line"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn(
+            f'filename="family-{self.family.id}-questions.ndjson"',
+            response["Content-Disposition"],
+        )
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(
+            [row["text"] for row in rows],
+            ["Why do lions roar?", "How far is the moon?", "Do cats dream? 🐱"],
+        )
+        self.assertEqual(rows[0]["child_name"], "Emma")
+        self.assertEqual(rows[0]["topic"], "animals")
+        self.assertEqual(rows[0]["answer"], 'To talk, "loudly",\nto their pride.')
+        self.assertIsNone(rows[1]["answer"])
+
+    def test_csv_export(self):
+        """Test that CSV has a header and quotes commas and newlines"""
+        response = self.client.get(self.url, {"format": "csv"})
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(self.content(response).decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["answer"], 'To talk, "loudly",\nto their pride.')
+        self.assertEqual(rows[1]["child_name"], "Leo")
+
+    def test_csv_export_defuses_formulas(self):
+        """Test that text a spreadsheet would evaluate is prefixed with a quote"""
+        child = Child.objects.get(name="Leo")
+        Question.objects.create(
+            child=child, text='=HYPERLINK("http://x")', answer="-1 + 2 is 1"
+        )
+        ndjson = self.content(self.client.get(self.url)).splitlines()
+        self.assertEqual(json.loads(ndjson[-1])["text"], '=HYPERLINK("http://x")')
+
+        response = self.client.get(self.url, {"format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(self.content(response).decode())))
+        self.assertEqual(rows[-1]["text"], '\'=HYPERLINK("http://x")')
+        self.assertEqual(rows[-1]["answer"], "'-1 + 2 is 1")
+        self.assertEqual(rows[0]["text"], "Why do lions roar?")
+
+    def test_gzip_export(self):
+        """Test that ?gzip=1 sends the same export compressed"""
+        plain = self.content(self.client.get(self.url, {"format": "csv"}))
+        response = self.client.get(self.url, {"format": "csv", "gzip": "1"})
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".csv.gz", response["Content-Disposition"])
+        self.assertEqual(gzip.decompress(self.content(response)), plain)
+
+    def test_invalid_format(self):
+        """Test that unknown formats are rejected as JSON errors"""
+        response = self.client.get(self.url, {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.data["error"]["message"], "format: Must be ndjson or csv."
+        )
+
+    async def test_asgi_export_streams_async_chunks(self):
+        """Test that ASGI gets an async iterator, which Django won't buffer"""
+        token = await Token.objects.acreate(user=self.parent)
+        response = await AsyncClient().get(
+            self.url, {"format": "csv"}, headers={"Authorization": f"Token {token}"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(len(rows), 3)
+
+    def test_only_own_family(self):
+        """Test that parents cannot export other families"""
+        stranger = User.objects.create_user("s", email="s@x.com", password="pw")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+
+    def test_staff_can_export_any_family(self):
+        """Test that staff (compliance) can export any family"""
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_authenticate(staff)
+        response = self.client.get(self.url)
+        self.assertEqual(len(self.content(response).splitlines()), 3)
+
+        missing = "/api/v1/families/999999/questions/export/"
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_management_command(self):
+        """Test that the command writes the export to a (gzipped) file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.ndjson.gz")
+            call_command(
+                "export_family_questions",
+                str(self.family.id),
+                output=path,
+                stdout=io.StringIO(),
+            )
+            with gzip.open(path, "rt") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[2])["text"], "Do cats dream? 🐱")
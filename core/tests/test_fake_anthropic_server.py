@@ -0,0 +1,134 @@
+import statistics
+
+import anthropic
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from benchmarks.fake_anthropic_server import (
+    CannedAnswers,
+    FakeAnthropicServer,
+    FakeServerConfig,
+)
+from core.models import Child, ChildTopicAccess, Family, TopicCategory
+from core.services.answer_cache import answer_cache
+from core.services.anthropic_client import (
+    anthropic_breaker,
+    create_message,
+    get_anthropic_client,
+    reset_anthropic_clients,
+)
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+
+ANSWERS = CannedAnswers(
+    [("lion", "Lions roar to talk to their pride.")], default="Good question!"
+)
+
+
+class FakeAnthropicServerTests(TestCase):
+    """Tests for the fake Messages API, driven through the real SDK"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        anthropic_breaker.reset()
+
+        self.config = FakeServerConfig(answers=ANSWERS, retry_after=0.01)
+        self.server = FakeAnthropicServer(config=self.config).start()
+        self.addCleanup(self.server.stop)
+
+        settings = override_settings(
+            ANTHROPIC_BASE_URL=self.server.base_url, ANTHROPIC_MAX_RETRIES=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_anthropic_clients()
+        self.addCleanup(reset_anthropic_clients)
+
+    def tearDown(self):
+        cache.clear()
+
+    def params(self, question="Why do lions roar?"):
+        return {
+            "model": "claude-fake",
+            "max_tokens": 100,
+            "messages": [{"role": "user", "content": question}],
+        }
+
+    def test_canned_answer(self):
+        """Test that answers are picked by keyword with usage reported"""
+        client = get_anthropic_client()
+        message = client.messages.create(**self.params())
+        self.assertEqual(message.content[0].text, "Lions roar to talk to their pride.")
+        self.assertEqual(message.stop_reason, "end_turn")
+        self.assertEqual(message.usage.output_tokens, 7)
+
+        other = client.messages.create(**self.params("Why is the sky blue?"))
+        self.assertEqual(other.content[0].text, "Good question!")
+
+    def test_streaming(self):
+        """Test that the SDK can stream deltas and read the final message"""
+        self.config.token_latency = 0.001
+        with get_anthropic_client().messages.stream(**self.params()) as stream:
+            deltas = list(stream.text_stream)
+            final = stream.get_final_message()
+
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), "Lions roar to talk to their pride.")
+        self.assertEqual(final.usage.output_tokens, 7)
+
+    @override_settings(ANTHROPIC_RETRY_ATTEMPTS=1)
+    def test_injected_rate_limit_is_retried(self):
+        """Test that a 429 carries Retry-After and the retry succeeds"""
+        self.config.fail_first = 1
+        self.config.fail_status = 429
+        message = create_message(get_anthropic_client(), **self.params())
+        self.assertEqual(message.content[0].text, "Lions roar to talk to their pride.")
+        self.assertEqual(self.server.stats["errors"], 1)
+        self.assertEqual(self.server.stats["requests"], 2)
+
+    def test_injected_server_error(self):
+        """Test that error rates produce API errors of that status"""
+        self.config.error_rates = {500: 1.0}
+        with self.assertRaises(anthropic.InternalServerError):
+            get_anthropic_client().messages.create(**self.params())
+
+    @override_settings(ANTHROPIC_TIMEOUT=0.2)
+    def test_injected_timeout(self):
+        """Test that hung requests time out on the client"""
+        self.config.timeout_rate = 1.0
+        self.config.hang_seconds = 1.0
+        reset_anthropic_clients()
+        with self.assertRaises(anthropic.APITimeoutError):
+            get_anthropic_client().messages.create(**self.params())
+
+    def test_latency_distribution(self):
+        """Test that sampled latency matches the configured median and p95"""
+        config = FakeServerConfig(latency_median=0.8, latency_p95=2.0, seed=1)
+        samples = sorted(config.latency() for _ in range(4000))
+        self.assertAlmostEqual(statistics.median(samples), 0.8, delta=0.05)
+        self.assertAlmostEqual(samples[int(0.95 * len(samples))], 2.0, delta=0.15)
+
+    def test_ask_endpoint_against_fake_server(self):
+        """Test the whole ask path against the fake API"""
+        family = Family.objects.create(name="Test Family")
+        child = Child.objects.create(family=family, name="Emma", age=7)
+        topic = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        ChildTopicAccess.objects.create(child=child, topic=topic)
+
+        response = self.client.post(
+            "/api/v1/questions/ask/",
+            {"child_id": child.id, "question": "Why do lions roar?"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["question"]["answer"],
+            "Lions roar to talk to their pride.",
+        )
@@ -0,0 +1,160 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Child, Family, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+from core.services.fake_llm import FakeAnthropic
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+
+PRICING = {
+    "claude-fake": {
+        "input": 1.0,
+        "output": 2.0,
+        "cache_write": 0.0,
+        "cache_read": 0.0,
+    }
+}
+
+
+@override_settings(LLM_PRICING=PRICING)
+class LLMStatsTests(TestCase):
+    """Tests for per-question LLM accounting and /stats/llm/"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        self.family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=self.family, name="Emma", age=7, reading_level="beginner"
+        )
+        self.animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        self.space = TopicCategory.objects.create(
+            name="Space", slug="space", description="Space", icon="🚀"
+        )
+        self.admin = User.objects.create_user("admin", password="pw", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def answered(self, topic, latency_ms, input_tokens, output_tokens, **extra):
+        return Question.objects.create(
+            child=self.child,
+            text="Why?",
+            detected_topic=topic,
+            answer="Because.",
+            response_generated_at=extra.pop("at", timezone.now()),
+            llm_model=extra.pop("model", "claude-fake"),
+            llm_latency_ms=latency_ms,
+            stop_reason="end_turn",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            **extra,
+        )
+
+    def test_generation_is_recorded(self):
+        """Test that model, latency, stop reason and tokens are saved"""
+        question = Question.objects.create(
+            child=self.child,
+            text="Why do lions roar?",
+            detected_topic=self.animals,
+            was_within_boundaries=True,
+        )
+        llm = FakeAnthropic(answer="Lions roar to talk.", latency=0.05)
+        QuestionService(client=llm).generate_answer(question)
+
+        question.refresh_from_db()
+        self.assertEqual(question.llm_model, "claude-fake")
+        self.assertEqual(question.stop_reason, "end_turn")
+        self.assertGreaterEqual(question.llm_latency_ms, 50)
+        self.assertGreater(question.input_tokens, 0)
+        self.assertEqual(question.output_tokens, 4)
+
+    def test_reused_answer_has_no_usage(self):
+        """Test that cache hits do not count as LLM calls"""
+        llm = FakeAnthropic()
+        service = QuestionService(client=llm)
+        for _ in range(2):
+            service.generate_answer(
+                Question.objects.create(
+                    child=self.child,
+                    text="Why do lions roar?",
+                    detected_topic=self.animals,
+                )
+            )
+
+        self.assertEqual(len(llm.calls), 1)
+        self.assertEqual(
+            Question.objects.filter(llm_latency_ms__isnull=False).count(), 1
+        )
+
+    def test_percentiles_and_sums_per_topic(self):
+        """Test p50/p95 latency, token sums and cost grouped by topic"""
+        for latency in (100, 200, 300, 400):
+            self.answered(self.animals, latency, 1000, 500)
+        self.answered(self.space, 50, 10, 20)
+        Question.objects.create(child=self.child, text="Cached", answer="Hit")
+
+        response = self.client.get("/api/v1/stats/llm/")
+
+        self.assertEqual(response.status_code, 200)
+        animals, space = response.data["by_topic"]
+        self.assertEqual(animals["topic"], "animals")
+        self.assertEqual(animals["calls"], 4)
+        self.assertEqual(animals["latency_p50_ms"], 250.0)
+        self.assertEqual(animals["latency_p95_ms"], 385.0)
+        self.assertEqual(animals["input_tokens"], 4000)
+        self.assertEqual(animals["output_tokens"], 2000)
+        self.assertAlmostEqual(animals["estimated_cost_usd"], 0.008)
+        self.assertEqual(space["calls"], 1)
+
+    def test_sums_per_day(self):
+        """Test that results are grouped per day and limited to ?days="""
+        now = timezone.now()
+        self.answered(self.animals, 100, 10, 10, at=now)
+        self.answered(self.animals, 300, 10, 10, at=now - timedelta(days=2))
+        self.answered(self.animals, 500, 10, 10, at=now - timedelta(days=20))
+
+        by_day = self.client.get("/api/v1/stats/llm/?days=7").data["by_day"]
+
+        self.assertEqual([day["calls"] for day in by_day], [1, 1])
+        self.assertEqual(by_day[0]["day"], (now - timedelta(days=2)).date())
+
+    def test_unknown_model_has_no_cost(self):
+        """Test that models missing from LLM_PRICING report no cost"""
+        self.answered(self.animals, 100, 10, 10, model="claude-unknown")
+        topic = self.client.get("/api/v1/stats/llm/").data["by_topic"][0]
+        self.assertIsNone(topic["estimated_cost_usd"])
+
+    def test_staff_only(self):
+        """Test that parents and anonymous users cannot read stats"""
+        parent = User.objects.create_user("parent", password="pw")
+        client = APIClient()
+        self.assertIn(client.get("/api/v1/stats/llm/").status_code, (401, 403))
+        client.force_authenticate(parent)
+        self.assertEqual(client.get("/api/v1/stats/llm/").status_code, 403)
+
+    def test_invalid_days(self):
+        """Test that ?days is validated"""
+        cases = [
+            ("abc", "days: Must be an integer."),
+            ("0", "days: Must be between 1 and 90."),
+            ("365", "days: Must be between 1 and 90."),
+        ]
+        for days, message in cases:
+            response = self.client.get(f"/api/v1/stats/llm/?days={days}")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data["error"]["message"], message)
@@ -4,14 +4,23 @@ Performance tests to verify query optimization and prevent N+1 queries.
 These tests ensure the API remains performant as data grows.
 """
 
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import connection
+from django.db.models import DurationField, F, Value
 from django.test import TestCase
 from django.test.utils import override_settings
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from core.models import Child, ChildTopicAccess, Family, Parent, Question, TopicCategory
+from core.services.child_topics import get_allowed_topics
+from core.services.topic_registry import topic_registry
 
 
 class QueryOptimizationTests(TestCase):
@@ -90,10 +99,10 @@ class QueryOptimizationTests(TestCase):
     def test_child_questions_endpoint_query_count(self):
         """Verify child questions endpoint uses select_related."""
         child = self.children[0]
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             response = self.client.get(f"/api/v1/children/{child.id}/questions/")
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(len(response.data), 5)
+            self.assertEqual(len(response.data["results"]), 5)
 
 
 class APIPerformanceTests(TestCase):
@@ -101,6 +110,8 @@ class APIPerformanceTests(TestCase):
 
     def setUp(self):
         """Create larger dataset for performance testing"""
+        cache.clear()  # anonymous throttle history from earlier tests
+
         # Create user and authentication token
         self.user = User.objects.create_user(
             username="perfuser", email="perfuser@test.com", password="testpass123"
@@ -154,6 +165,42 @@ class APIPerformanceTests(TestCase):
             self.assertEqual(len(response.data["results"]), 20)
             self.assertEqual(response.data["count"], 200)
 
+        # Cursor mode: one query per page and no COUNT, however deep the page
+        url = "/api/v1/questions/?cursor=&page_size=50"
+        seen = []
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(question["id"] for question in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(len(seen), 200)  # 4 pages
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_cursor_pagination_by_child(self):
+        """Test that cursor pages follow a child's history without gaps"""
+        child = Child.objects.first()
+        # Same created_at for all: the id tie-breaker must keep pages apart
+        Question.objects.filter(child=child).update(created_at=timezone.now())
+
+        response = self.client.get(
+            f"/api/v1/questions/?child_id={child.id}&cursor=&page_size=3"
+        )
+        ids = [question["id"] for question in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids.extend(question["id"] for question in response.data["results"])
+
+        expected = child.questions.order_by("-created_at", "-id")
+        self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is a 404, like DRF's cursor pages"""
+        response = self.client.get("/api/v1/questions/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
     def test_filtered_queries_use_indexes(self):
         """
         Test that filtering by child_id efficiently uses database indexes.
@@ -167,3 +214,183 @@ class APIPerformanceTests(TestCase):
             response = self.client.get(f"/api/v1/questions/?child_id={child.id}")
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.data["count"], 10)
+
+
+class AskEndpointQueryTests(TestCase):
+    """Test that the ask path resolves topics and boundaries from memory"""
+
+    def setUp(self):
+        family = Family.objects.create(name="Ask Family")
+        self.child = Child.objects.create(
+            family=family, name="Asker", age=8, reading_level="intermediate"
+        )
+        self.animals = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            icon="🦁",
+            description="Animals",
+            context_guidelines="Guidelines",
+        )
+        TopicCategory.objects.create(
+            name="Space",
+            slug="space",
+            icon="🚀",
+            description="Space",
+            context_guidelines="Guidelines",
+        )
+        ChildTopicAccess.objects.create(child=self.child, topic=self.animals)
+        self.client = APIClient()
+
+    def ask(self, question):
+        return self.client.post(
+            "/api/v1/questions/ask/",
+            {"child_id": self.child.id, "question": question},
+            format="json",
+        )
+
+    @patch("core.services.question_service.QuestionService.generate_answer")
+    def test_allowed_question_query_count(self, mock_generate):
+        """Allowed question: child lookup + question insert only"""
+        get_allowed_topics(self.child.id)  # warm the per-child cache
+        with self.assertNumQueries(2):
+            response = self.ask("Why do lions roar?")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["within_boundaries"])
+
+    @patch("core.services.question_service.QuestionService.generate_answer")
+    def test_denied_question_query_count(self, mock_generate):
+        """Denied question: child lookup, question insert, unreviewed count"""
+        get_allowed_topics(self.child.id)
+        with self.assertNumQueries(3):
+            response = self.ask("How big is the moon?")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.data["within_boundaries"])
+        self.assertIn("🦁 Animals", response.data["question"]["answer"])
+        mock_generate.assert_not_called()
+
+    @patch("core.services.question_service.QuestionService.generate_answer")
+    def test_cold_cache_costs_one_access_query(self, mock_generate):
+        """A cold per-child cache adds a single topic-access query"""
+        topic_registry.get("animals")  # topics themselves are already in memory
+        with self.assertNumQueries(4):
+            self.ask("How big is the moon?")
+        with self.assertNumQueries(3):
+            self.ask("How far away is the moon?")
+
+    @patch("core.services.question_service.QuestionService.generate_answer")
+    def test_enabling_topic_invalidates_cache(self, mock_generate):
+        """Granting access is reflected in the very next boundary check"""
+        self.assertFalse(self.ask("How big is the moon?").data["within_boundaries"])
+
+        user = User.objects.create_user(username="p", password="testpass123")
+        self.client.force_authenticate(user)
+        self.client.post(
+            f"/api/v1/children/{self.child.id}/topics/enable/",
+            {"topic_slug": "space"},
+            format="json",
+        )
+
+        self.assertTrue(self.ask("How big is the moon?").data["within_boundaries"])
+
+    def test_access_change_invalidates_again_on_commit(self):
+        """A set re-cached before commit is dropped once the grant commits"""
+        space = topic_registry.get("space")
+        with self.captureOnCommitCallbacks() as callbacks:
+            ChildTopicAccess.objects.create(child=self.child, topic=space)
+            get_allowed_topics(self.child.id)  # a concurrent reader re-caches
+        with self.assertNumQueries(0):
+            get_allowed_topics(self.child.id)
+
+        for callback in callbacks:
+            callback()
+        with self.assertNumQueries(1):
+            self.assertIn("space", get_allowed_topics(self.child.id).slugs)
+
+
+class ChildQuestionHistoryTests(TestCase):
+    """Test that a long child history is served in bounded pages"""
+
+    HISTORY = 20_000
+    START = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="historyuser", password="pw")
+        family = Family.objects.create(name="Chatty Family")
+        cls.child = Child.objects.create(family=family, name="Chatty", age=8)
+        Question.objects.bulk_create(
+            (
+                Question(child=cls.child, text=f"Question {i}", answer="Answer")
+                for i in range(cls.HISTORY)
+            ),
+            batch_size=2000,
+        )
+        # auto_now_add stamps every row with "now"; spread them one minute apart
+        Question.objects.update(
+            created_at=Value(cls.START)
+            + (F("id") - cls.child.questions.order_by("id").first().id)
+            * Value(timedelta(minutes=1), output_field=DurationField())
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/children/{self.child.id}/questions/"
+
+    def at(self, minutes):
+        return (self.START + timedelta(minutes=minutes)).isoformat()
+
+    def test_page_size_is_capped(self):
+        """Test that one request never returns more than the cap"""
+        response = self.client.get(self.url, {"page_size": self.HISTORY})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 100)
+        self.assertIsNotNone(response.data["next"])
+        self.assertEqual(response.data["results"][0]["text"], "Question 19999")
+
+    def test_deep_pages_cost_the_same(self):
+        """Test that a page deep in the history runs the same queries"""
+        # The child (without its topic access prefetch), then the page itself
+        with self.assertNumQueries(2) as first:
+            self.client.get(self.url)
+        response = self.client.get(self.url, {"until": self.at(50), "page_size": 20})
+        with self.assertNumQueries(2) as deep:
+            response = self.client.get(response.data["next"])
+
+        # Keyset pages: one bounded SELECT each, never a COUNT or OFFSET
+        for query in [*first.captured_queries, *deep.captured_queries]:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+        self.assertEqual(
+            [q["text"] for q in response.data["results"]],
+            [f"Question {i}" for i in range(29, 9, -1)],
+        )
+
+    def test_since_until_window(self):
+        """Test that since is inclusive and until exclusive"""
+        response = self.client.get(
+            self.url, {"since": self.at(100), "until": self.at(110)}
+        )
+        self.assertEqual(
+            [q["text"] for q in response.data["results"]],
+            [f"Question {i}" for i in range(109, 99, -1)],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_date_bounds(self):
+        """Test that plain dates are accepted as midnight"""
+        response = self.client.get(self.url, {"until": "2024-01-01"})
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(self.url, {"since": "2024-01-14"})
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_invalid_bounds(self):
+        """Test that unparseable since/until are rejected"""
+        for params in ({"since": "yesterday"}, {"until": "2024-13-01"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+            (name,) = params
+            self.assertEqual(
+                response.data["error"]["message"],
+                f"{name}: Must be an ISO 8601 date or datetime.",
+            )
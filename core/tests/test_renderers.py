@@ -0,0 +1,301 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import renderers
+from core.models import Child, Family, Question, TopicCategory
+from core.parsers import MessagePackParser, ORJSONParser
+from core.renderers import (
+    ColumnarJSONRenderer,
+    MessagePackRenderer,
+    ORJSONRenderer,
+    msgpack,
+    to_columns,
+)
+
+PAYLOAD = {
+    "aware": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+    "offset": datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=2))),
+    "naive": datetime(2024, 5, 1, 12, 30),
+    "day": date(2024, 5, 1),
+    "duration": timedelta(minutes=3),
+    "price": Decimal("0.0125"),
+    "lazy": gettext_lazy("Not found."),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "text": "Lions 🦁 roar\u2028loudly",
+    "numbers": [1, 2.5, None, True],
+    1: "int key",
+}
+
+
+class ORJSONRendererTests(TestCase):
+    """Tests for the orjson renderer and parser matching DRF's JSON output"""
+
+    def test_matches_json_renderer(self):
+        """Test datetimes, decimals, lazy strings and escaping byte for byte"""
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_indent_uses_stdlib(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4", {})
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_fallback_without_orjson(self):
+        """Test that both classes work when orjson is not installed"""
+        with mock.patch("core.renderers.orjson", None), mock.patch(
+            "core.parsers.orjson", None
+        ):
+            self.assertEqual(
+                ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD)
+            )
+            self.assertEqual(
+                ORJSONParser().parse(io.BytesIO(b'{"a": [1]}')), {"a": [1]}
+            )
+
+    def test_parser(self):
+        body = '{"question": "Why do lions roar? 🦁", "n": 1.5}'.encode()
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"question": '))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"n": NaN}'))
+
+    @skipIf(renderers.orjson is None, "orjson is not installed")
+    def test_api_uses_orjson(self):
+        """Test that API responses and request bodies go through orjson"""
+        cache.clear()
+        child = Child.objects.create(
+            family=Family.objects.create(name="JSON Family"), name="Emma", age=7
+        )
+        question = Question.objects.create(child=child, text="Why?")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("p"))
+
+        with mock.patch.object(
+            renderers.orjson, "dumps", wraps=renderers.orjson.dumps
+        ) as dumps:
+            response = client.get(f"/api/v1/questions/{question.id}/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["text"], "Why?")
+        dumps.assert_called_once()
+
+        with mock.patch.object(
+            renderers.orjson, "loads", wraps=renderers.orjson.loads
+        ) as loads:
+            client.post(
+                f"/api/v1/questions/{question.id}/mark_helpful/",
+                '{"helpful": false}',
+                content_type="application/json",
+            )
+        loads.assert_called_once()
+        question.refresh_from_db()
+        self.assertIs(question.child_marked_helpful, False)
+        cache.clear()
+
+
+def from_columns(table):
+    """Rows back from to_columns() output, as a client would decode them"""
+    columns = {
+        name: (
+            [None if i is None else table["dictionaries"][name][i] for i in values]
+            if name in table["dictionaries"]
+            else values
+        )
+        for name, values in table["columns"].items()
+    }
+    return [
+        {name: values[n] for name, values in columns.items()}
+        for n in range(table["length"])
+    ]
+
+
+class ColumnarRendererTests(TestCase):
+    """Tests for ?format=columnar list responses"""
+
+    def setUp(self):
+        cache.clear()
+        animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        self.child = Child.objects.create(
+            family=Family.objects.create(name="Columnar Family"), name="Emma", age=7
+        )
+        for n in range(6):
+            Question.objects.create(
+                child=self.child,
+                text=f"Why {n}?",
+                detected_topic=animals if n % 3 else None,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("p"))
+        self.url = f"/api/v1/children/{self.child.id}/questions/"
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_to_columns(self):
+        table = to_columns(
+            [
+                {"id": 1, "name": "Emma", "topic": "Space", "helpful": True},
+                {"id": 2, "name": "Emma", "helpful": False},
+                {"id": 3, "name": "Emma", "topic": "Space", "helpful": None},
+            ]
+        )
+        self.assertEqual(
+            table,
+            {
+                "length": 3,
+                "columns": {
+                    "id": [1, 2, 3],
+                    "name": [0, 0, 0],
+                    "topic": [0, None, 0],
+                    "helpful": [True, False, None],
+                },
+                "dictionaries": {"name": ["Emma"], "topic": ["Space"]},
+            },
+        )
+
+    def test_list_round_trips(self):
+        """Test that decoding the columns gives back the default rows"""
+        rows = self.client.get(self.url).json()["results"]
+        response = self.client.get(self.url, {"format": "columnar"})
+
+        self.assertEqual(response["Content-Type"], ColumnarJSONRenderer.media_type)
+        table = response.json()["results"]
+        self.assertEqual(table["dictionaries"]["child_name"], ["Emma"])
+        self.assertEqual(table["dictionaries"]["topic_name"], ["Animals"])
+        self.assertIn("next", response.json())
+        # Rows without a topic_name key decode to None
+        self.assertEqual(
+            from_columns(table),
+            [{**dict.fromkeys(table["columns"]), **row} for row in rows],
+        )
+
+    def test_accept_header(self):
+        response = self.client.get(
+            self.url, HTTP_ACCEPT=ColumnarJSONRenderer.media_type
+        )
+        self.assertEqual(response.json()["results"]["length"], 6)
+
+    def test_details_and_errors_stay_rows(self):
+        question = Question.objects.first()
+        response = self.client.get(
+            f"/api/v1/questions/{question.id}/", {"format": "columnar"}
+        )
+        self.assertEqual(response.json()["text"], question.text)
+
+        response = self.client.get(self.url, {"format": "columnar", "since": "x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
+
+
+@skipIf(renderers.msgpack is None, "msgpack is not installed")
+class MessagePackTests(TestCase):
+    """Tests for application/msgpack requests and responses"""
+
+    MSGPACK = "application/msgpack"
+
+    def setUp(self):
+        cache.clear()
+        self.child = Child.objects.create(
+            family=Family.objects.create(name="Msgpack Family"), name="Emma", age=7
+        )
+        self.question = Question.objects.create(
+            child=self.child, text="Why do lions roar? 🦁", answer="To talk."
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("p"))
+
+    def tearDown(self):
+        cache.clear()
+
+    def unpack(self, response):
+        self.assertEqual(response["Content-Type"], self.MSGPACK)
+        return msgpack.unpackb(response.content)
+
+    def test_round_trip_matches_json(self):
+        """Test that values decode to what the JSON renderer sends"""
+        payload = {key: value for key, value in PAYLOAD.items() if key != 1}
+        packed = MessagePackRenderer().render(payload)
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(packed)),
+            json.loads(JSONRenderer().render(payload)),
+        )
+
+    def test_list_and_detail(self):
+        for url in (
+            "/api/v1/questions/",
+            f"/api/v1/questions/{self.question.id}/",
+            f"/api/v1/children/{self.child.id}/",
+        ):
+            expected = self.client.get(url).json()
+            response = self.client.get(url, HTTP_ACCEPT=self.MSGPACK)
+            self.assertEqual(self.unpack(response), expected, url)
+
+    def test_ask_with_msgpack_body(self):
+        """Test the ask endpoint end to end (a blocked question needs no LLM)"""
+        body = msgpack.packb({"child_id": self.child.id, "question": "Moon?"})
+        response = self.client.post(
+            "/api/v1/questions/ask/",
+            body,
+            content_type=self.MSGPACK,
+            HTTP_ACCEPT=self.MSGPACK,
+        )
+
+        self.assertEqual(response.status_code, 201)
+        data = self.unpack(response)
+        self.assertFalse(data["within_boundaries"])
+        self.assertEqual(data["question"]["text"], "Moon?")
+
+    def test_error_envelope(self):
+        """Test that errors keep the standard envelope in MessagePack"""
+        response = self.client.get("/api/v1/questions/0/", HTTP_ACCEPT=self.MSGPACK)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.unpack(response)["error"]["status"], 404)
+
+        response = self.client.post(
+            "/api/v1/questions/ask/",
+            msgpack.packb({"question": ""}),
+            content_type=self.MSGPACK,
+            HTTP_ACCEPT=self.MSGPACK,
+        )
+        error = self.unpack(response)["error"]
+        self.assertEqual(error["status"], 400)
+        self.assertEqual(set(error["details"]), {"child_id", "question"})
+
+        for body in (
+            b"\xc1",  # never used in MessagePack
+            b"\x81\x80\x01",  # {{}: 1}, a map used as a map key
+            b"\x81\x90\x01",  # {[]: 1}
+        ):
+            response = self.client.post(
+                "/api/v1/questions/ask/",
+                body,
+                content_type=self.MSGPACK,
+                HTTP_ACCEPT=self.MSGPACK,
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(
+                "MessagePack parse error", self.unpack(response)["error"]["message"]
+            )
+
+    def test_format_param(self):
+        response = self.client.get("/api/v1/topics/", {"format": "msgpack"})
+        self.assertEqual(self.unpack(response)["results"], [])
@@ -0,0 +1,131 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Child, Family, Question
+
+
+class QuestionSearchTests(TestCase):
+    """Tests for full-text search over question text and answers"""
+
+    def setUp(self):
+        cache.clear()  # anonymous throttle history from earlier tests
+        family = Family.objects.create(name="Search Family")
+        self.emma = Child.objects.create(family=family, name="Emma", age=7)
+        self.leo = Child.objects.create(family=family, name="Leo", age=9)
+        self.roar = Question.objects.create(
+            child=self.emma,
+            text="Why do lions roar?",
+            answer="Lions roar to talk to their pride across the savanna.",
+        )
+        self.purr = Question.objects.create(
+            child=self.leo,
+            text="Why do cats purr?",
+            answer="Cats purr when they are happy, a bit like a tiny lion's roar.",
+        )
+        Question.objects.create(
+            child=self.emma, text="How far is the moon?", answer="Very far."
+        )
+        self.client = APIClient()
+
+    def tearDown(self):
+        cache.clear()
+
+    def search(self, q, **params):
+        response = self.client.get("/api/v1/questions/", {"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_matches_are_ranked(self):
+        """Test that a match in the question outranks one in the answer"""
+        data = self.search("roaring lions")
+
+        self.assertEqual(data["count"], 2)
+        first, second = data["results"]
+        self.assertEqual([first["id"], second["id"]], [self.roar.id, self.purr.id])
+        self.assertGreater(first["rank"], second["rank"])
+
+    def test_highlights(self):
+        """Test that matched words are wrapped in <mark>"""
+        result = self.search("cats purr")["results"][0]
+        self.assertEqual(
+            result["text_highlight"], "Why do <mark>cats</mark> <mark>purr</mark>?"
+        )
+        self.assertIn(
+            "<mark>Cats</mark> <mark>purr</mark> when", result["answer_highlight"]
+        )
+
+    def test_highlights_escape_html(self):
+        """Test that only the <mark> tags in a highlight are markup"""
+        Question.objects.create(
+            child=self.emma,
+            text="<script>alert(1)</script> Do zebras sleep?",
+            answer="<img src=x onerror=alert(1)> Zebras sleep standing up.",
+        )
+        result = self.search("zebras")["results"][0]
+        self.assertNotIn("<script", result["text_highlight"])
+        self.assertIn("Do <mark>zebras</mark> sleep?", result["text_highlight"])
+        self.assertNotIn("<img", result["answer_highlight"])
+        self.assertIn("<mark>Zebras</mark> sleep", result["answer_highlight"])
+        self.assertEqual(result["text"], "<script>alert(1)</script> Do zebras sleep?")
+
+    def test_web_search_syntax(self):
+        """Test quoted phrases and -exclusions"""
+        data = self.search("roar -cats")
+        self.assertEqual([r["id"] for r in data["results"]], [self.roar.id])
+
+        data = self.search('"tiny lion"')
+        self.assertEqual([r["id"] for r in data["results"]], [self.purr.id])
+
+    def test_cursor_is_rejected(self):
+        """Test that keyset pages, which ignore rank, are refused for search"""
+        for cursor in ("", "abc"):
+            response = self.client.get(
+                "/api/v1/questions/", {"q": "lions", "cursor": cursor}
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.data["error"]["message"],
+                "cursor: Search results use page numbers; drop cursor.",
+            )
+
+    def test_search_within_child(self):
+        """Test that ?q= combines with ?child_id="""
+        data = self.search("roar", child_id=self.leo.id)
+        self.assertEqual([r["id"] for r in data["results"]], [self.purr.id])
+
+    def test_search_vector_follows_answer(self):
+        """Test that the generated column is refreshed on update"""
+        self.assertEqual(self.search("crater")["count"], 0)
+        moon = Question.objects.get(text="How far is the moon?")
+        moon.answer = "Very far, and covered in craters."
+        moon.save()
+        self.assertEqual(self.search("crater")["count"], 1)
+
+    def test_plain_list_is_unchanged(self):
+        """Test that lists without ?q= have no search fields"""
+        result = self.client.get("/api/v1/questions/").data["results"][0]
+        self.assertNotIn("rank", result)
+
+    def test_search_vector_is_not_loaded(self):
+        """Test that question queries leave the tsvector in the database"""
+        with CaptureQueriesContext(connection) as queries:
+            list(Question.objects.all())
+        self.assertNotIn("search_vector", queries[0]["sql"])
+
+    def test_admin_search_uses_index(self):
+        """Test that admin search matches with @@ rather than ILIKE"""
+        admin = User.objects.create_superuser("admin", "a@x.com", "pw")
+        self.client.force_login(admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/admin/core/question/", {"q": "lions"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 2)
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertIn("@@", sql)
+        self.assertNotIn("LIKE", sql)
@@ -1,9 +1,30 @@
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
 
 from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
 from core.services import QuestionService
+from core.services.answer_cache import AnswerCache, answer_cache, evict_question_answer
+from core.services.cache_versions import bump_version, get_version
+from core.services.fake_llm import FakeAnthropic
+from core.services.prompts import (
+    get_system_prompt,
+    invalidate_prompts,
+    prompt_cache_info,
+)
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    question_tokens,
+    reset_similar_question_index,
+)
+from core.services.topic_matcher import TOPIC_KEYWORDS, TopicMatcher, get_topic_matcher
+from core.services.topic_registry import TopicRegistry, topic_registry
 
 
 class QuestionServiceTests(TestCase):
@@ -31,6 +52,8 @@ class QuestionServiceTests(TestCase):
             recommended_min_age=5,
             context_guidelines="Explain cosmic concepts",
         )
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
         self.service = QuestionService()
 
     def test_detect_topic_animals(self):
@@ -48,7 +71,20 @@ class QuestionServiceTests(TestCase):
         topic = self.service.detect_topic("Random unrelated question")
         self.assertIsNone(topic)
 
-    @patch("core.services.question_service.Anthropic")
+    def test_detect_topic_prefers_highest_score(self):
+        """Test that the topic with the most keyword hits wins"""
+        topic = self.service.detect_topic("Do cats see the moon, stars and planets?")
+        self.assertEqual(topic, self.space_topic)
+
+    def test_detect_topic_skips_inactive_topics(self):
+        """Test that a matched but inactive topic falls through to the next match"""
+        self.space_topic.is_active = False
+        self.space_topic.save()
+
+        topic = self.service.detect_topic("Can my dog see the moon and the stars?")
+        self.assertEqual(topic, self.animals_topic)
+
+    @patch("core.services.question_service.get_anthropic_client")
     def test_generate_answer_success(self, mock_anthropic):
         """Test successful answer generation"""
         # Mock the API response
@@ -78,7 +114,7 @@ class QuestionServiceTests(TestCase):
         self.assertEqual(question.answer, "Lions roar to communicate with their pride.")
         self.assertIsNotNone(question.response_generated_at)
 
-    @patch("core.services.question_service.Anthropic")
+    @patch("core.services.question_service.get_anthropic_client")
     def test_generate_answer_api_error(self, mock_anthropic):
         """Test answer generation when API fails"""
         # Mock API error
@@ -233,3 +269,561 @@ class QuestionServiceTests(TestCase):
             # Should have a denial message suggesting allowed topics
             self.assertIn("can't help you", question.answer.lower())
             self.assertIn("Animals", question.answer)
+
+
+class AnswerCacheTests(TestCase):
+    """Tests for the exact-match answer cache in front of Claude"""
+
+    def setUp(self):
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        family = Family.objects.create(name="Cache Family")
+        self.child = Child.objects.create(
+            family=family, name="Cache Child", age=8, reading_level="intermediate"
+        )
+        self.topic = TopicCategory.objects.create(
+            name="Space",
+            slug="space",
+            description="Learn about space",
+            context_guidelines="Explain cosmic concepts",
+        )
+
+    def tearDown(self):
+        cache.clear()  # answers rejected through mark_helpful
+
+    def ask(self, text, child=None):
+        return Question.objects.create(
+            child=child or self.child,
+            text=text,
+            detected_topic=self.topic,
+            was_within_boundaries=True,
+        )
+
+    def mock_client(self, mock_anthropic, text="The sky scatters blue light."):
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text=text)]
+        )
+        mock_anthropic.return_value = mock_client
+        return mock_client
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_repeated_question_skips_api(self, mock_anthropic):
+        """Test that a normalized repeat is answered from the cache"""
+        client = self.mock_client(mock_anthropic)
+        service = QuestionService()
+
+        service.generate_answer(self.ask("Why is the sky blue?"))
+        repeat = self.ask("  why is the SKY blue  ")
+        answer = service.generate_answer(repeat)
+
+        self.assertEqual(client.messages.create.call_count, 1)
+        self.assertEqual(answer, "The sky scatters blue light.")
+        repeat.refresh_from_db()
+        self.assertEqual(repeat.answer, "The sky scatters blue light.")
+        self.assertIsNotNone(repeat.response_generated_at)
+        self.assertEqual(answer_cache.stats()["hits"], 1)
+        self.assertEqual(answer_cache.stats()["misses"], 1)
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_key_includes_age_bucket_and_reading_level(self, mock_anthropic):
+        """Test that different audiences get their own answers"""
+        client = self.mock_client(mock_anthropic)
+        older = Child.objects.create(
+            family=self.child.family, name="Older", age=12, reading_level="advanced"
+        )
+        service = QuestionService()
+
+        service.generate_answer(self.ask("Why is the sky blue?"))
+        service.generate_answer(self.ask("Why is the sky blue?", child=older))
+
+        self.assertEqual(client.messages.create.call_count, 2)
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_error_fallback_is_never_cached(self, mock_anthropic):
+        """Test that a failed call does not poison the cache"""
+        client = self.mock_client(mock_anthropic)
+        client.messages.create.side_effect = [
+            Exception("API Error"),
+            MagicMock(content=[MagicMock(text="Real answer")]),
+        ]
+        service = QuestionService()
+
+        self.assertIn("trouble answering", service.generate_answer(self.ask("Hi moon")))
+        self.assertEqual(service.generate_answer(self.ask("Hi moon")), "Real answer")
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_unhelpful_answer_is_evicted(self, mock_anthropic):
+        """Test that marking an answer unhelpful removes it from the cache"""
+        client = self.mock_client(mock_anthropic)
+        service = QuestionService()
+        question = self.ask("Why is the sky blue?")
+        service.generate_answer(question)
+
+        response = APIClient().post(
+            f"/api/v1/questions/{question.id}/mark_helpful/",
+            {"helpful": False},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        service.generate_answer(self.ask("Why is the sky blue?"))
+        self.assertEqual(client.messages.create.call_count, 2)
+
+    @patch("core.services.answer_cache.answer_cache", new_callable=AnswerCache)
+    def test_unhelpful_answer_is_evicted_in_other_workers(self, local_cache):
+        """Test that another process's copy of the answer goes stale too"""
+        question = self.ask("Why is the sky blue?")
+        question.answer = "Because of dragons."
+        key = AnswerCache.make_key(question.text, self.child, self.topic)
+        other_worker = AnswerCache()
+        local_cache.set(key, question.answer)
+        other_worker.set(key, question.answer)
+        self.assertEqual(other_worker.get(key), "Because of dragons.")
+
+        self.assertTrue(evict_question_answer(question))
+
+        self.assertIsNone(local_cache.get(key))
+        self.assertIsNone(other_worker.get(key))
+        self.assertEqual(other_worker.stats()["invalidations"], 1)
+        self.assertEqual(other_worker.stats()["size"], 0)
+
+        other_worker.set(key, "Light scatters.")
+        self.assertEqual(other_worker.get(key), "Light scatters.")
+
+    def test_entries_expire_after_ttl(self):
+        """Test TTL expiry"""
+        cache = AnswerCache(max_entries=10, ttl=60)
+        with patch("core.services.answer_cache.time.monotonic", return_value=100):
+            cache.set("key", "answer")
+        with patch("core.services.answer_cache.time.monotonic", return_value=159):
+            self.assertEqual(cache.get("key"), "answer")
+        with patch("core.services.answer_cache.time.monotonic", return_value=161):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test LRU eviction when the cache is full"""
+        cache = AnswerCache(max_entries=2, ttl=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class SimilarQuestionTests(TestCase):
+    """Tests for near-duplicate answer reuse"""
+
+    def setUp(self):
+        answer_cache.clear()
+        self.index = SimilarQuestionIndex()
+        reset_similar_question_index(self.index)
+        family = Family.objects.create(name="Similar Family")
+        self.child = Child.objects.create(
+            family=family, name="Purr Child", age=7, reading_level="early"
+        )
+        self.topic = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            context_guidelines="Focus on fun facts",
+        )
+
+    def tearDown(self):
+        cache.clear()  # answers rejected through mark_helpful
+
+    def ask(self, text):
+        return Question.objects.create(
+            child=self.child,
+            text=text,
+            detected_topic=self.topic,
+            was_within_boundaries=True,
+        )
+
+    def test_paraphrases_reduce_to_same_tokens(self):
+        """Test that stopwords and plurals are normalized away"""
+        self.assertEqual(question_tokens("Why do cats purr?"), {"cat", "purr"})
+        self.assertEqual(question_tokens("How come my cat purrs"), {"cat", "purr"})
+
+    def test_query_is_namespaced_by_topic_and_reading_level(self):
+        """Test that matches never cross topic or reading level"""
+        self.index.add(1, "Why do cats purr?", "animals", "early")
+
+        self.assertEqual(
+            self.index.query("how come my cat purrs", "animals", "early", 0.8),
+            (1, 1.0),
+        )
+        self.assertIsNone(self.index.query("cats purr", "animals", "advanced", 0.8))
+        self.assertIsNone(self.index.query("cats purr", "space", "early", 0.8))
+
+    def test_dissimilar_and_removed_questions_do_not_match(self):
+        """Test threshold and removal"""
+        self.index.add(1, "Why do cats purr?", "animals", "early")
+        self.assertIsNone(
+            self.index.query("Why do dogs bark at cats?", "animals", "early", 0.8)
+        )
+
+        self.index.remove(1)
+        self.assertIsNone(self.index.query("cats purr", "animals", "early", 0.8))
+
+    def test_snapshot_round_trip(self):
+        """Test that a saved index can be loaded by another process"""
+        self.index.add(7, "Why do cats purr?", "animals", "early")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.idx")
+            self.index.save(path)
+            loaded = SimilarQuestionIndex.load(path)
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.query("cat purrs", "animals", "early", 0.8), (7, 1.0))
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_generate_answer_reuses_paraphrase(self, mock_anthropic):
+        """Test that a paraphrase is answered without calling Claude"""
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="Cats purr when they are happy.")]
+        )
+        mock_anthropic.return_value = mock_client
+        service = QuestionService()
+
+        service.generate_answer(self.ask("Why do cats purr?"))
+        answer = service.generate_answer(self.ask("How come my cat purrs"))
+
+        self.assertEqual(answer, "Cats purr when they are happy.")
+        self.assertEqual(mock_client.messages.create.call_count, 1)
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_unhelpful_source_is_not_reused(self, mock_anthropic):
+        """Test that an answer marked unhelpful is dropped from the index"""
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = MagicMock(
+            content=[MagicMock(text="Cats purr when they are happy.")]
+        )
+        mock_anthropic.return_value = mock_client
+        service = QuestionService()
+        original = self.ask("Why do cats purr?")
+        service.generate_answer(original)
+        Question.objects.filter(pk=original.pk).update(child_marked_helpful=False)
+
+        paraphrase = self.ask("How come my cat purrs")
+        service.generate_answer(paraphrase)
+
+        self.assertEqual(mock_client.messages.create.call_count, 2)
+        match = self.index.query("cats purr", "animals", "early", 0.8)
+        self.assertEqual(match[0], paraphrase.id)
+
+    @patch("core.services.question_service.get_anthropic_client")
+    def test_unhelpful_reused_answer_is_not_reused_again(self, mock_anthropic):
+        """Test that rejecting a reused answer also stops reusing its source"""
+        mock_client = MagicMock()
+        mock_client.messages.create.side_effect = [
+            MagicMock(content=[MagicMock(text="Cats purr when they are happy.")]),
+            MagicMock(content=[MagicMock(text="Purring is a cat's motor.")]),
+        ]
+        mock_anthropic.return_value = mock_client
+        service = QuestionService()
+        service.generate_answer(self.ask("Why do cats purr?"))
+        reused = self.ask("Why do cats purr?")
+        service.generate_answer(reused)
+        self.assertEqual(mock_client.messages.create.call_count, 1)
+
+        response = APIClient().post(
+            f"/api/v1/questions/{reused.id}/mark_helpful/",
+            {"helpful": False},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        third = self.ask("How come my cat purrs")
+        self.assertEqual(service.generate_answer(third), "Purring is a cat's motor.")
+        self.assertEqual(mock_client.messages.create.call_count, 2)
+        fourth = self.ask("Why do cats purr?")
+        self.assertNotEqual(
+            service.generate_answer(fourth), "Cats purr when they are happy."
+        )
+
+    def test_rebuild_skips_answers_rejected_elsewhere(self):
+        """Test that an answer marked unhelpful on a copy is not re-indexed"""
+        source = self.ask("Why do cats purr?")
+        copy = self.ask("How come my cat purrs")
+        for question in (source, copy):
+            question.answer = "Because they are happy."
+        copy.child_marked_helpful = False
+        source.save()
+        copy.save()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.idx")
+            call_command("rebuild_similar_questions", output=path, stdout=StringIO())
+            self.assertEqual(len(SimilarQuestionIndex.load(path)), 0)
+
+    def test_rebuild_command_indexes_answered_questions(self):
+        """Test the rebuild_similar_questions management command"""
+        answered = self.ask("Why do cats purr?")
+        answered.answer = "Because they are happy."
+        answered.save()
+        self.ask("Why do fish swim?")  # never answered
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.idx")
+            call_command("rebuild_similar_questions", output=path, stdout=StringIO())
+            index = SimilarQuestionIndex.load(path)
+
+        self.assertEqual(len(index), 1)
+        self.assertEqual(
+            index.query("cat purrs", "animals", "early", 0.8), (answered.id, 1.0)
+        )
+
+
+class TopicMatcherTests(SimpleTestCase):
+    """Tests for the compiled keyword matcher"""
+
+    def setUp(self):
+        self.matcher = get_topic_matcher()
+
+    def test_matches_plurals(self):
+        """Test that common inflections of a keyword still match"""
+        matches = self.matcher.match("Why do lions roar?")
+        self.assertEqual([m.slug for m in matches], ["animals"])
+
+    def test_respects_word_boundaries(self):
+        """Test that keywords inside unrelated words are ignored"""
+        self.assertEqual(self.matcher.match("What is education?"), [])
+        self.assertEqual(self.matcher.match("Is software toward Sunday?"), [])
+
+    def test_substring_matcher_parity(self):
+        """Test word forms the old substring matcher caught for every keyword"""
+        for slug, keywords in TOPIC_KEYWORDS.items():
+            for keyword in keywords:
+                forms = [keyword + suffix for suffix in ("", "s", "y")]
+                for form in forms if " " not in keyword else [keyword]:
+                    slugs = [m.slug for m in self.matcher.match(f"Why {form}?")]
+                    self.assertIn(slug, slugs, form)
+
+        for text, slug in [
+            ("Why is it cloudy?", "weather"),
+            ("Why is it so sunny?", "space"),
+            ("Why is it rainy and windy?", "weather"),
+            ("What makes a night stormy?", "weather"),
+            ("What is a thunderstorm?", "weather"),
+            ("Why is a starfish a star?", "animals"),
+            ("How do our bodies grow?", "human-body"),
+            ("What is sickness?", "human-body"),
+            ("Are seastars real?", "ocean"),
+        ]:
+            self.assertIn(slug, [m.slug for m in self.matcher.match(text)], text)
+
+    def test_returns_every_topic_with_scores(self):
+        """Test that all matching topics are returned, best score first"""
+        matches = self.matcher.match("Can a whale or a shark see the moon?")
+        self.assertEqual(
+            [(m.slug, m.score) for m in matches], [("ocean", 2), ("space", 1)]
+        )
+        self.assertEqual(matches[0].keywords, ("whale", "shark"))
+
+    def test_multi_word_keywords(self):
+        """Test that phrase keywords match across spaces"""
+        matches = self.matcher.match("How does a fridge keep food cold?")
+        self.assertEqual(matches[0].slug, "how-things-work")
+
+    def test_long_runs_of_forms_are_skipped(self):
+        """Test that a word of many keyword forms is not split (and is fast)"""
+        matches = self.matcher.match("seastarseastar?")
+        self.assertEqual(
+            [(m.slug, m.score) for m in matches], [("space", 2), ("ocean", 2)]
+        )
+        self.assertEqual(self.matcher.match("seastar" * 2000 + "?"), [])
+        self.assertEqual(self.matcher.match("sea" * 4000 + "s?"), [])
+
+    def test_ties_keep_declaration_order(self):
+        """Test that equal scores fall back to keyword table order"""
+        matcher = TopicMatcher({"first": ["alpha"], "second": ["beta"]})
+        matches = matcher.match("beta alpha")
+        self.assertEqual([m.slug for m in matches], ["first", "second"])
+
+    def test_matcher_is_built_once(self):
+        """Test that the process-wide matcher is reused"""
+        self.assertIs(get_topic_matcher(), self.matcher)
+
+
+class TopicRegistryTests(TestCase):
+    """Tests for the process-local topic registry"""
+
+    def setUp(self):
+        self.topic = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+            context_guidelines="Focus on fun facts",
+        )
+
+    def test_detect_topic_costs_no_queries_once_loaded(self):
+        """Test that topic resolution is served from memory"""
+        topic_registry.get("animals")
+        service = QuestionService()
+        with self.assertNumQueries(0):
+            topic = service.detect_topic("Why do lions roar?")
+        self.assertEqual(topic, self.topic)
+
+    def test_indexes_by_slug_and_id(self):
+        """Test lookups by slug and by primary key"""
+        self.assertEqual(topic_registry.get("animals"), self.topic)
+        self.assertEqual(topic_registry.get_by_id(self.topic.id), self.topic)
+        self.assertIsNone(topic_registry.get("missing"))
+
+    def test_save_refreshes_registry(self):
+        """Test that saving a topic is visible on the next lookup"""
+        topic_registry.get("animals")
+        self.topic.name = "Wildlife"
+        self.topic.save()
+        self.assertEqual(topic_registry.get("animals").name, "Wildlife")
+
+    def test_inactive_and_deleted_topics_are_dropped(self):
+        """Test that deactivated or deleted topics disappear"""
+        topic_registry.get("animals")
+        self.topic.is_active = False
+        self.topic.save()
+        self.assertIsNone(topic_registry.get("animals"))
+
+        self.topic.is_active = True
+        self.topic.save()
+        self.assertIsNotNone(topic_registry.get("animals"))
+        self.topic.delete()
+        self.assertIsNone(topic_registry.get("animals"))
+
+    def test_version_is_bumped_only_on_commit(self):
+        """Test that other workers never see the new token before the rows"""
+        version = get_version("topics")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.topic.name = "Wildlife"
+            self.topic.save()
+        self.assertEqual(get_version("topics"), version)
+        self.assertEqual(topic_registry.get("animals").name, "Wildlife")
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_version("topics"), version)
+
+    def test_other_workers_refresh_within_interval(self):
+        """Test that a version bump from another process is picked up in bounded time"""
+        registry = TopicRegistry(refresh_interval=30)
+        with patch("core.services.topic_registry.time.monotonic", return_value=1000):
+            self.assertEqual(registry.get("animals").name, "Animals")
+
+        # Another worker changes the topic: no local signal, only the version key
+        TopicCategory.objects.filter(pk=self.topic.pk).update(name="Wildlife")
+        bump_version("topics")
+
+        with patch("core.services.topic_registry.time.monotonic", return_value=1010):
+            self.assertEqual(registry.get("animals").name, "Animals")
+        with patch("core.services.topic_registry.time.monotonic", return_value=1031):
+            self.assertEqual(registry.get("animals").name, "Wildlife")
+
+
+LONG_GUIDELINES = "Mention where the animal lives and what it eats. " * 100
+
+
+class PromptTests(TestCase):
+    """Tests for precompiled, prompt-cache-friendly system prompts"""
+
+    def setUp(self):
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        invalidate_prompts()
+        self.family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=self.family, name="Emma", age=7, reading_level="beginner"
+        )
+        self.topic = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+            context_guidelines="Focus on fun facts",
+        )
+
+    def ask(self, llm, text="Why do lions roar?", child=None):
+        question = Question.objects.create(
+            child=child or self.child,
+            text=text,
+            detected_topic=self.topic,
+            was_within_boundaries=True,
+        )
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            QuestionService().generate_answer(question)
+        question.refresh_from_db()
+        return question
+
+    def test_prompt_is_compiled_once(self):
+        """Test that repeated lookups return the memoized blocks"""
+        first = get_system_prompt(self.child, self.topic)
+        self.assertIs(get_system_prompt(self.child, self.topic), first)
+        self.assertEqual(prompt_cache_info()["misses"], 1)
+
+    def test_shared_prefix_is_split_from_audience(self):
+        """Test that the child-independent prefix is its own block"""
+        prefix, audience = get_system_prompt(self.child, self.topic)
+        self.assertIn("Focus on fun facts", prefix["text"])
+        self.assertNotIn("7 years old", prefix["text"])
+        self.assertIn("7 years old", audience["text"])
+
+        older = Child.objects.create(family=self.family, name="Sam", age=11)
+        self.assertEqual(get_system_prompt(older, self.topic)[0], prefix)
+
+    def test_short_prefix_has_no_cache_control(self):
+        """Test that prefixes below Anthropic's cache minimum are not marked"""
+        prefix, audience = get_system_prompt(self.child, self.topic)
+        self.assertNotIn("cache_control", prefix)
+        self.assertNotIn("cache_control", audience)
+
+    def test_long_prefix_carries_cache_control(self):
+        """Test that only a cacheable prefix is a cache breakpoint"""
+        self.topic.context_guidelines = LONG_GUIDELINES
+        self.topic.save()
+        prefix, audience = get_system_prompt(self.child, self.topic)
+        self.assertEqual(prefix["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", audience)
+
+    def test_topic_change_invalidates_prompts(self):
+        """Test that editing context_guidelines clears the memo"""
+        get_system_prompt(self.child, self.topic)
+        self.topic.context_guidelines = "Mention habitats"
+        self.topic.save()
+        self.assertEqual(prompt_cache_info()["currsize"], 0)
+
+        prefix = get_system_prompt(self.child, self.topic)[0]
+        self.assertIn("Mention habitats", prefix["text"])
+
+    def test_api_call_uses_system_blocks(self):
+        """Test that messages.create receives the precompiled blocks"""
+        llm = FakeAnthropic()
+        self.ask(llm)
+        self.assertEqual(
+            llm.calls[0]["system"], list(get_system_prompt(self.child, self.topic))
+        )
+
+    def test_cache_usage_is_recorded(self):
+        """Test that cache writes and reads are saved on the question"""
+        self.topic.context_guidelines = LONG_GUIDELINES
+        self.topic.save()
+        llm = FakeAnthropic()
+        first = self.ask(llm)
+        self.assertGreater(first.cache_creation_input_tokens, 0)
+        self.assertEqual(first.cache_read_input_tokens, 0)
+
+        other = Child.objects.create(family=self.family, name="Sam", age=11)
+        second = self.ask(llm, "How do whales sleep underwater?", child=other)
+        self.assertEqual(
+            second.cache_read_input_tokens, first.cache_creation_input_tokens
+        )
+        self.assertEqual(second.cache_creation_input_tokens, 0)
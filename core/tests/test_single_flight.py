@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase
+
+from core.models import Child, Family, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+from core.services.anthropic_client import anthropic_breaker
+from core.services.fake_llm import FakeAnthropic, FakeAsyncAnthropic
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    reset_similar_question_index,
+)
+from core.services.single_flight import SingleFlight, question_flights
+
+
+def run_in_threads(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        try:
+            barrier.wait()
+            results[index] = target(index)
+        except Exception as e:
+            results[index] = e
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTests(TransactionTestCase):
+    """Identical in-flight questions share one Claude call"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        anthropic_breaker.reset()
+        question_flights.reset()
+        self.flights = SingleFlight("test")
+        self.family = Family.objects.create(name="Test Family")
+        self.topic = TopicCategory.objects.create(
+            name="Volcanoes",
+            slug="volcanoes",
+            description="Learn about volcanoes",
+            icon="🌋",
+            recommended_min_age=3,
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def slow(self, result, delay=0.2):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(delay)
+            return result
+
+        return fn, calls
+
+    def test_duplicates_share_one_call(self):
+        """Test that concurrent callers with one key run fn once"""
+        fn, calls = self.slow("answer")
+        results = run_in_threads(8, lambda i: self.flights.do("key", fn))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({answer for answer, _ in results}, {"answer"})
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * 7)
+        self.assertEqual(self.flights.stats()["calls_saved_in_process"], 7)
+
+    def test_different_keys_do_not_coalesce(self):
+        """Test that only identical keys wait on each other"""
+        fn, calls = self.slow("answer", delay=0.05)
+        run_in_threads(3, lambda i: self.flights.do(f"key-{i}", fn))
+        self.assertEqual(len(calls), 3)
+
+    def test_error_is_shared_with_waiters(self):
+        """Test that duplicates see the leader's failure instead of retrying"""
+        calls = []
+
+        def fail():
+            calls.append(1)
+            time.sleep(0.2)
+            raise RuntimeError("upstream down")
+
+        results = run_in_threads(4, lambda i: self.flights.do("key", fail))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    def test_waits_for_call_in_another_worker(self):
+        """Test that a held cache lock makes this worker wait for its result"""
+        other_worker = SingleFlight("test")
+        fn, calls = self.slow("from other worker", delay=0.3)
+        started = threading.Event()
+
+        def leader():
+            started.set()
+            return other_worker._do_across_workers("key", fn)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait()
+        time.sleep(0.05)
+
+        own_fn, own_calls = self.slow("own answer", delay=0)
+        result = self.flights.do("key", own_fn)
+        thread.join()
+
+        self.assertEqual(result, ("from other worker", True))
+        self.assertEqual(own_calls, [])
+        self.assertEqual(self.flights.stats()["calls_saved_across_workers"], 1)
+
+    def test_calls_itself_when_other_worker_fails(self):
+        """Test that a released lock without a result falls back to calling"""
+        lock_key = self.flights._cache_key("lock", "key")
+        cache.add(lock_key, 1, 10)
+        threading.Timer(0.1, cache.delete, args=(lock_key,)).start()
+
+        fn, calls = self.slow("answer", delay=0)
+        self.assertEqual(self.flights.do("key", fn), ("answer", False))
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_asks_get_own_questions(self):
+        """Test that each duplicate ask is saved with the shared answer"""
+        children = Child.objects.bulk_create(
+            Child(family=self.family, name=f"Kid {i}", age=8) for i in range(6)
+        )
+        llm = FakeAnthropic(answer="Magma escapes!", latency=0.3)
+
+        def ask(index):
+            question = Question.objects.create(
+                child=children[index],
+                text="Why do volcanoes erupt?",
+                detected_topic=self.topic,
+                was_within_boundaries=True,
+            )
+            QuestionService(client=llm).generate_answer(question)
+            return question.id
+
+        question_ids = run_in_threads(6, ask)
+
+        self.assertEqual(len(llm.calls), 1)
+        self.assertEqual(len(set(question_ids)), 6)
+        self.assertEqual(
+            set(
+                Question.objects.filter(id__in=question_ids).values_list(
+                    "answer", "status"
+                )
+            ),
+            {("Magma escapes!", Question.STATUS_ANSWERED)},
+        )
+        self.assertEqual(question_flights.stats()["calls_saved"], 5)
+
+    async def test_async_duplicates_share_one_call(self):
+        """Test that the async path coalesces too"""
+        child = await Child.objects.acreate(family=self.family, name="Emma", age=8)
+        questions = [
+            await Question.objects.acreate(
+                child=child,
+                text="Why do volcanoes erupt?",
+                detected_topic=self.topic,
+                was_within_boundaries=True,
+            )
+            for _ in range(5)
+        ]
+        llm = FakeAsyncAnthropic(answer="Magma escapes!", latency=0.2)
+        service = QuestionService(client=FakeAnthropic(), async_client=llm)
+
+        answers = await asyncio.gather(
+            *(service.agenerate_answer(question) for question in questions)
+        )
+
+        self.assertEqual(answers, ["Magma escapes!"] * 5)
+        self.assertEqual(len(llm.calls), 1)
+
+    async def test_cancelled_leader_does_not_strand_waiters(self):
+        """Test that waiters run the call themselves once the leader is cancelled"""
+        started = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(10 if len(calls) == 1 else 0)
+            return "answer"
+
+        leader = asyncio.create_task(self.flights.ado("key", call))
+        await started.wait()
+        waiter = asyncio.create_task(self.flights.ado("key", call))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        result = await asyncio.wait_for(waiter, 1)
+
+        self.assertEqual(result, ("answer", False))
+        self.assertEqual(len(calls), 2)
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+    def test_interrupted_leader_makes_waiters_recompute(self):
+        """Test that a leader killed by a BaseException leaves no None result"""
+        started = threading.Event()
+        calls = []
+
+        def interrupted():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            raise KeyboardInterrupt
+
+        def leader():
+            try:
+                self.flights.do("key", interrupted)
+            except KeyboardInterrupt:
+                pass
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait()
+
+        fn, own_calls = self.slow("answer", delay=0)
+        result = self.flights.do("key", fn)
+        thread.join()
+
+        self.assertEqual(result, ("answer", False))
+        self.assertEqual(len(own_calls), 1)
+
+    def test_health_reports_calls_saved(self):
+        """Test that the health endpoint exposes the coalescing counters"""
+        response = self.client.get("/api/health/")
+        self.assertEqual(response.json()["single_flight"]["calls_saved"], 0)
@@ -0,0 +1,102 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
+
+
+class SparseFieldsTests(TestCase):
+    """Tests for ?fields= trimming responses and the columns loaded"""
+
+    def setUp(self):
+        cache.clear()
+        animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        family = Family.objects.create(name="Sparse Family")
+        self.child = Child.objects.create(family=family, name="Emma", age=7)
+        ChildTopicAccess.objects.create(child=self.child, topic=animals)
+        self.question = Question.objects.create(
+            child=self.child,
+            text="Why do lions roar?",
+            answer="To talk to their pride. " * 50,
+            detected_topic=animals,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("p", password="pw"))
+
+    def tearDown(self):
+        cache.clear()
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [query["sql"] for query in queries]
+
+    def test_question_columns_are_pruned(self):
+        """Test that unrequested text columns and joins are not loaded"""
+        data, queries = self.get("/api/v1/questions/", fields="id,text")
+
+        self.assertEqual(
+            data["results"], [{"id": self.question.id, "text": "Why do lions roar?"}]
+        )
+        select = queries[-1]
+        self.assertNotIn('"core_question"."answer"', select)
+        self.assertNotIn("JOIN", select)
+
+    def test_related_fields_keep_their_join(self):
+        """Test that child_name and topic_name still come from one query"""
+        data, queries = self.get(
+            "/api/v1/questions/", fields="child_name,topic_name", page_size=10
+        )
+
+        self.assertEqual(
+            data["results"], [{"child_name": "Emma", "topic_name": "Animals"}]
+        )
+        select = queries[-1]
+        self.assertIn('"core_child"."name"', select)
+        self.assertNotIn('"core_child"."age"', select)
+        self.assertNotIn('"core_question"."answer"', select)
+
+    def test_retrieve_and_search(self):
+        """Test that ?fields= applies to detail and ?q= responses"""
+        data, _ = self.get(f"/api/v1/questions/{self.question.id}/", fields="status")
+        self.assertEqual(data, {"status": Question.STATUS_ANSWERED})
+
+        data, _ = self.get("/api/v1/questions/", q="lions", fields="id,rank")
+        self.assertEqual(set(data["results"][0]), {"id", "rank"})
+
+    def test_children_skip_unused_prefetch(self):
+        """Test that topic prefetches only run when topic fields are asked for"""
+        data, queries = self.get("/api/v1/children/", fields="id,name")
+        self.assertEqual(data["results"], [{"id": self.child.id, "name": "Emma"}])
+        self.assertEqual(len(queries), 2)  # count and page
+
+        data, queries = self.get("/api/v1/children/", fields="name,enabled_topics")
+        self.assertEqual(data["results"][0]["enabled_topics"][0]["slug"], "animals")
+        self.assertEqual(len(queries), 4)
+
+    def test_topics(self):
+        data, queries = self.get("/api/v1/topics/", fields="slug")
+        self.assertEqual(data["results"], [{"slug": "animals"}])
+        self.assertNotIn('"description"', queries[-1])
+
+    def test_unknown_field(self):
+        """Test that a misspelt field is a 400, not silently ignored"""
+        response = self.client.get("/api/v1/questions/", {"fields": "id,anwser"})
+        self.assertEqual(response.status_code, 400)
+        message = response.json()["error"]["message"]
+        self.assertTrue(
+            message.startswith("fields: Unknown field(s): anwser. Choose from: id,")
+        )
+
+    def test_other_actions_ignore_fields(self):
+        """Test that ?fields= does not leak into nested actions"""
+        data, _ = self.get(
+            f"/api/v1/children/{self.child.id}/questions/", fields="name"
+        )
+        self.assertIn("answer", data["results"][0])
@@ -0,0 +1,223 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+
+from core.models import Child, ChildTopicAccess, Family, Question, TopicCategory
+from core.services import QuestionService
+from core.services.answer_cache import answer_cache
+from core.services.fake_llm import FakeAnthropic, FakeAsyncAnthropic
+from core.services.question_service import FALLBACK_ANSWER
+from core.services.similar_questions import (
+    SimilarQuestionIndex,
+    get_similar_question_index,
+    reset_similar_question_index,
+)
+
+
+def parse_sse(chunks):
+    """Turn SSE chunks into a list of (event, data) pairs"""
+    events = []
+    for block in "".join(chunks).strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def decode(chunk):
+    return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+
+class AskStreamTests(TestCase):
+    """Tests for POST /questions/ask/stream/"""
+
+    def setUp(self):
+        cache.clear()
+        answer_cache.clear()
+        reset_similar_question_index(SimilarQuestionIndex())
+        self.client = APIClient()
+        family = Family.objects.create(name="Test Family")
+        self.child = Child.objects.create(
+            family=family, name="Emma", age=7, reading_level="beginner"
+        )
+        animals = TopicCategory.objects.create(
+            name="Animals",
+            slug="animals",
+            description="Learn about animals",
+            icon="🦁",
+            recommended_min_age=3,
+            context_guidelines="Focus on fun facts",
+        )
+        ChildTopicAccess.objects.create(child=self.child, topic=animals)
+
+    def tearDown(self):
+        cache.clear()
+
+    def ask_stream(self, text="Why do lions roar?", **extra):
+        return self.client.post(
+            "/api/questions/ask/stream/",
+            {"child_id": self.child.id, "question": text},
+            format="json",
+            **extra,
+        )
+
+    def test_streams_boundary_deltas_and_done(self):
+        """Events arrive in order and the deltas add up to the saved answer"""
+        llm = FakeAnthropic(answer="Lions roar to talk to their pride.")
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            response = self.ask_stream()
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            events = parse_sse(decode(c) for c in response.streaming_content)
+
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "boundary")
+        self.assertEqual(names[-1], "done")
+        self.assertGreater(names.count("delta"), 1)
+        self.assertEqual(events[0][1], {"within_boundaries": True, "topic": "animals"})
+
+        streamed = "".join(data["text"] for name, data in events if name == "delta")
+        question = Question.objects.get(pk=events[-1][1]["question"]["id"])
+        self.assertEqual(streamed, "Lions roar to talk to their pride.")
+        self.assertEqual(question.answer, streamed)
+        self.assertEqual(question.status, Question.STATUS_ANSWERED)
+
+    def test_event_source_accept_header(self):
+        """Clients sending Accept: text/event-stream (EventSource) get the stream"""
+        llm = FakeAnthropic(answer="Lions roar to talk to their pride.")
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            response = self.ask_stream(HTTP_ACCEPT="text/event-stream")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            events = parse_sse(decode(c) for c in response.streaming_content)
+
+        self.assertEqual(events[0][0], "boundary")
+        self.assertEqual(events[-1][0], "done")
+
+    def test_first_event_is_sent_before_generation(self):
+        """The boundary event is flushed before Claude is called"""
+        llm = FakeAnthropic()
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            response = self.ask_stream()
+            stream = iter(response.streaming_content)
+
+            self.assertIn("event: boundary", decode(next(stream)))
+            self.assertEqual(llm.calls, [])
+
+            next(stream)  # first delta
+            self.assertEqual(len(llm.calls), 1)
+            self.assertFalse(Question.objects.exists())  # saved once, at the end
+
+            list(stream)
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_stream_saves_question_when_closed(self):
+        """A client disconnect saves what was streamed so far, as failed"""
+        service = QuestionService(client=FakeAnthropic(answer="Lions roar loudly."))
+        question, _ = service.screen_question(self.child, "Why do lions roar?")
+
+        deltas = service.stream_answer(question)
+        first_delta = next(deltas)
+        deltas.close()
+
+        saved = Question.objects.get()
+        self.assertEqual(saved.status, Question.STATUS_FAILED)
+        self.assertEqual(saved.answer, first_delta)
+        self.assertIsNotNone(saved.response_generated_at)
+
+    def test_cut_short_answer_is_never_reused(self):
+        """A partial answer saved on disconnect is not indexed or reused"""
+        llm = FakeAnthropic(answer="Lions roar loudly.")
+        service = QuestionService(client=llm)
+        question, _ = service.screen_question(self.child, "Why do lions roar?")
+        deltas = service.stream_answer(question)
+        next(deltas)
+        deltas.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.idx")
+            call_command("rebuild_similar_questions", output=path, stdout=StringIO())
+            self.assertEqual(len(SimilarQuestionIndex.load(path)), 0)
+
+        # Indexed before it failed: the match is dropped, not reused
+        get_similar_question_index().add(
+            question.id, question.text, "animals", self.child.reading_level
+        )
+        paraphrase, _ = service.screen_question(self.child, "How come lions roar")
+        paraphrase.save()
+        self.assertEqual(service.generate_answer(paraphrase), "Lions roar loudly.")
+        self.assertEqual(len(llm.calls), 2)
+
+    def test_denied_question_streams_denial(self):
+        """Questions outside boundaries stream the denial without Claude"""
+        llm = FakeAnthropic()
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            response = self.ask_stream("How big is the moon?")
+            events = parse_sse(decode(c) for c in response.streaming_content)
+
+        self.assertFalse(events[0][1]["within_boundaries"])
+        self.assertIn("I can't help you with that", events[1][1]["text"])
+        self.assertFalse(events[-1][1]["question"]["was_within_boundaries"])
+        self.assertEqual(llm.calls, [])
+
+    def test_api_error_streams_fallback(self):
+        """A failed stream saves and sends the friendly fallback"""
+        llm = FakeAnthropic(failures=1)
+        with patch(
+            "core.services.question_service.get_anthropic_client", return_value=llm
+        ):
+            response = self.ask_stream()
+            events = parse_sse(decode(c) for c in response.streaming_content)
+
+        self.assertEqual(events[1], ("delta", {"text": FALLBACK_ANSWER}))
+        question = Question.objects.get(pk=events[-1][1]["question"]["id"])
+        self.assertEqual(question.status, Question.STATUS_FAILED)
+
+    async def test_async_stream_saves_question_when_closed(self):
+        """Closing the async answer stream early still saves the question"""
+        llm = FakeAsyncAnthropic(answer="Lions roar very loudly.")
+        service = QuestionService(client=FakeAnthropic(), async_client=llm)
+        question, _ = await sync_to_async(service.screen_question)(
+            self.child, "Why do lions roar?"
+        )
+
+        deltas = service.astream_answer(question)
+        first_delta = await anext(deltas)
+        await deltas.aclose()
+
+        saved = await Question.objects.aget()
+        self.assertEqual(saved.status, Question.STATUS_FAILED)
+        self.assertEqual(saved.answer, first_delta)
+
+    async def test_asgi_streams_with_async_client(self):
+        """Under ASGI the answer comes from AsyncAnthropic via the event loop"""
+        llm = FakeAsyncAnthropic(answer="Lions roar very loudly.")
+        with patch(
+            "core.services.question_service.get_async_anthropic_client",
+            return_value=llm,
+        ):
+            response = await AsyncClient().post(
+                "/api/questions/ask/stream/",
+                {"child_id": self.child.id, "question": "Why do lions roar?"},
+                content_type="application/json",
+            )
+            self.assertTrue(response.is_async)
+            events = parse_sse([decode(c) async for c in response.streaming_content])
+
+        self.assertEqual(len(llm.calls), 1)
+        question = await Question.objects.aget(pk=events[-1][1]["question"]["id"])
+        self.assertEqual(question.answer, "Lions roar very loudly.")
@@ -0,0 +1,104 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Child, Family, Question, TopicCategory
+from core.serializers import (
+    ChildSerializer,
+    QuestionSearchSerializer,
+    QuestionSerializer,
+)
+from core.serializers.rows import ValuesRows
+from core.services.question_search import search_questions
+
+
+class ValuesRowsTests(TestCase):
+    """Tests for the .values_list() list path matching QuestionSerializer"""
+
+    def setUp(self):
+        cache.clear()
+        animals = TopicCategory.objects.create(
+            name="Animals", slug="animals", description="Animals", icon="🦁"
+        )
+        family = Family.objects.create(name="Rows Family")
+        emma = Child.objects.create(family=family, name="Emma", age=7)
+        Question.objects.create(
+            child=emma,
+            text="Why do lions roar?",
+            answer="To talk to their pride.",
+            detected_topic=animals,
+            child_marked_helpful=True,
+        )
+        Question.objects.create(
+            child=emma,
+            text="How far is the moon?",
+            was_within_boundaries=False,
+            reviewed_at=timezone.now(),
+        )
+        Question.objects.create(
+            child=emma, text="Why is the sky blue?", status=Question.STATUS_PENDING
+        )
+        self.client = APIClient()
+
+    def tearDown(self):
+        cache.clear()
+
+    def assertParity(self, serializer_class, queryset, **kwargs):
+        expected = serializer_class(queryset, many=True, **kwargs).data
+        rows = ValuesRows.for_serializer(serializer_class(**kwargs), queryset)
+        actual = rows.to_representation(rows.queryset)
+        # Compare the JSON clients get, field order included
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+        return actual
+
+    def test_parity_with_question_serializer(self):
+        """Test every field, including null relations and datetimes"""
+        data = self.assertParity(QuestionSerializer, Question.objects.all())
+        sky = next(item for item in data if item["text"] == "Why is the sky blue?")
+        self.assertNotIn("topic_name", sky)  # DRF skips it too
+
+    def test_parity_with_sparse_and_search_serializers(self):
+        self.assertParity(
+            QuestionSerializer,
+            Question.objects.all(),
+            fields=["id", "topic_name", "reviewed_at"],
+        )
+        self.assertParity(
+            QuestionSearchSerializer,
+            search_questions(Question.objects.all(), "lions moon"),
+        )
+
+    def test_nested_serializers_fall_back(self):
+        """Test that fields needing instances rule out the fast path"""
+        self.assertIsNone(
+            ValuesRows.for_serializer(ChildSerializer(), Child.objects.all())
+        )
+
+    def test_list_endpoint(self):
+        """Test that the list response matches serializing model instances"""
+        response = self.client.get("/api/v1/questions/")
+
+        expected = QuestionSerializer(Question.objects.all(), many=True).data
+        self.assertEqual(
+            response.json()["results"], json.loads(JSONRenderer().render(expected))
+        )
+
+    def test_cursor_pages(self):
+        """Test that keyset cursors are built from the tuple rows"""
+        Question.objects.update(created_at=timezone.now() - timedelta(days=1))
+        seen = []
+        response = self.client.get("/api/v1/questions/", {"cursor": "", "page_size": 2})
+        while True:
+            seen += [question["id"] for question in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            seen, list(Question.objects.order_by("-id").values_list("id", flat=True))
+        )
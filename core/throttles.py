@@ -2,6 +2,9 @@
 
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+# Actions that call Claude and share the per-child limit
+AI_QUESTION_ACTIONS = ("ask", "ask_stream")
+
 
 class AIQuestionRateThrottle(UserRateThrottle):
     """Rate limit per child (not per user) to control API costs."""
@@ -10,8 +13,8 @@ class AIQuestionRateThrottle(UserRateThrottle):
 
     def get_cache_key(self, request, view):
         """Use child_id for rate limit key instead of user."""
-        # Only apply to the 'ask' action
-        if view.action != "ask":
+        # Only apply to the ask actions
+        if view.action not in AI_QUESTION_ACTIONS:
             return None
 
         # Rate limit per child, not per user/IP
@@ -28,8 +31,8 @@ class AIQuestionRateThrottle(UserRateThrottle):
 
         Returns True if within limit, False if rate limited.
         """
-        # Only throttle POST requests to the ask endpoint
-        if request.method != "POST" or view.action != "ask":
+        # Only throttle POST requests to the ask endpoints
+        if request.method != "POST" or view.action not in AI_QUESTION_ACTIONS:
             return True
 
         return super().allow_request(request, view)
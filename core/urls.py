@@ -3,6 +3,10 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     ChildViewSet,
+    FamilyBlockedQuestionsReviewView,
+    FamilyBlockedQuestionsView,
+    FamilyQuestionExportView,
+    LLMStatsView,
     LoginView,
     LogoutView,
     QuestionViewSet,
@@ -22,6 +26,23 @@ urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="register"),
     path("auth/login/", LoginView.as_view(), name="login"),
     path("auth/logout/", LogoutView.as_view(), name="logout"),
+    path(
+        "families/<int:pk>/questions/export/",
+        FamilyQuestionExportView.as_view(),
+        name="family-questions-export",
+    ),
+    path(
+        "families/<int:pk>/blocked-questions/",
+        FamilyBlockedQuestionsView.as_view(),
+        name="family-blocked-questions",
+    ),
+    path(
+        "families/<int:pk>/blocked-questions/review/",
+        FamilyBlockedQuestionsReviewView.as_view(),
+        name="family-blocked-questions-review",
+    ),
+    # Operational stats (staff only)
+    path("stats/llm/", LLMStatsView.as_view(), name="llm-stats"),
     # Health check endpoints (for K8s/Docker/load balancers)
     path("health/", health_check, name="health-check"),
     path("health/ready/", readiness_check, name="readiness-check"),
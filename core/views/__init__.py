@@ -1,6 +1,12 @@
 from .auth import LoginView, LogoutView, RegisterView
 from .children import ChildViewSet
-from .questions import QuestionViewSet
+from .families import (
+    FamilyBlockedQuestionsReviewView,
+    FamilyBlockedQuestionsView,
+    FamilyQuestionExportView,
+)
+from .questions import AsyncAskQuestionView, AsyncWaitQuestionView, QuestionViewSet
+from .stats import LLMStatsView
 from .topics import TopicCategoryViewSet
 
 __all__ = [
@@ -8,6 +14,12 @@ __all__ = [
     "LoginView",
     "LogoutView",
     "ChildViewSet",
+    "FamilyQuestionExportView",
+    "FamilyBlockedQuestionsView",
+    "FamilyBlockedQuestionsReviewView",
     "TopicCategoryViewSet",
     "QuestionViewSet",
+    "AsyncAskQuestionView",
+    "AsyncWaitQuestionView",
+    "LLMStatsView",
 ]
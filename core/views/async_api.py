@@ -0,0 +1,47 @@
+"""DRF-compatible base view whose handlers run on the ASGI event loop."""
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView with `async def` handlers.
+
+    DRF's own dispatch is synchronous, so this mirrors APIView.dispatch:
+    authentication, permission and throttle checks still run (in a worker
+    thread, as they may touch the database or cache), exceptions go through
+    the project's exception handler and responses are rendered by the
+    negotiated renderer. Only the handler itself runs on the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, "__await__"):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        # Django requires every handler of an async view to be async
+        return super().options(request, *args, **kwargs)
@@ -1,12 +1,62 @@
+from datetime import datetime, time
+from functools import partial
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
-from core.models import Child, ChildTopicAccess, TopicCategory
+from core.models import Child, ChildTopicAccess
+from core.pagination import KeysetPagination
 from core.serializers import ChildSerializer, QuestionSerializer
+from core.serializers.rows import ValuesRows
+from core.services.blocked_questions import blocked_questions
+from core.services.child_topics import invalidate_allowed_topics
+from core.services.etags import (
+    CHILDREN_VERSION,
+    TOPICS_VERSION,
+    child_questions_version,
+)
+from core.services.topic_registry import topic_registry
+
+from .conditional import ConditionalGetMixin
+from .sparse import SparseFieldsMixin
+
+
+def time_param(request, name):
+    """Parse an ISO date or datetime query parameter; dates mean midnight"""
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = day and datetime.combine(day, time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: ["Must be an ISO 8601 date or datetime."]})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+# Versions a child's representation depends on (enabled_topics names topics)
+CHILD_VERSIONS = [CHILDREN_VERSION, TOPICS_VERSION]
+
 
+def child_questions_versions(child_id):
+    """Versions a child's question feed depends on (child_name, topic_name)"""
+    return [child_questions_version(child_id), *CHILD_VERSIONS]
 
-class ChildViewSet(viewsets.ReadOnlyModelViewSet):
+
+class ChildViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet
+):
     """View and manage children"""
 
     queryset = Child.objects.prefetch_related(
@@ -14,13 +64,68 @@ class ChildViewSet(viewsets.ReadOnlyModelViewSet):
     )
     serializer_class = ChildSerializer
 
+    def list(self, request, *args, **kwargs):
+        respond = partial(super().list, request, *args, **kwargs)
+        return self.conditional_response(request, CHILD_VERSIONS, respond)
+
+    def retrieve(self, request, *args, **kwargs):
+        respond = partial(super().retrieve, request, *args, **kwargs)
+        return self.conditional_response(request, CHILD_VERSIONS, respond)
+
     @action(detail=True, methods=["get"])
     def questions(self, request, pk=None):
-        """Get all questions for a child"""
+        """
+        Get a child's questions, newest first, one cursor page at a time.
+
+        ?since= (inclusive) and ?until= (exclusive) limit the time window.
+        Pages hold at most KeysetPagination.max_page_size questions however
+        long the history is; follow `next` for older ones. Sends an ETag;
+        If-None-Match is answered with 304 without loading the child.
+        """
+        versions = child_questions_versions(pk)
+        respond = partial(self.child_questions, request)
+        return self.conditional_response(request, versions, respond)
+
+    def child_questions(self, request):
+        # Not get_object(): the viewset's topic access prefetch is unused here
+        child = get_object_or_404(
+            self.filter_queryset(Child.objects.only("id", "family_id")),
+            pk=self.kwargs["pk"],
+        )
+        self.check_object_permissions(request, child)
+        questions = child.questions.all()
+
+        since = time_param(request, "since")
+        until = time_param(request, "until")
+        if since is not None:
+            questions = questions.filter(created_at__gte=since)
+        if until is not None:
+            questions = questions.filter(created_at__lt=until)
+
+        # QuestionSerializer's fields are all columns: skip model instances
+        rows = ValuesRows.for_serializer(
+            QuestionSerializer(), questions, KeysetPagination.cursor_fields
+        )
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(rows.queryset, request, view=self)
+        return paginator.get_paginated_response(rows.to_representation(page))
+
+    @action(detail=True, methods=["get"], url_path="blocked-questions")
+    def blocked_questions(self, request, pk=None):
+        """
+        A child's blocked questions, newest first, in cursor pages.
+
+        ?unreviewed=1 leaves out the ones a parent already reviewed.
+        """
         child = self.get_object()
-        questions = child.questions.select_related("child", "detected_topic").all()
-        serializer = QuestionSerializer(questions, many=True)
-        return Response(serializer.data)
+        questions = blocked_questions().filter(child=child)
+        if request.query_params.get("unreviewed") in ("1", "true"):
+            questions = questions.filter(reviewed_at=None)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(questions, request, view=self)
+        serializer = QuestionSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=["post"], url_path="topics/enable")
     def enable_topic(self, request, pk=None):
@@ -28,22 +133,23 @@ class ChildViewSet(viewsets.ReadOnlyModelViewSet):
         child = self.get_object()
         topic_slug = request.data.get("topic_slug")
 
-        try:
-            topic = TopicCategory.objects.get(slug=topic_slug, is_active=True)
-            access, created = ChildTopicAccess.objects.get_or_create(
-                child=child, topic=topic
-            )
-            return Response(
-                {
-                    "message": f'Topic "{topic.name}" enabled for {child.name}',
-                    "created": created,
-                }
-            )
-        except TopicCategory.DoesNotExist:
+        topic = topic_registry.get(topic_slug)
+        if topic is None:
             return Response(
                 {"error": "Topic not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        access, created = ChildTopicAccess.objects.get_or_create(
+            child=child, topic=topic
+        )
+        invalidate_allowed_topics(child.id)
+        return Response(
+            {
+                "message": f'Topic "{topic.name}" enabled for {child.name}',
+                "created": created,
+            }
+        )
+
     @action(detail=True, methods=["post"], url_path="topics/disable")
     def disable_topic(self, request, pk=None):
         """Disable a topic for this child"""
@@ -53,6 +159,7 @@ class ChildViewSet(viewsets.ReadOnlyModelViewSet):
         deleted_count, _ = ChildTopicAccess.objects.filter(
             child=child, topic__slug=topic_slug
         ).delete()
+        invalidate_allowed_topics(child.id)
 
         return Response(
             {"message": f"Topic access removed", "deleted": deleted_count > 0}
@@ -0,0 +1,27 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.services.etags import compute_etag, etag_matches, etags_enabled
+
+
+class ConditionalGetMixin:
+    """Answer If-None-Match from version tokens before any query or serializer"""
+
+    def conditional_response(self, request, version_names, respond):
+        """
+        304 if the client's ETag is current, else respond() with an ETag.
+
+        The ETag is computed before respond() runs, so a write that lands
+        while the response is being built only makes the ETag stale, never
+        wrongly fresh. Without a shared cache backend there is no ETag and
+        respond() always runs.
+        """
+        if not etags_enabled():
+            return respond()
+        etag = compute_etag(request, version_names)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response = respond()
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
@@ -0,0 +1,102 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import Family
+from core.pagination import KeysetPagination
+from core.serializers import QuestionSerializer, ReviewBlockedQuestionsSerializer
+from core.services.blocked_questions import blocked_questions, mark_reviewed
+from core.services.question_export import (
+    EXPORT_FORMATS,
+    aexport_chunks,
+    export_chunks,
+    export_filename,
+)
+
+
+def get_family(request, pk):
+    """The family, if the user is staff or one of its parents"""
+    family = get_object_or_404(Family, pk=pk)
+    user = request.user
+    if not (user.is_staff or family.parents.filter(email=user.email).exists()):
+        raise PermissionDenied("You can only access your own family.")
+    return family
+
+
+class FamilyQuestionExportView(APIView):
+    """
+    Stream a family's whole question history as NDJSON or CSV.
+
+    ?format=ndjson (default) or csv; ?gzip=1 sends a .gz file instead.
+    Open to staff and to the family's own parents. Under ASGI the chunks
+    come from an async iterator, so they are streamed rather than buffered.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, pk):
+        family = get_family(request, pk)
+
+        export_format = request.query_params.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({"format": ["Must be ndjson or csv."]})
+        gzip = request.query_params.get("gzip") in ("1", "true")
+
+        if isinstance(request._request, ASGIRequest):
+            chunks = aexport_chunks(family.pk, export_format, gzip=gzip)
+        else:
+            chunks = export_chunks(family.pk, export_format, gzip=gzip)
+        content_type, _ = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            chunks, content_type="application/gzip" if gzip else content_type
+        )
+        filename = export_filename(family.pk, export_format, gzip=gzip)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the export
+        return response
+
+
+class FamilyBlockedQuestionsView(APIView):
+    """
+    Blocked questions across a family's children, newest first.
+
+    Cursor pages like the child feed, plus the family's unreviewed count,
+    which is a stored counter rather than a COUNT query.
+    ?unreviewed=1 leaves out reviewed questions.
+    """
+
+    def get(self, request, pk):
+        family = get_family(request, pk)
+        questions = blocked_questions().filter(child__family=family)
+        if request.query_params.get("unreviewed") in ("1", "true"):
+            questions = questions.filter(reviewed_at=None)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(questions, request, view=self)
+        response = paginator.get_paginated_response(
+            QuestionSerializer(page, many=True).data
+        )
+        response.data["unreviewed_count"] = family.unreviewed_blocked_count
+        return response
+
+
+class FamilyBlockedQuestionsReviewView(APIView):
+    """Mark blocked questions reviewed: the given question_ids, or all"""
+
+    def post(self, request, pk):
+        family = get_family(request, pk)
+        serializer = ReviewBlockedQuestionsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        reviewed = mark_reviewed(
+            family.pk, serializer.validated_data.get("question_ids")
+        )
+        family.refresh_from_db(fields=["unreviewed_blocked_count"])
+        return Response(
+            {"reviewed": reviewed, "unreviewed_count": family.unreviewed_blocked_count}
+        )
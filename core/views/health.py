@@ -9,6 +9,9 @@ from rest_framework.decorators import api_view, permission_classes, throttle_cla
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from core.services.anthropic_client import anthropic_breaker, connection_stats
+from core.services.single_flight import question_flights
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +45,10 @@ def health_check(request):
         {
             "status": status_text,
             "checks": checks,
+            "anthropic_client": connection_stats.stats(),
+            # Non-critical: while open, questions get fallback answers
+            "anthropic_circuit": anthropic_breaker.stats(),
+            "single_flight": question_flights.stats(),
             "version": "1.0.0",
         },
         status=status_code,
@@ -1,30 +1,182 @@
-from django.shortcuts import get_object_or_404
+import asyncio
+import json
+import math
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from core.models import Child, Question
-from core.serializers import AskQuestionSerializer, QuestionSerializer
+from core.pagination import KeysetPagination, QuestionPagination
+from core.serializers import (
+    AskQuestionSerializer,
+    QuestionSearchSerializer,
+    QuestionSerializer,
+)
 from core.services import QuestionService
+from core.services.answer_cache import evict_question_answer, reject_answer
+from core.services.question_search import search_questions
+from core.services.question_service import release_db_connection
+from core.services.similar_questions import get_similar_question_index
 from core.throttles import AIQuestionRateThrottle
 
+from .async_api import AsyncAPIView
+from .children import child_questions_versions
+from .conditional import ConditionalGetMixin
+from .rows import ValuesListMixin
+from .sparse import SparseFieldsMixin
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def boundary_event(question, within_boundaries):
+    topic = question.detected_topic
+    return sse_event(
+        "boundary",
+        {
+            "within_boundaries": within_boundaries,
+            "topic": topic.slug if topic else None,
+        },
+    )
+
+
+def done_event(question):
+    return sse_event("done", {"question": QuestionSerializer(question).data})
+
+
+def answer_events(question, within_boundaries, deltas):
+    """SSE stream: boundary decision, answer deltas, then the saved question"""
+    yield boundary_event(question, within_boundaries)
+    try:
+        for text in deltas:
+            yield sse_event("delta", {"text": text})
+    finally:
+        # Close the answer stream right away when the client disconnects, so
+        # the question is saved now rather than whenever it is collected
+        if hasattr(deltas, "close"):
+            deltas.close()
+    yield done_event(question)
+
+
+async def aanswer_events(question, within_boundaries, deltas):
+    """Async version of answer_events, consumed on the ASGI event loop"""
+    yield boundary_event(question, within_boundaries)
+    try:
+        async for text in deltas:
+            yield sse_event("delta", {"text": text})
+    finally:
+        await deltas.aclose()
+    yield done_event(question)
+
+
+async def aiter_values(values):
+    for value in values:
+        yield value
+
+
+def ask_response(question, within_boundaries):
+    """Response of the ask endpoints; queued questions get 202 Accepted"""
+    queued = question.status == Question.STATUS_PENDING
+    return Response(
+        {
+            "question": QuestionSerializer(question).data,
+            "within_boundaries": within_boundaries,
+        },
+        status=status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED,
+    )
+
+
+# Fields the worker writes when it finishes a queued question
+WAIT_REFRESH_FIELDS = ["status", "answer", "response_generated_at"]
+
+
+def wait_timeout(request, max_timeout):
+    """Seconds to long-poll for, from ?timeout= clamped to [0, max_timeout]"""
+    try:
+        timeout = float(request.query_params.get("timeout", max_timeout))
+    except ValueError:
+        timeout = math.nan
+    # float() also accepts "nan" and "inf", which would slip past the cap
+    if not math.isfinite(timeout):
+        raise ValidationError({"timeout": ["Must be a finite number."]})
+    return min(max(timeout, 0), max_timeout)
 
-class QuestionViewSet(viewsets.ModelViewSet):
+
+def wait_response(question):
+    """Response of the wait endpoints; still-queued questions get 202"""
+    queued = question.status in Question.QUEUED_STATUSES
+    return Response(
+        QuestionSerializer(question).data,
+        status=status.HTTP_202_ACCEPTED if queued else status.HTTP_200_OK,
+    )
+
+
+class QuestionViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """Ask and view questions"""
 
     permission_classes = [AllowAny]
     queryset = Question.objects.select_related("child", "detected_topic")
     serializer_class = QuestionSerializer
+    pagination_class = QuestionPagination
+    values_list_extra = KeysetPagination.cursor_fields
 
     def get_queryset(self):
-        """Optionally filter by child"""
+        """Optionally filter by child and full-text search with ?q="""
         queryset = super().get_queryset()
         child_id = self.request.query_params.get("child_id")
         if child_id:
             queryset = queryset.filter(child_id=child_id)
+        if self.search_terms:
+            queryset = search_questions(queryset, self.search_terms)
         return queryset
 
+    def perform_content_negotiation(self, request, force=False):
+        # EventSource sends Accept: text/event-stream, which no renderer
+        # serves; ask_stream writes its events itself
+        if self.action == "ask_stream":
+            force = True
+        return super().perform_content_negotiation(request, force=force)
+
+    def list(self, request, *args, **kwargs):
+        """A single child's list (?child_id= without ?q=) supports ETags"""
+        # Keyset pages follow created_at, which would undo the ranking
+        keyset = KeysetPagination.cursor_query_param in request.query_params
+        if self.search_terms and keyset:
+            raise ValidationError(
+                {"cursor": ["Search results use page numbers; drop cursor."]}
+            )
+        respond = partial(super().list, request, *args, **kwargs)
+        child_id = request.query_params.get("child_id", "")
+        if not child_id.isdigit() or self.search_terms:
+            return respond()
+        versions = child_questions_versions(int(child_id))
+        return self.conditional_response(request, versions, respond)
+
+    def get_serializer_class(self):
+        if self.search_terms:
+            return QuestionSearchSerializer
+        return super().get_serializer_class()
+
+    @property
+    def search_terms(self):
+        if self.action != "list":
+            return ""
+        return self.request.query_params.get("q", "").strip()
+
     @action(detail=False, methods=["post"], throttle_classes=[AIQuestionRateThrottle])
     def ask(self, request):
         """
@@ -40,29 +192,174 @@ class QuestionViewSet(viewsets.ModelViewSet):
 
         child_id = serializer.validated_data["child_id"]
         question_text = serializer.validated_data["question"]
+        defer = serializer.validated_data["mode"] == "async"
 
         # Get child
         child = get_object_or_404(Child, id=child_id)
 
         # Process question through service
         service = QuestionService()
-        question, within_boundaries = service.process_question(child, question_text)
-
-        # Return response
-        response_serializer = QuestionSerializer(question)
-        return Response(
-            {
-                "question": response_serializer.data,
-                "within_boundaries": within_boundaries,
-            },
-            status=status.HTTP_201_CREATED,
+        question, within_boundaries = service.process_question(
+            child, question_text, defer=defer
+        )
+
+        return ask_response(question, within_boundaries)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="ask/stream",
+        throttle_classes=[AIQuestionRateThrottle],
+    )
+    def ask_stream(self, request):
+        """
+        Ask a question and stream the answer as Server-Sent Events.
+
+        Emits `boundary` first, then `delta` events as Claude generates the
+        answer, then `done` with the saved question. The question is written
+        once, after the last delta, or when the client disconnects. Under
+        ASGI the answer is streamed through AsyncAnthropic on the event loop,
+        so open streams don't hold threads.
+        """
+        serializer = AskQuestionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        child = get_object_or_404(Child, id=serializer.validated_data["child_id"])
+
+        service = QuestionService()
+        question, within_boundaries = service.screen_question(
+            child, serializer.validated_data["question"]
         )
 
+        if isinstance(request._request, ASGIRequest):
+            if within_boundaries:
+                deltas = service.astream_answer(question)
+            else:
+                deltas = aiter_values([question.answer])
+            events = aanswer_events(question, within_boundaries, deltas)
+        else:
+            if within_boundaries:
+                deltas = service.stream_answer(question)
+            else:
+                deltas = [question.answer]
+            events = answer_events(question, within_boundaries, deltas)
+
+        if not within_boundaries:
+            question.save()
+
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+        return response
+
+    @action(detail=True, methods=["get"])
+    def wait(self, request, pk=None):
+        """
+        Long-poll a queued question until it is answered.
+
+        Blocks for up to ?timeout= seconds and returns the question as soon
+        as it leaves the queue. Responds 202 with the still-queued question
+        if the timeout passes first. Each wait holds a worker thread here, so
+        the cap is QUESTION_WAIT_SYNC_MAX_SECONDS; under ASGI
+        AsyncWaitQuestionView serves this endpoint instead.
+        """
+        question = self.get_object()
+        timeout = wait_timeout(
+            request, getattr(settings, "QUESTION_WAIT_SYNC_MAX_SECONDS", 5)
+        )
+        deadline = time.monotonic() + timeout
+
+        delay = 0.1
+        while question.status in Question.QUEUED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return wait_response(question)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+            question.refresh_from_db(fields=WAIT_REFRESH_FIELDS)
+
+        return wait_response(question)
+
     @action(detail=True, methods=["post"])
     def mark_helpful(self, request, pk=None):
         """Child marks answer as helpful/not helpful"""
         question = self.get_object()
         helpful = request.data.get("helpful", True)
-        question.child_marked_helpful = helpful
+        question.child_marked_helpful = Question._meta.get_field(
+            "child_marked_helpful"
+        ).to_python(helpful)
         question.save()
+
+        # Stop reusing an answer the child found unhelpful
+        if question.child_marked_helpful is False and question.answer:
+            evict_question_answer(question)
+            get_similar_question_index().remove(question.id)
+            # The answer may have been reused from, or passed on to, others
+            reject_answer(question.answer)
+
         return Response({"message": "Feedback recorded"})
+
+
+class AsyncAskQuestionView(AsyncAPIView):
+    """
+    Native async version of QuestionViewSet.ask, served under ASGI.
+
+    The question is screened and saved with the async ORM and answered
+    through AsyncAnthropic, so a request waiting on Claude holds neither a
+    thread nor a database connection. config/asgi_urls.py routes
+    /questions/ask/ here; WSGI deployments keep using the viewset action.
+    """
+
+    permission_classes = [AllowAny]
+    throttle_classes = [AIQuestionRateThrottle]
+    action = "ask"  # AIQuestionRateThrottle only limits the ask actions
+
+    async def post(self, request):
+        serializer = AskQuestionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        child = await aget_object_or_404(
+            Child, id=serializer.validated_data["child_id"]
+        )
+
+        service = QuestionService()
+        question, within_boundaries = await service.aprocess_question(
+            child,
+            serializer.validated_data["question"],
+            defer=serializer.validated_data["mode"] == "async",
+        )
+        return ask_response(question, within_boundaries)
+
+
+class AsyncWaitQuestionView(AsyncAPIView):
+    """
+    Native async version of QuestionViewSet.wait, served under ASGI.
+
+    Sleeps with asyncio.sleep and gives up its database connection between
+    polls, so a client waiting up to QUESTION_WAIT_MAX_SECONDS holds neither
+    a thread nor a connection. config/asgi_urls.py routes
+    /questions/{id}/wait/ here.
+    """
+
+    permission_classes = [AllowAny]
+
+    async def get(self, request, pk):
+        question = await aget_object_or_404(
+            Question.objects.select_related("child", "detected_topic"), pk=pk
+        )
+        timeout = wait_timeout(
+            request, getattr(settings, "QUESTION_WAIT_MAX_SECONDS", 30)
+        )
+        deadline = time.monotonic() + timeout
+
+        delay = 0.1
+        while question.status in Question.QUEUED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await release_db_connection()
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+            await question.arefresh_from_db(fields=WAIT_REFRESH_FIELDS)
+
+        return wait_response(question)
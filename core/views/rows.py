@@ -0,0 +1,28 @@
+from rest_framework.response import Response
+
+from core.serializers.rows import ValuesRows
+
+
+class ValuesListMixin:
+    """
+    list() from .values_list() tuples instead of model instances.
+
+    Falls back to the usual list() when a serializer field needs an
+    instance (see ValuesRows). values_list_extra names columns to select
+    without returning them, e.g. the ones keyset cursors are built from.
+    """
+
+    values_list_extra = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = ValuesRows.for_serializer(
+            self.get_serializer(), queryset, self.values_list_extra
+        )
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(rows.queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.to_representation(page))
+        return Response(rows.to_representation(rows.queryset))
@@ -0,0 +1,48 @@
+from functools import cached_property
+
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsMixin:
+    """
+    ?fields=id,text limits list and detail responses to those fields.
+
+    The serializer drops the other fields and the queryset loads only the
+    columns the remaining ones read, so large text columns a client didn't
+    ask for never leave Postgres. The serializer must use
+    SparseFieldsetMixin.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    @cached_property
+    def sparse_fields(self):
+        value = self.request.query_params.get("fields")
+        if self.action not in self.sparse_actions or not value:
+            return None
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        available = self.get_serializer_class()().fields
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValidationError(
+                {
+                    "fields": [
+                        f"Unknown field(s): {', '.join(unknown)}. "
+                        f"Choose from: {', '.join(available)}."
+                    ]
+                }
+            )
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fields:
+            kwargs["fields"] = self.sparse_fields
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """Prune after get_queryset() so annotations it adds are known"""
+        queryset = super().filter_queryset(queryset)
+        if not self.sparse_fields:
+            return queryset
+        serializer = self.get_serializer_class()(fields=self.sparse_fields)
+        return serializer.prune_queryset(queryset)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.services.llm_stats import llm_stats
+
+MAX_STATS_DAYS = 90
+
+
+class LLMStatsView(APIView):
+    """Claude latency percentiles, token sums and cost per topic and per day"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            days = int(request.query_params.get("days", 7))
+        except ValueError:
+            raise ValidationError({"days": ["Must be an integer."]})
+        if not 1 <= days <= MAX_STATS_DAYS:
+            raise ValidationError(
+                {"days": [f"Must be between 1 and {MAX_STATS_DAYS}."]}
+            )
+
+        since = timezone.now() - timedelta(days=days)
+        return Response({"days": days, "since": since, **llm_stats(since)})
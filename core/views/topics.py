@@ -1,14 +1,30 @@
+from functools import partial
+
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 
 from core.models import TopicCategory
 from core.serializers import TopicCategorySerializer
+from core.services.etags import TOPICS_VERSION
+
+from .conditional import ConditionalGetMixin
+from .sparse import SparseFieldsMixin
 
 
-class TopicCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class TopicCategoryViewSet(
+    ConditionalGetMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet
+):
     """Browse available topics"""
 
     permission_classes = [AllowAny]
     queryset = TopicCategory.objects.filter(is_active=True)
     serializer_class = TopicCategorySerializer
     lookup_field = "slug"
+
+    def list(self, request, *args, **kwargs):
+        respond = partial(super().list, request, *args, **kwargs)
+        return self.conditional_response(request, [TOPICS_VERSION], respond)
+
+    def retrieve(self, request, *args, **kwargs):
+        respond = partial(super().retrieve, request, *args, **kwargs)
+        return self.conditional_response(request, [TOPICS_VERSION], respond)